@@ -0,0 +1,47 @@
+import asyncio
+from decimal import Decimal
+
+from benchmarks.harness import measure, measure_async, override_settings, zero_provider_latency
+from common.models.request import ExchangeRequest
+from common.services.exchange_service import ExchangeService
+from common.services.rate_cache import RateCache
+
+REQUEST = ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100.00"))
+BATCH = [
+    ExchangeRequest(source_currency=source, target_currency=target, amount=Decimal("100.00"))
+    for source, target in [("USD", "EUR"), ("USD", "GBP"), ("EUR", "USD"), ("GBP", "USD"), ("USD", "JPY")] * 20
+]
+LARGE_BATCH = [
+    ExchangeRequest(source_currency=request.source_currency, target_currency=request.target_currency,
+                    amount=Decimal(index % 997 + 1))
+    for index, request in enumerate(BATCH * 50)
+]
+
+
+def run(scale: float = 1.0) -> dict:
+    number = max(50, int(2000 * scale))
+    results = {}
+
+    with zero_provider_latency():
+        cached = ExchangeService()
+        results["service.compare.cached"] = measure_async(lambda: cached.get_best_exchange_rate(REQUEST), number)
+
+        with override_settings(RATE_TABLE_MAX_STALENESS_SECONDS=-1):
+            uncached = ExchangeService()
+            uncached.rate_cache = RateCache(ttl_seconds=0, max_entries=0)
+            results["service.compare.uncached"] = measure_async(
+                lambda: uncached.get_best_exchange_rate(REQUEST), number)
+            results["service.batch100.uncached"] = measure_async(
+                lambda: uncached.get_best_exchange_rates(BATCH), max(5, number // 50))
+
+        # Building the per-request results of a 5000 item batch once the quotes of its pairs are known
+        pairs = {(request.source_currency, request.target_currency): request for request in LARGE_BATCH}
+
+        async def fetch_quotes():
+            return await asyncio.gather(*[cached._fetch_quotes(request) for request in pairs.values()])
+
+        quotes_by_pair = dict(zip(pairs, asyncio.run(fetch_quotes())))
+        results["service.batch5000.build_results"] = measure(
+            lambda: cached._build_batch_results(LARGE_BATCH, quotes_by_pair), max(3, number // 400))
+
+    return results
@@ -0,0 +1,34 @@
+import json
+
+from pydantic import ValidationError
+
+from benchmarks.harness import measure
+from common.models.request import ExchangeRequest
+
+PAYLOAD = {"source_currency": "USD", "target_currency": "EUR", "amount": "100.00"}
+PAYLOAD_JSON = json.dumps(PAYLOAD)
+LOWERCASE_PAYLOAD = {"source_currency": "usd", "target_currency": "eur", "amount": "100.00"}
+INVALID_PAYLOAD = {"source_currency": "XXX", "target_currency": "EUR", "amount": "100.00"}
+INVALID_FORMAT_PAYLOAD = {"source_currency": "U5D", "target_currency": "EUR", "amount": "100.00"}
+INVALID_AMOUNT_PAYLOAD = {"source_currency": "USD", "target_currency": "EUR", "amount": "100.001"}
+
+
+def validate_invalid(payload=INVALID_PAYLOAD):
+    try:
+        ExchangeRequest.model_validate(payload)
+    except ValidationError:
+        pass
+
+
+def run(scale: float = 1.0) -> dict:
+    number = max(100, int(20000 * scale))
+    return {
+        "models.exchange_request.validate": measure(lambda: ExchangeRequest.model_validate(PAYLOAD), number),
+        "models.exchange_request.validate_json": measure(
+            lambda: ExchangeRequest.model_validate_json(PAYLOAD_JSON), number),
+        "models.exchange_request.validate_lowercase": measure(
+            lambda: ExchangeRequest.model_validate(LOWERCASE_PAYLOAD), number),
+        "models.exchange_request.invalid_currency": measure(validate_invalid, number),
+        "models.exchange_request.invalid_format": measure(lambda: validate_invalid(INVALID_FORMAT_PAYLOAD), number),
+        "models.exchange_request.invalid_amount": measure(lambda: validate_invalid(INVALID_AMOUNT_PAYLOAD), number),
+    }
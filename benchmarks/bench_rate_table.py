@@ -0,0 +1,33 @@
+import os
+import tempfile
+from decimal import Decimal
+
+from benchmarks.harness import measure
+from common.models.request import SUPPORTED_CURRENCIES
+from common.services.rate_table import RateTable
+from common.services.shared_rate_table import SharedRateTable
+
+PROVIDERS = ["API1", "API2", "API3"]
+RATE = Decimal("0.8658305939544604")
+
+
+def run(scale: float = 1.0) -> dict:
+    number = max(100, int(50000 * scale))
+    local = RateTable()
+    local.update("API1", "USD", "EUR", RATE)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rates")
+        writer = SharedRateTable(path, PROVIDERS, SUPPORTED_CURRENCIES)
+        reader = SharedRateTable(path, PROVIDERS, SUPPORTED_CURRENCIES)
+        writer.update("API1", "USD", "EUR", RATE)
+
+        try:
+            return {
+                "rate_table.local.get_fresh": measure(lambda: local.get_fresh("API1", "USD", "EUR", 60), number),
+                "rate_table.shared.get_fresh": measure(lambda: reader.get_fresh("API1", "USD", "EUR", 60), number),
+                "rate_table.shared.update": measure(lambda: writer.update("API1", "USD", "EUR", RATE), number),
+            }
+        finally:
+            reader.close()
+            writer.close()
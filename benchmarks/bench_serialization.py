@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+from benchmarks.harness import measure
+from common.models.request import ExchangeRequest
+from common.models.response import BestExchangeResponse, BatchExchangeResponse
+from common.services.exchange_service import ExchangeService, ProviderQuote
+from common.utils.responses import ModelJSONResponse
+
+
+def build_responses():
+    service = ExchangeService()
+    request = ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100.00"))
+    quotes = [
+        ("API1", ProviderQuote("API1", Decimal("0.8483781114046904"), 12)),
+        ("API2", ProviderQuote("API2", Decimal("0.856191583056313"), 31)),
+        ("API3", ProviderQuote("API3", Decimal("0.8674466961329456"), 25)),
+    ]
+    single = service._build_best_response(request, quotes)
+
+    quotes_by_pair = {("USD", "EUR"): (quotes, [])}
+    results, successful = service._build_batch_results(
+        [request] * 100, quotes_by_pair)
+    batch = BatchExchangeResponse.model_validate({
+        "statusCode": 200,
+        "message": "Batch exchange comparison completed",
+        "data": {"results": [result.model_dump() for result in results], "totalRequests": 100, "distinctPairs": 1,
+                 "successfulRequests": successful, "failedRequests": 0}
+    })
+    return single, batch
+
+
+def response_model_path(model_class, response):
+    # What FastAPI does for response_model: dump, re-validate, dump to JSON-able python, then json.dumps
+    return JSONResponse(model_class.model_validate(response.model_dump(by_alias=True)).model_dump(mode="json")).body
+
+
+def run(scale: float = 1.0) -> dict:
+    single, batch = build_responses()
+    number = max(100, int(10000 * scale))
+    batch_number = max(10, number // 50)
+    return {
+        "serialization.compare.response_model": measure(
+            lambda: response_model_path(BestExchangeResponse, single), number),
+        "serialization.compare.model_json": measure(lambda: ModelJSONResponse(single).body, number),
+        "serialization.batch100.response_model": measure(
+            lambda: response_model_path(BatchExchangeResponse, batch), batch_number),
+        "serialization.batch100.model_json": measure(lambda: ModelJSONResponse(batch).body, batch_number),
+    }
@@ -0,0 +1,59 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.harness import PROJECT_DIR
+
+SERVICE_DIRS = {
+    "gateway": os.path.join(PROJECT_DIR, "services", "api-gateway"),
+    "exchange-service": os.path.join(PROJECT_DIR, "services", "exchange-service"),
+    "api1": os.path.join(PROJECT_DIR, "services", "api1"),
+    "api2": os.path.join(PROJECT_DIR, "services", "api2"),
+    "api3": os.path.join(PROJECT_DIR, "services", "api3"),
+}
+
+# Import-to-ready budget per service: a new pod has to be serving before a burst is over to absorb it.
+# FastAPI and pydantic alone take most of it, so anything the services import or build at startup counts.
+STARTUP_BUDGET_MS = int(os.getenv("STARTUP_BUDGET_MS", "900"))
+
+# Runs in a fresh interpreter so nothing is imported or constructed yet. Ready is when the lifespan startup
+# has finished, which is when uvicorn starts accepting connections.
+_STARTUP_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def ready():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready_at = asyncio.run(ready())
+print(json.dumps({"import_ms": (imported - start) * 1000, "ready_ms": (ready_at - start) * 1000}))
+"""
+
+
+def measure_startup(service: str, repeat: int = 5) -> dict:
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR, LOG_LEVEL="WARNING")
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], cwd=SERVICE_DIRS[service], env=env,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    ready = [sample["ready_ms"] for sample in samples]
+    return {
+        "repeats": repeat,
+        "import_ms": round(min(sample["import_ms"] for sample in samples), 1),
+        "ready_ms": round(min(ready), 1),
+        "median_ready_ms": round(statistics.median(ready), 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": statistics.median(ready) <= STARTUP_BUDGET_MS
+    }
+
+
+def run(scale: float = 1.0) -> dict:
+    repeat = max(3, int(5 * scale))
+    return {f"startup.{service}": measure_startup(service, repeat) for service in SERVICE_DIRS}
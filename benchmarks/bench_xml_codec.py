@@ -0,0 +1,68 @@
+import sys
+import xml.etree.ElementTree as ET
+from xml.etree.ElementTree import Element, tostring
+
+from benchmarks.harness import measure
+from common.models import xml_codec
+
+REQUEST_XML = "<XML><From>USD</From><To>EUR</To><Amount>100.00</Amount></XML>"
+RESPONSE_XML = "<XML><Result>85.00</Result></XML>"
+
+
+def elementtree_encode_request():
+    root = Element("XML")
+    for tag, text in (("From", "USD"), ("To", "EUR"), ("Amount", "100.00")):
+        element = Element(tag)
+        element.text = text
+        root.append(element)
+    return tostring(root, encoding="unicode")
+
+
+def elementtree_decode_request():
+    root = ET.fromstring(REQUEST_XML)
+    return root.find("From").text, root.find("To").text, root.find("Amount").text
+
+
+def elementtree_encode_response():
+    root = Element("XML")
+    element = Element("Result")
+    element.text = "85.00"
+    root.append(element)
+    return tostring(root, encoding="unicode")
+
+
+def elementtree_decode_response():
+    return ET.fromstring(RESPONSE_XML).find("Result").text
+
+
+CASES = [
+    ("encode request", elementtree_encode_request, lambda: xml_codec.encode_request("USD", "EUR", "100.00")),
+    ("decode request", elementtree_decode_request, lambda: xml_codec.decode_request(REQUEST_XML)),
+    ("encode response", elementtree_encode_response, lambda: xml_codec.encode_response("85.00")),
+    ("decode response", elementtree_decode_response, lambda: xml_codec.decode_response(RESPONSE_XML)),
+]
+
+
+def run(scale: float = 1.0) -> dict:
+    number = max(100, int(20000 * scale))
+    results = {}
+    for name, baseline, fast in CASES:
+        assert baseline() == fast()
+        key = name.replace(" ", "_")
+        results[f"xml.{key}.elementtree"] = measure(baseline, number)
+        results[f"xml.{key}.codec"] = measure(fast, number)
+    return results
+
+
+def main(scale: float = 1.0):
+    results = run(scale)
+    print(f"{'case':<18}{'ElementTree (us)':>18}{'codec (us)':>14}{'speedup':>10}")
+    for name, _, _ in CASES:
+        key = name.replace(" ", "_")
+        baseline_us = results[f"xml.{key}.elementtree"]["min_us"]
+        fast_us = results[f"xml.{key}.codec"]["min_us"]
+        print(f"{name:<18}{baseline_us:>18.2f}{fast_us:>14.2f}{baseline_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_DIR, "benchmarks", "results")
+
+if PROJECT_DIR not in sys.path:
+    sys.path.append(PROJECT_DIR)
+
+
+def _summarise(samples: List[float], number: int) -> Dict[str, float]:
+    per_op = [sample / number * 1e6 for sample in samples]
+    return {
+        "iterations": number,
+        "repeats": len(samples),
+        "min_us": round(min(per_op), 3),
+        "median_us": round(statistics.median(per_op), 3),
+        "ops_per_second": round(1e6 / min(per_op), 1)
+    }
+
+
+def measure(func: Callable[[], object], number: int = 10000, repeat: int = 5) -> Dict[str, float]:
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append(time.perf_counter() - start)
+    return _summarise(samples, number)
+
+
+def measure_async(func: Callable[[], Awaitable[object]], number: int = 1000, repeat: int = 5) -> Dict[str, float]:
+    async def run() -> List[float]:
+        await func()
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                await func()
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    return _summarise(asyncio.run(run()), number)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class _NoSleepAsyncio:
+    # Stands in for the asyncio module inside the in-process providers so their simulated latency is zero
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    @staticmethod
+    async def sleep(delay, result=None):
+        return await asyncio.sleep(0, result)
+
+
+@contextmanager
+def zero_provider_latency() -> Iterator[None]:
+    from common.providers import api1_provider, api2_provider, api3_provider, simulator
+
+    modules = (api1_provider, api2_provider, api3_provider, simulator)
+    originals = [module.asyncio for module in modules]
+    for module in modules:
+        module.asyncio = _NoSleepAsyncio()
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, originals):
+            module.asyncio = original
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: Dict[str, dict], path: Optional[str] = None) -> str:
+    commit = git_commit()
+    created_at = datetime.now(timezone.utc)
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{created_at:%Y%m%dT%H%M%S}-{commit or 'unknown'}.json")
+
+    document = {
+        "commit": commit,
+        "createdAt": created_at.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+    return path
+
+
+def compare_results(baseline_path: str, results: Dict[str, dict]) -> List[str]:
+    # Lower is better for every compared figure: per-op time for micro-benchmarks, p95 for load runs and
+    # import-to-ready time for startup runs
+    with open(baseline_path) as file:
+        baseline = json.load(file)["results"]
+
+    lines = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        key = "min_us" if "min_us" in result else "ready_ms" if "ready_ms" in result else "p95_ms"
+        if not previous or key not in previous or not previous[key]:
+            continue
+        change = (result[key] - previous[key]) / previous[key] * 100
+        lines.append(f"{name:<40}{previous[key]:>12.3f}{result[key]:>12.3f}{change:>+9.1f}%")
+    return lines
+
+
+@contextmanager
+def override_settings(**values) -> Iterator[None]:
+    from common.config.settings import settings
+
+    originals = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(settings, name, value)
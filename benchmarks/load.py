@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+import httpx
+
+from benchmarks.harness import PROJECT_DIR, percentile, save_results, zero_provider_latency
+
+SERVICE_DIRS = {
+    "gateway": os.path.join(PROJECT_DIR, "services", "api-gateway"),
+    "exchange-service": os.path.join(PROJECT_DIR, "services", "exchange-service"),
+}
+
+DEFAULT_PAYLOAD = {"source_currency": "USD", "target_currency": "EUR", "amount": 100}
+
+
+def load_app(service: str):
+    # Both services ship their code as the top-level package `app`, so only one can be loaded per process
+    if service not in SERVICE_DIRS:
+        raise ValueError(f"Unknown service '{service}', expected one of: {', '.join(SERVICE_DIRS)}")
+
+    sys.path.insert(0, SERVICE_DIRS[service])
+    return importlib.import_module("app.main").app
+
+
+async def run_load(app, path: str = "/exchange/compare", payload: Optional[dict] = None, rps: float = 100,
+                   duration_seconds: float = 5) -> dict:
+    # Open-loop generator: requests are started on a fixed schedule whatever the response times are, and
+    # latency is measured from the scheduled start so queueing delay is not hidden (coordinated omission).
+    payload = payload or DEFAULT_PAYLOAD
+    total = max(1, int(rps * duration_seconds))
+    interval = 1 / rps
+    latencies = []
+    status_counts = {}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+            async def send(scheduled_at: float) -> None:
+                try:
+                    response = await client.post(path, json=payload)
+                    status = str(response.status_code)
+                except Exception as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - scheduled_at)
+                status_counts[status] = status_counts.get(status, 0) + 1
+
+            started_at = time.perf_counter()
+            tasks = []
+            for index in range(total):
+                scheduled_at = started_at + index * interval
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.ensure_future(send(scheduled_at)))
+
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    errors = sum(count for status, count in status_counts.items() if not status.startswith("2"))
+    return {
+        "path": path,
+        "target_rps": rps,
+        "requests": total,
+        "errors": errors,
+        "status_counts": status_counts,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def run(service: str, rps: float, duration_seconds: float, path: str = "/exchange/compare",
+        payload: Optional[dict] = None, zero_latency: bool = False) -> dict:
+    app = load_app(service)
+    with zero_provider_latency() if zero_latency else nullcontext():
+        result = asyncio.run(run_load(app, path, payload, rps, duration_seconds))
+    return {f"load.{service}{path.replace('/', '.')}": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive a RateCompare app in-process through ASGI at a target RPS")
+    parser.add_argument("service", choices=sorted(SERVICE_DIRS))
+    parser.add_argument("--rps", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=5, help="seconds")
+    parser.add_argument("--path", default="/exchange/compare")
+    parser.add_argument("--payload", type=json.loads, default=None, help="JSON request body")
+    parser.add_argument("--zero-latency", action="store_true", help="remove the simulated provider latency")
+    parser.add_argument("--output", help="where to save the JSON results")
+    args = parser.parse_args()
+
+    results = run(args.service, args.rps, args.duration, args.path, args.payload, args.zero_latency)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+
+from benchmarks import (
+    bench_exchange_service, bench_models, bench_rate_table, bench_serialization, bench_startup, bench_xml_codec
+)
+from benchmarks.harness import compare_results, save_results
+
+SUITES = {
+    "models": bench_models.run,
+    "xml": bench_xml_codec.run,
+    "service": bench_exchange_service.run,
+    "serialization": bench_serialization.run,
+    "rate_table": bench_rate_table.run,
+    "startup": bench_startup.run,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the RateCompare benchmark suite and save the results as JSON")
+    parser.add_argument("--only", help=f"comma separated subset of: {', '.join(SUITES)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the iteration counts")
+    parser.add_argument("--load", choices=["gateway", "exchange-service"], help="also run an ASGI load test")
+    parser.add_argument("--rps", type=float, default=200)
+    parser.add_argument("--duration", type=float, default=5, help="load test duration in seconds")
+    parser.add_argument("--zero-latency", action="store_true", help="load test without simulated provider latency")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else list(SUITES)
+    results = {}
+    for name in selected:
+        print(f"Running {name} benchmarks...")
+        results.update(SUITES[name](args.scale))
+
+    if args.load:
+        from benchmarks import load
+        print(f"Running {args.load} load test at {args.rps:g} rps for {args.duration:g}s...")
+        results.update(load.run(args.load, args.rps, args.duration, zero_latency=args.zero_latency))
+
+    for name, result in results.items():
+        if "min_us" in result:
+            print(f"{name:<45}{result['min_us']:>12.3f} us/op")
+        elif "ready_ms" in result:
+            verdict = "within" if result["within_budget"] else "OVER"
+            print(f"{name:<45}import {result['import_ms']:.1f} ms  ready {result['ready_ms']:.1f} ms  "
+                  f"(median {result['median_ready_ms']:.1f} ms, {verdict} the {result['budget_ms']} ms budget)")
+        else:
+            print(f"{name:<45}p50 {result['p50_ms']:.1f} ms  p95 {result['p95_ms']:.1f} ms  "
+                  f"p99 {result['p99_ms']:.1f} ms  {result['throughput_rps']:.0f} rps  errors {result['errors']}")
+
+    path = save_results(results, args.output)
+    print(f"Results saved to {path}")
+
+    if args.compare:
+        print(f"{'benchmark':<40}{'before':>12}{'after':>12}{'change':>10}")
+        for line in compare_results(args.compare, results):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,85 @@ load_dotenv()
 
 class Settings:
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+    LOG_RATE_LIMIT_PER_SECOND: float = float(os.getenv("LOG_RATE_LIMIT_PER_SECOND", "100"))
+
+    RATE_CACHE_TTL_SECONDS: float = float(os.getenv("RATE_CACHE_TTL_SECONDS", "5"))
+    RATE_CACHE_MAX_ENTRIES: int = int(os.getenv("RATE_CACHE_MAX_ENTRIES", "1024"))
+
+    RATE_TABLE_MAX_STALENESS_SECONDS: float = float(os.getenv("RATE_TABLE_MAX_STALENESS_SECONDS", "5"))
+    SHARED_RATE_TABLE_PATH: str = os.getenv("SHARED_RATE_TABLE_PATH", "")
+    SHARED_RATE_TABLE_POLL_SECONDS: float = float(os.getenv("SHARED_RATE_TABLE_POLL_SECONDS", "1"))
+    GATEWAY_WORKERS: int = int(os.getenv("GATEWAY_WORKERS", "1"))
+    RATE_REFRESHER_ENABLED: bool = os.getenv("RATE_REFRESHER_ENABLED", "false").lower() == "true"
+    REFRESH_INTERVAL_SECONDS: float = float(os.getenv("REFRESH_INTERVAL_SECONDS", "2"))
+    REFRESH_INTERVALS: str = os.getenv("REFRESH_INTERVALS", "")
+    REFRESH_JITTER_RATIO: float = float(os.getenv("REFRESH_JITTER_RATIO", "0.2"))
+    REFRESH_MAX_BACKOFF_SECONDS: float = float(os.getenv("REFRESH_MAX_BACKOFF_SECONDS", "60"))
+    REFRESH_MAX_CONCURRENCY: int = int(os.getenv("REFRESH_MAX_CONCURRENCY", "8"))
+
+    WARM_START_ENABLED: bool = os.getenv("WARM_START_ENABLED", "false").lower() == "true"
+    WARM_START_SNAPSHOT_PATH: str = os.getenv("WARM_START_SNAPSHOT_PATH", "data/warm-start.snapshot")
+    WARM_START_INTERVAL_SECONDS: float = float(os.getenv("WARM_START_INTERVAL_SECONDS", "30"))
+    WARM_START_MAX_AGE_SECONDS: float = float(os.getenv("WARM_START_MAX_AGE_SECONDS", "300"))
+
+    RATE_HISTORY_ENABLED: bool = os.getenv("RATE_HISTORY_ENABLED", "false").lower() == "true"
+    RATE_HISTORY_DIR: str = os.getenv("RATE_HISTORY_DIR", "data/rate-history")
+    RATE_HISTORY_SEGMENT_CAPACITY: int = int(os.getenv("RATE_HISTORY_SEGMENT_CAPACITY", "262144"))
+    RATE_HISTORY_MAX_POINTS: int = int(os.getenv("RATE_HISTORY_MAX_POINTS", "10000"))
+    RATE_HISTORY_MAX_RANGE_SECONDS: float = float(os.getenv("RATE_HISTORY_MAX_RANGE_SECONDS", "2678400"))
+    RATE_HISTORY_MAX_OPEN_SEGMENTS: int = int(os.getenv("RATE_HISTORY_MAX_OPEN_SEGMENTS", "64"))
+
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "5000"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+    STREAM_MAX_IN_FLIGHT: int = int(os.getenv("STREAM_MAX_IN_FLIGHT", "64"))
+
+    COALESCE_ENABLED: bool = os.getenv("COALESCE_ENABLED", "true").lower() == "true"
+    COALESCE_MAX_KEYS: int = int(os.getenv("COALESCE_MAX_KEYS", "10000"))
+
+    COMPARE_DEADLINE_MS: int = int(os.getenv("COMPARE_DEADLINE_MS", "1000"))
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+    TRIANGULATION_ENABLED: bool = os.getenv("TRIANGULATION_ENABLED", "true").lower() == "true"
+    TRIANGULATION_MAX_LEGS: int = int(os.getenv("TRIANGULATION_MAX_LEGS", "3"))
+    TRIANGULATION_MAX_RATE_AGE_SECONDS: float = float(os.getenv("TRIANGULATION_MAX_RATE_AGE_SECONDS", "60"))
+
+    BREAKER_FAILURE_RATE: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    BREAKER_SLOW_CALL_MS: int = int(os.getenv("BREAKER_SLOW_CALL_MS", "1000"))
+    BREAKER_WINDOW_SIZE: int = int(os.getenv("BREAKER_WINDOW_SIZE", "20"))
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+    BREAKER_OPEN_SECONDS: float = float(os.getenv("BREAKER_OPEN_SECONDS", "10"))
+    LIMITER_INITIAL_LIMIT: int = int(os.getenv("LIMITER_INITIAL_LIMIT", "20"))
+    LIMITER_MAX_LIMIT: int = int(os.getenv("LIMITER_MAX_LIMIT", "200"))
+    LIMITER_LATENCY_TARGET_MS: int = int(os.getenv("LIMITER_LATENCY_TARGET_MS", "1000"))
+
+    PROVIDER_MODE: str = os.getenv("PROVIDER_MODE", "direct")
+    API1_URL: str = os.getenv("API1_URL", "http://api1:8002")
+    API2_URL: str = os.getenv("API2_URL", "http://api2:8003")
+    API3_URL: str = os.getenv("API3_URL", "http://api3:8004")
+    # Pairs each HTTP provider serves, as SRC/DST lists; empty means unknown (always attempted, never refreshed)
+    API1_PAIRS: str = os.getenv("API1_PAIRS", "USD/EUR,USD/GBP,USD/JPY,EUR/USD,EUR/GBP,GBP/USD,GBP/EUR,JPY/USD")
+    API2_PAIRS: str = os.getenv("API2_PAIRS", "USD/EUR,USD/GBP,USD/JPY,EUR/USD,EUR/GBP,GBP/USD,GBP/EUR,JPY/USD")
+    API3_PAIRS: str = os.getenv("API3_PAIRS", "USD/EUR,USD/GBP,USD/JPY,EUR/USD,EUR/GBP,GBP/USD,GBP/EUR,JPY/USD")
+    PROVIDER_BATCH_MAX_ITEMS: int = int(os.getenv("PROVIDER_BATCH_MAX_ITEMS", "500"))
+
+    SIMULATOR_ENABLED: bool = os.getenv("SIMULATOR_ENABLED", "false").lower() == "true"
+    SIMULATOR_SEED: int = int(os.getenv("SIMULATOR_SEED", "42"))
+    SIMULATOR_CONFIG_FILE: str = os.getenv("SIMULATOR_CONFIG_FILE", "")
+    SIMULATOR_RATES_FILE: str = os.getenv("SIMULATOR_RATES_FILE", "")
+
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "2"))
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "0.5"))
+    HTTP_POOL_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_POOL_TIMEOUT_SECONDS", "1"))
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
 
 
 settings = Settings()
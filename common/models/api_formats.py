@@ -1,7 +1,7 @@
 from decimal import Decimal
 from pydantic import BaseModel, Field
-import xml.etree.ElementTree as ET
-from xml.etree.ElementTree import Element, tostring
+
+from common.models import xml_codec
 
 
 class API1Request(BaseModel):
@@ -50,30 +50,12 @@ class API2Request(BaseModel):
     }
 
     def to_xml(self) -> str:
-        root = Element("XML")
-
-        from_elem = Element("From")
-        from_elem.text = self.From
-        root.append(from_elem)
-
-        to_elem = Element("To")
-        to_elem.text = self.To
-        root.append(to_elem)
-
-        amount_elem = Element("Amount")
-        amount_elem.text = str(self.Amount)
-        root.append(amount_elem)
-
-        return tostring(root, encoding='unicode')
+        return xml_codec.encode_request(self.From, self.To, str(self.Amount))
 
     @classmethod
     def from_xml(cls, xml_string: str) -> 'API2Request':
-        root = ET.fromstring(xml_string)
-        return cls(
-            From=root.find('From').text,
-            To=root.find('To').text,
-            Amount=Decimal(root.find('Amount').text)
-        )
+        from_currency, to_currency, amount = xml_codec.decode_request(xml_string)
+        return cls(From=from_currency, To=to_currency, Amount=Decimal(amount))
 
 
 class API2Response(BaseModel):
@@ -89,16 +71,11 @@ class API2Response(BaseModel):
     }
 
     def to_xml(self) -> str:
-        root = Element("XML")
-        result_elem = Element("Result")
-        result_elem.text = str(self.Result)
-        root.append(result_elem)
-        return tostring(root, encoding='unicode')
+        return xml_codec.encode_response(str(self.Result))
 
     @classmethod
     def from_xml(cls, xml_string: str) -> 'API2Response':
-        root = ET.fromstring(xml_string)
-        return cls(Result=Decimal(root.find('Result').text))
+        return cls(Result=Decimal(xml_codec.decode_response(xml_string)))
 
 
 class API3ExchangeData(BaseModel):
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Tuple, Union
+
+# ISO 4217 minor units where they differ from the usual 2: amounts are held as integers in the smallest
+# unit of their currency
+DEFAULT_MINOR_UNITS = 2
+MINOR_UNITS: Dict[str, int] = {"JPY": 0, "KRW": 0, "KWD": 3, "BHD": 3}
+
+# Rates are held as integers scaled by 10**12. int64 keeps rates up to ~9.2 million exact, far above any
+# cross rate between the supported currencies.
+RATE_DECIMALS = 12
+RATE_SCALE = 10 ** RATE_DECIMALS
+
+_POWERS_OF_TEN = [10 ** exponent for exponent in range(2 * RATE_DECIMALS + 4)]
+_ONE = Decimal(1)
+
+
+def minor_units(currency: str) -> int:
+    return MINOR_UNITS.get(currency, DEFAULT_MINOR_UNITS)
+
+
+def to_fixed_rate(rate: Union[Decimal, float]) -> int:
+    if isinstance(rate, float):
+        return round(rate * RATE_SCALE)
+    return _decimal_to_fixed_rate(rate)
+
+
+# Cached and refreshed rates reach the comparison as the same Decimals over and over, so they are memoized
+@lru_cache(maxsize=4096)
+def _decimal_to_fixed_rate(rate: Decimal) -> int:
+    return int(rate.scaleb(RATE_DECIMALS).to_integral_value())
+
+
+def from_fixed_rate(fixed_rate: int) -> Decimal:
+    # Trailing zeros are dropped so 0.85 stays "0.85" rather than "0.850000000000"
+    rate = Decimal(fixed_rate).scaleb(-RATE_DECIMALS).normalize()
+    return rate.quantize(_ONE) if fixed_rate % RATE_SCALE == 0 else rate
+
+
+@lru_cache(maxsize=4096)
+def to_minor(amount: Decimal, currency: str) -> int:
+    # Request validation guarantees the amount fits the currency's minor units, so this is exact
+    return int(amount.scaleb(minor_units(currency)))
+
+
+def from_minor(amount: int, currency: str) -> Decimal:
+    return Decimal(amount).scaleb(-minor_units(currency))
+
+
+@lru_cache(maxsize=None)
+def _conversion_factors(source_currency: str, target_currency: str) -> Tuple[int, int, int]:
+    target_units = minor_units(target_currency)
+    return _POWERS_OF_TEN[target_units], _POWERS_OF_TEN[minor_units(source_currency) + RATE_DECIMALS], -target_units
+
+
+def convert(amount: int, source_currency: str, target_currency: str, fixed_rate: int) -> Decimal:
+    # amount (source minor units) * rate, rounded half to even in target minor units and returned as Decimal
+    multiplier, denominator, exponent = _conversion_factors(source_currency, target_currency)
+    converted, remainder = divmod(amount * fixed_rate * multiplier, denominator)
+    if remainder * 2 > denominator or (remainder * 2 == denominator and converted & 1):
+        converted += 1
+    return Decimal(converted).scaleb(exponent)
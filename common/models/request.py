@@ -1,14 +1,67 @@
 from decimal import Decimal
-from typing import Set
+from typing import Dict, FrozenSet, List
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 
-VALID_CURRENCIES: Set[str] = {
+from common.config.settings import settings
+from common.models.money import minor_units
+
+VALID_CURRENCIES: FrozenSet[str] = frozenset({
     "USD", "EUR", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD", "SEK", "NOK",
     "DKK", "PLN", "CZK", "HUF", "RUB", "CNY", "HKD", "SGD", "KRW", "INR",
     "BRL", "MXN", "ZAR", "TRY", "ILS", "AED", "SAR", "QAR", "KWD", "BHD"
+})
+SUPPORTED_CURRENCIES: List[str] = sorted(VALID_CURRENCIES)
+
+# Maps every accepted code to one canonical string, so validated requests share the same key objects
+_CURRENCY_CODES: Dict[str, str] = {code: code for code in VALID_CURRENCIES}
+_SUPPORTED_CURRENCIES_TEXT = ", ".join(SUPPORTED_CURRENCIES)
+
+_SOURCE_MESSAGES = {
+    "required": "Source currency is required",
+    "length": "Source currency must be exactly 3 characters (e.g., USD, EUR, GBP)",
+    "letters": "Source currency must contain only letters",
+    "unknown": "Invalid source currency '{}'. \nSupported currencies: " + _SUPPORTED_CURRENCIES_TEXT
+}
+_TARGET_MESSAGES = {
+    "required": "Target currency is required",
+    "length": "Target currency must be exactly 3 characters (e.g., EUR)",
+    "letters": "Target currency must contain only letters",
+    "unknown": "Invalid target currency '{}'. Supported currencies: " + _SUPPORTED_CURRENCIES_TEXT
 }
 
+_MAX_AMOUNT = Decimal(1000000)
+
+# Amounts may not be finer than the minor unit of their currency: JPY 1, USD 0.01, KWD 0.001
+_AMOUNT_QUANTUMS = {code: Decimal(1).scaleb(-minor_units(code)) for code in VALID_CURRENCIES}
+_AMOUNT_PRECISION_MESSAGES = {
+    code: f"{code} amounts cannot have decimal places" if not minor_units(code)
+    else f"Amount cannot have more than {minor_units(code)} decimal places"
+    for code in VALID_CURRENCIES
+}
+
+
+def _validate_currency(v: str, messages: Dict[str, str]) -> str:
+    code = _CURRENCY_CODES.get(v)
+    if code is not None:
+        return code
+
+    if not v:
+        raise ValueError(messages["required"])
+
+    v = v.upper().strip()
+
+    if len(v) != 3:
+        raise ValueError(messages["length"])
+
+    if not v.isalpha():
+        raise ValueError(messages["letters"])
+
+    code = _CURRENCY_CODES.get(v)
+    if code is None:
+        raise ValueError(messages["unknown"].format(v))
+    return code
+
 
 class ExchangeRequest(BaseModel):
     source_currency: str = Field(..., description="Source currency code (e.g., USD)", min_length=3, max_length=3)
@@ -18,54 +71,26 @@ class ExchangeRequest(BaseModel):
     @field_validator('source_currency')
     @classmethod
     def validate_source_currency(cls, v: str) -> str:
-        if not v:
-            raise ValueError("Source currency is required")
-
-        v = v.upper().strip()
-
-        if len(v) != 3:
-            raise ValueError("Source currency must be exactly 3 characters (e.g., USD, EUR, GBP)")
-
-        if not v.isalpha():
-            raise ValueError("Source currency must contain only letters")
-
-        if v not in VALID_CURRENCIES:
-            raise ValueError(
-                f"Invalid source currency '{v}'. \nSupported currencies: {', '.join(sorted(VALID_CURRENCIES))}")
-
-        return v
+        return _validate_currency(v, _SOURCE_MESSAGES)
 
     @field_validator('target_currency')
     @classmethod
     def validate_target_currency(cls, v: str) -> str:
-        if not v:
-            raise ValueError("Target currency is required")
-
-        v = v.upper().strip()
-
-        if len(v) != 3:
-            raise ValueError("Target currency must be exactly 3 characters (e.g., EUR)")
-
-        if not v.isalpha():
-            raise ValueError("Target currency must contain only letters")
-
-        if v not in VALID_CURRENCIES:
-            raise ValueError(
-                f"Invalid target currency '{v}'. Supported currencies: {', '.join(sorted(VALID_CURRENCIES))}")
-
-        return v
+        return _validate_currency(v, _TARGET_MESSAGES)
 
     @field_validator('amount')
     @classmethod
-    def validate_amount(cls, v: Decimal) -> Decimal:
+    def validate_amount(cls, v: Decimal, info: ValidationInfo) -> Decimal:
         if v <= 0:
             raise ValueError("Amount must be greater than 0")
 
-        if v > 1000000:
+        if v > _MAX_AMOUNT:
             raise ValueError("Amount cannot exceed 1,000,000")
 
-        if v.as_tuple().exponent < -2:
-            raise ValueError("Amount cannot have more than 2 decimal places")
+        # source_currency is declared first, so it is already validated here unless it failed
+        source_currency = info.data.get("source_currency")
+        if source_currency is not None and v != v.quantize(_AMOUNT_QUANTUMS[source_currency]):
+            raise ValueError(_AMOUNT_PRECISION_MESSAGES[source_currency])
 
         return v
 
@@ -74,3 +99,8 @@ class ExchangeRequest(BaseModel):
         if self.source_currency == self.target_currency:
             raise ValueError("Source and target currencies cannot be the same")
         return self
+
+
+class BatchExchangeRequest(BaseModel):
+    requests: list[ExchangeRequest] = Field(..., description="Exchange requests to compare", min_length=1,
+                                            max_length=settings.BATCH_MAX_SIZE)
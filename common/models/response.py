@@ -1,5 +1,14 @@
-from pydantic import BaseModel
 from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ExchangeLeg(BaseModel):
+    sourceCurrency: str
+    targetCurrency: str
+    rate: Decimal
+    provider: str
 
 
 class ExchangeResponse(BaseModel):
@@ -10,6 +19,7 @@ class ExchangeResponse(BaseModel):
     rate: Decimal
     provider: str
     responseTimeMs: int
+    path: Optional[list[ExchangeLeg]] = None
 
 
 class ComparisonData(BaseModel):
@@ -18,9 +28,31 @@ class ComparisonData(BaseModel):
     totalProvidersQueried: int
     successfulProviders: int
     failedProviders: int
+    timedOutProviders: list[str] = []
 
 
 class BestExchangeResponse(BaseModel):
     statusCode: int
     message: str
     data: ComparisonData
+
+
+class BatchExchangeResult(BaseModel):
+    index: int
+    statusCode: int
+    message: str
+    data: Optional[ComparisonData] = None
+
+
+class BatchComparisonData(BaseModel):
+    results: list[BatchExchangeResult]
+    totalRequests: int
+    distinctPairs: int
+    successfulRequests: int
+    failedRequests: int
+
+
+class BatchExchangeResponse(BaseModel):
+    statusCode: int
+    message: str
+    data: BatchComparisonData
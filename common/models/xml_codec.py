@@ -0,0 +1,145 @@
+import re
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+
+# Fast path for the fixed API2 shapes. Anything these patterns do not accept (attributes, comments,
+# reordered or repeated elements, entity references) goes through ElementTree instead, which is only
+# imported once such a document or a batch shows up.
+_TEXT = r"([^<&\r\x00-\x08\x0b\x0c\x0e-\x1f]+)"
+_PROLOG = r"(?:<\?xml[^?>]*\?>)?\s*"
+
+_REQUEST_PATTERN = re.compile(
+    _PROLOG + rf"<XML>\s*<From>{_TEXT}</From>\s*<To>{_TEXT}</To>\s*<Amount>{_TEXT}</Amount>\s*</XML>\s*"
+)
+_RESPONSE_PATTERN = re.compile(_PROLOG + rf"<XML>\s*<Result>{_TEXT}</Result>\s*</XML>\s*")
+
+# Entity and DTD declarations are never part of an API2 document; refusing them up front keeps
+# entity expansion attacks (billion laughs, external entities) away from the parser.
+_FORBIDDEN_MARKUP = ("<!DOCTYPE", "<!ENTITY")
+_MAX_MARKUP_LENGTH = max(len(markup) for markup in _FORBIDDEN_MARKUP) - 1
+
+
+def _escape(text: str) -> str:
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def encode_request(from_currency: str, to_currency: str, amount: str) -> str:
+    return (f"<XML><From>{_escape(from_currency)}</From><To>{_escape(to_currency)}</To>"
+            f"<Amount>{_escape(amount)}</Amount></XML>")
+
+
+def encode_response(result: str) -> str:
+    return f"<XML><Result>{_escape(result)}</Result></XML>"
+
+
+def decode_request(xml_string: str) -> Tuple[str, str, str]:
+    match = _REQUEST_PATTERN.fullmatch(xml_string)
+    if match:
+        return match.groups()
+
+    root = _parse(xml_string)
+    return root.find("From").text, root.find("To").text, root.find("Amount").text
+
+
+def decode_response(xml_string: str) -> str:
+    match = _RESPONSE_PATTERN.fullmatch(xml_string)
+    if match:
+        return match.group(1)
+
+    return _parse(xml_string).find("Result").text
+
+
+def _parse(xml_string: str) -> "ET.Element":
+    if any(markup in xml_string for markup in _FORBIDDEN_MARKUP):
+        raise ValueError("XML documents with DTD or entity declarations are not accepted")
+
+    import xml.etree.ElementTree as ET
+
+    return ET.fromstring(xml_string)
+
+
+def encode_batch_request(items: Iterable[Tuple[str, str, str]]) -> str:
+    exchanges = "".join(
+        f"<Exchange><From>{_escape(from_currency)}</From><To>{_escape(to_currency)}</To>"
+        f"<Amount>{_escape(amount)}</Amount></Exchange>"
+        for from_currency, to_currency, amount in items
+    )
+    return f"<XML>{exchanges}</XML>"
+
+
+def encode_batch_response(results: Iterable[Union[str, Exception]]) -> str:
+    # One element per requested exchange, in request order: <Result> on success, <Error> otherwise
+    elements = "".join(
+        f"<Error>{_escape(str(result))}</Error>" if isinstance(result, Exception) else f"<Result>{_escape(result)}</Result>"
+        for result in results
+    )
+    return f"<XML>{elements}</XML>"
+
+
+def exchange_from_element(element: "ET.Element") -> Tuple[str, str, str]:
+    if element.tag != "Exchange":
+        raise ValueError(f"Unexpected <{element.tag}> element, expected <Exchange>")
+
+    fields = tuple(element.findtext(tag) for tag in ("From", "To", "Amount"))
+    if None in fields:
+        raise ValueError("<Exchange> requires <From>, <To> and <Amount> elements")
+    return fields
+
+
+def result_from_element(element: "ET.Element") -> Union[str, ValueError]:
+    if element.tag == "Result":
+        return element.text or ""
+    if element.tag == "Error":
+        return ValueError(element.text or "API2 rejected the exchange")
+    raise ValueError(f"Unexpected <{element.tag}> element, expected <Result> or <Error>")
+
+
+class BatchDocumentReader:
+    # Incremental reader for batched documents: bytes are fed as they arrive and every completed child
+    # of the root element is handed out and detached, so memory stays flat however large the body is.
+    def __init__(self):
+        import xml.etree.ElementTree as ET
+
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional["ET.Element"] = None
+        self._depth = 0
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> List["ET.Element"]:
+        # Markup may be split across chunks, so the end of the previous chunk is checked along with this one
+        window = self._tail + chunk
+        if any(markup.encode() in window for markup in _FORBIDDEN_MARKUP):
+            raise ValueError("XML documents with DTD or entity declarations are not accepted")
+        self._tail = window[-_MAX_MARKUP_LENGTH:]
+
+        self._parser.feed(chunk)
+        return self._read()
+
+    def close(self) -> List["ET.Element"]:
+        self._parser.close()
+        return self._read()
+
+    def _read(self) -> List["ET.Element"]:
+        elements = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                self._depth += 1
+                continue
+
+            self._depth -= 1
+            if self._depth == 1:
+                elements.append(element)
+                self._root.remove(element)
+        return elements
+
+
+def decode_batch_response(body: bytes) -> List[Union[str, ValueError]]:
+    reader = BatchDocumentReader()
+    elements = reader.feed(body) + reader.close()
+    return [result_from_element(element) for element in elements]
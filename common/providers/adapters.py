@@ -0,0 +1,103 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Any, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+from common.models.api_formats import (
+    API1Request, API1Response,
+    API2Request, API2Response,
+    API3Request, API3Response,
+    API3ExchangeData
+)
+
+CurrencyPair = Tuple[str, str]
+
+
+class ProviderAdapter(ABC):
+    name: str = ""
+    format: str = ""
+
+    def __init__(self, provider: Any):
+        self.provider = provider
+
+    @abstractmethod
+    def build_request(self, source_currency: str, target_currency: str, amount: Decimal) -> Any:
+        ...
+
+    @abstractmethod
+    def extract_rate(self, request: Any, response: Any) -> Decimal:
+        ...
+
+    def supported_pairs(self) -> Optional[FrozenSet[CurrencyPair]]:
+        # None means the provider does not advertise its pairs and every pair is attempted
+        pairs = getattr(self.provider, "supported_pairs", None)
+        return frozenset(pairs) if pairs is not None else None
+
+    def supports(self, source_currency: str, target_currency: str) -> bool:
+        pairs = getattr(self.provider, "supported_pairs", None)
+        return pairs is None or (source_currency, target_currency) in pairs
+
+    async def fetch_rate(self, source_currency: str, target_currency: str, amount: Decimal) -> Decimal:
+        request = self.build_request(source_currency, target_currency, amount)
+        response = await self.provider.get_exchange_rate(request)
+        return self.extract_rate(request, response)
+
+    def supports_batch(self) -> bool:
+        return callable(getattr(self.provider, "get_exchange_rates", None))
+
+    async def fetch_rates(self, items: Sequence[Tuple[str, str, Decimal]]) -> List[Union[Decimal, Exception]]:
+        # One provider round-trip for many pairs; failed items come back as exceptions in their position
+        requests = [self.build_request(source_currency, target_currency, amount)
+                    for source_currency, target_currency, amount in items]
+        responses = await self.provider.get_exchange_rates(requests)
+        return [
+            response if isinstance(response, Exception) else self.extract_rate(request, response)
+            for request, response in zip(requests, responses)
+        ]
+
+    def capabilities(self) -> dict:
+        pairs = self.supported_pairs()
+        return {
+            "name": self.name,
+            "format": self.format,
+            "batch": self.supports_batch(),
+            "supportedPairs": sorted(f"{source}/{target}" for source, target in pairs) if pairs is not None else None
+        }
+
+
+class API1Adapter(ProviderAdapter):
+    name = "API1"
+    format = "json"
+
+    def build_request(self, source_currency: str, target_currency: str, amount: Decimal) -> API1Request:
+        return API1Request(**{"from": source_currency, "to": target_currency, "value": amount})
+
+    def extract_rate(self, request: API1Request, response: API1Response) -> Decimal:
+        return response.rate
+
+
+class API2Adapter(ProviderAdapter):
+    name = "API2"
+    format = "xml"
+
+    def build_request(self, source_currency: str, target_currency: str, amount: Decimal) -> API2Request:
+        return API2Request(From=source_currency, To=target_currency, Amount=amount)
+
+    def extract_rate(self, request: API2Request, response: API2Response) -> Decimal:
+        return response.Result
+
+
+class API3Adapter(ProviderAdapter):
+    name = "API3"
+    format = "nested-json"
+
+    def build_request(self, source_currency: str, target_currency: str, amount: Decimal) -> API3Request:
+        return API3Request(
+            exchange=API3ExchangeData(
+                sourceCurrency=source_currency,
+                targetCurrency=target_currency,
+                quantity=amount
+            )
+        )
+
+    def extract_rate(self, request: API3Request, response: API3Response) -> Decimal:
+        return response.data.total / request.exchange.quantity
@@ -1,15 +1,19 @@
 import asyncio
 import random
-from decimal import Decimal
+from typing import Optional
 
 from common.models.api_formats import API1Request, API1Response
+from common.models.money import from_fixed_rate, to_fixed_rate
+from common.providers.errors import ProviderRejectedError
+from common.providers.simulator import ProviderSimulator
 from common.utils.logger import setup_logger
 
 
 class API1DirectProvider:
-    def __init__(self):
+    def __init__(self, simulator: Optional[ProviderSimulator] = None):
         self.name = "API1"
         self.logger = setup_logger(f"{__name__}.{self.name}_Direct")
+        self.simulator = simulator
 
         self.sample_rates = {
             ("USD", "EUR"): 0.85,
@@ -22,7 +26,17 @@ class API1DirectProvider:
             ("JPY", "USD"): 0.009,
         }
 
+    @property
+    def supported_pairs(self):
+        if self.simulator is not None:
+            return self.simulator.supported_pairs
+        return self.sample_rates.keys()
+
     async def get_exchange_rate(self, request: API1Request) -> API1Response:
+        if self.simulator is not None:
+            rate = await self.simulator.quote(request.from_, request.to)
+            return API1Response(rate=rate)
+
         await asyncio.sleep(random.uniform(0.1, 0.3))
 
         rate_key = (request.from_, request.to)
@@ -32,9 +46,9 @@ class API1DirectProvider:
             variation = random.uniform(-0.02, 0.02)
             rate = base_rate * (1 + variation)
 
-            self.logger.info(f"API1 - Rate: {rate} for {rate_key}")
+            self.logger.debug("API1 - Rate: %s for %s", rate, rate_key)
 
-            return API1Response(rate=Decimal(str(rate)))
+            return API1Response(rate=from_fixed_rate(to_fixed_rate(rate)))
 
-        self.logger.warning(f"API1 - Unsupported currency pair: {rate_key}")
-        raise ValueError(f"Currency conversion from {request.from_} to {request.to} is not supported by API1")
+        self.logger.warning("API1 - Unsupported currency pair: %s", rate_key)
+        raise ProviderRejectedError(f"Currency conversion from {request.from_} to {request.to} is not supported by API1")
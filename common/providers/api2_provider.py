@@ -1,15 +1,19 @@
 import asyncio
 import random
-from decimal import Decimal
+from typing import List, Optional, Union
 
 from common.models.api_formats import API2Request, API2Response
+from common.models.money import from_fixed_rate, to_fixed_rate
+from common.providers.errors import ProviderRejectedError
+from common.providers.simulator import ProviderSimulator
 from common.utils.logger import setup_logger
 
 
 class API2DirectProvider:
-    def __init__(self):
+    def __init__(self, simulator: Optional[ProviderSimulator] = None):
         self.name = "API2"
         self.logger = setup_logger(f"{__name__}.{self.name}_Direct")
+        self.simulator = simulator
 
         self.sample_rates = {
             ("USD", "EUR"): 0.86,
@@ -22,7 +26,17 @@ class API2DirectProvider:
             ("JPY", "USD"): 0.009,
         }
 
+    @property
+    def supported_pairs(self):
+        if self.simulator is not None:
+            return self.simulator.supported_pairs
+        return self.sample_rates.keys()
+
     async def get_exchange_rate(self, request: API2Request) -> API2Response:
+        if self.simulator is not None:
+            rate = await self.simulator.quote(request.From, request.To)
+            return API2Response(Result=rate)
+
         await asyncio.sleep(random.uniform(0.2, 0.4))
 
         rate_key = (request.From, request.To)
@@ -32,9 +46,18 @@ class API2DirectProvider:
             variation = random.uniform(-0.015, 0.015)
             rate = base_rate * (1 + variation)
 
-            self.logger.info(f"API2 - Rate: {rate} for {rate_key}")
+            self.logger.debug("API2 - Rate: %s for %s", rate, rate_key)
+
+            return API2Response(Result=from_fixed_rate(to_fixed_rate(rate)))
+
+        self.logger.warning("API2 - Unsupported currency pair: %s", rate_key)
+        raise ProviderRejectedError(f"Currency conversion from {request.From} to {request.To} is not supported by API2")
 
-            return API2Response(Result=Decimal(str(rate)))
+    async def get_exchange_rates(self, requests: List[API2Request]) -> List[Union[API2Response, ValueError]]:
+        return await asyncio.gather(*[self._get_exchange_rate_or_error(request) for request in requests])
 
-        self.logger.warning(f"API2 - Unsupported currency pair: {rate_key}")
-        raise ValueError(f"Currency conversion from {request.From} to {request.To} is not supported by API2")
+    async def _get_exchange_rate_or_error(self, request: API2Request) -> Union[API2Response, ValueError]:
+        try:
+            return await self.get_exchange_rate(request)
+        except ProviderRejectedError as e:
+            return e
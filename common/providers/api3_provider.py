@@ -1,15 +1,19 @@
 import asyncio
 import random
-from decimal import Decimal
+from typing import Optional
 
 from common.models.api_formats import API3Request, API3Response, API3DataResponse
+from common.models.money import from_fixed_rate, to_fixed_rate
+from common.providers.errors import ProviderRejectedError
+from common.providers.simulator import ProviderSimulator
 from common.utils.logger import setup_logger
 
 
 class API3DirectProvider:
-    def __init__(self):
+    def __init__(self, simulator: Optional[ProviderSimulator] = None):
         self.name = "API3"
         self.logger = setup_logger(f"{__name__}.{self.name}_Direct")
+        self.simulator = simulator
 
         self.sample_rates = {
             ("USD", "EUR"): 0.865,
@@ -22,7 +26,21 @@ class API3DirectProvider:
             ("JPY", "USD"): 0.0091,
         }
 
+    @property
+    def supported_pairs(self):
+        if self.simulator is not None:
+            return self.simulator.supported_pairs
+        return self.sample_rates.keys()
+
     async def get_exchange_rate(self, request: API3Request) -> API3Response:
+        if self.simulator is not None:
+            rate = await self.simulator.quote(request.exchange.sourceCurrency, request.exchange.targetCurrency)
+            return API3Response(
+                statusCode=200,
+                message="Exchange completed successfully",
+                data=API3DataResponse(total=rate * request.exchange.quantity)
+            )
+
         await asyncio.sleep(random.uniform(0.15, 0.35))
 
         rate_key = (request.exchange.sourceCurrency, request.exchange.targetCurrency)
@@ -32,15 +50,15 @@ class API3DirectProvider:
             variation = random.uniform(-0.025, 0.025)
             rate = base_rate * (1 + variation)
 
-            self.logger.info(f"API3 - Rate: {rate} for {rate_key}")
+            self.logger.debug("API3 - Rate: %s for %s", rate, rate_key)
 
-            converted_amount = rate * float(request.exchange.quantity)
+            converted_amount = from_fixed_rate(to_fixed_rate(rate)) * request.exchange.quantity
 
             return API3Response(
                 statusCode=200,
                 message="Exchange completed successfully",
-                data=API3DataResponse(total=Decimal(str(converted_amount)))
+                data=API3DataResponse(total=converted_amount)
             )
 
-        self.logger.warning(f"API3 - Unsupported currency pair: {rate_key}")
-        raise ValueError(f"Currency conversion from {request.exchange.sourceCurrency} to {request.exchange.targetCurrency} is not supported by API3")
+        self.logger.warning("API3 - Unsupported currency pair: %s", rate_key)
+        raise ProviderRejectedError(f"Currency conversion from {request.exchange.sourceCurrency} to {request.exchange.targetCurrency} is not supported by API3")
@@ -0,0 +1,4 @@
+class ProviderRejectedError(ValueError):
+    # The provider answered but refused the request (unsupported pair, 4xx). It says nothing about the
+    # provider's health, unlike malformed or failed responses, so circuit breakers ignore it.
+    pass
@@ -0,0 +1,47 @@
+from typing import Optional, Tuple
+
+from common.config.settings import settings
+from common.providers.adapters import API1Adapter, API2Adapter, API3Adapter
+from common.providers.registry import ProviderRegistry
+
+
+def create_direct_provider(name: str, simulated: Optional[bool] = None):
+    from common.providers.api1_provider import API1DirectProvider
+    from common.providers.api2_provider import API2DirectProvider
+    from common.providers.api3_provider import API3DirectProvider
+
+    provider_classes = {"API1": API1DirectProvider, "API2": API2DirectProvider, "API3": API3DirectProvider}
+    if name not in provider_classes:
+        raise ValueError(f"Unknown provider '{name}'. Expected one of: {', '.join(provider_classes)}")
+
+    simulated = settings.SIMULATOR_ENABLED if simulated is None else simulated
+    if not simulated:
+        return provider_classes[name]()
+
+    from common.providers.simulator import create_simulator
+
+    return provider_classes[name](simulator=create_simulator(name))
+
+
+def create_providers(mode: Optional[str] = None) -> Tuple[object, object, object]:
+    mode = (mode or settings.PROVIDER_MODE).lower()
+
+    if mode == "direct":
+        return create_direct_provider("API1"), create_direct_provider("API2"), create_direct_provider("API3")
+
+    if mode == "http":
+        from common.providers.http_providers import API1HttpProvider, API2HttpProvider, API3HttpProvider
+
+        return API1HttpProvider(), API2HttpProvider(), API3HttpProvider()
+
+    raise ValueError(f"Unknown provider mode '{mode}'. Expected 'direct' or 'http'")
+
+
+def create_provider_registry(mode: Optional[str] = None) -> ProviderRegistry:
+    api1_provider, api2_provider, api3_provider = create_providers(mode)
+
+    registry = ProviderRegistry()
+    registry.register(API1Adapter(api1_provider))
+    registry.register(API2Adapter(api2_provider))
+    registry.register(API3Adapter(api3_provider))
+    return registry
@@ -0,0 +1,48 @@
+import importlib.util
+from typing import TYPE_CHECKING, Dict
+
+from common.config.settings import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx is only imported once a client is needed, so services in direct mode never pay for it at startup
+_clients: Dict[str, "httpx.AsyncClient"] = {}
+
+
+def _http2_available() -> bool:
+    return settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def get_http_client(base_url: str) -> "httpx.AsyncClient":
+    # One pooled keep-alive client per provider host, so connection limits apply per host
+    client = _clients.get(base_url)
+
+    if client is None or client.is_closed:
+        import httpx
+
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+                pool=settings.HTTP_POOL_TIMEOUT_SECONDS
+            )
+        )
+        _clients[base_url] = client
+
+    return client
+
+
+async def close_http_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+
+    for client in clients:
+        await client.aclose()
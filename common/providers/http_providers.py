@@ -0,0 +1,116 @@
+from decimal import Decimal
+from typing import FrozenSet, List, Optional, Tuple, Union
+
+import httpx
+
+from common.config.settings import settings
+from common.models import xml_codec
+from common.models.api_formats import (
+    API1Request, API1Response,
+    API2Request, API2Response,
+    API3Request, API3Response
+)
+from common.providers.errors import ProviderRejectedError
+from common.providers.http_client import get_http_client
+from common.utils.logger import setup_logger
+
+
+def parse_pairs(value: str) -> Optional[FrozenSet[Tuple[str, str]]]:
+    pairs = frozenset(tuple(item.strip().upper().split("/", 1)) for item in value.split(",") if "/" in item)
+    return pairs or None
+
+
+class _HttpProvider:
+    name = ""
+
+    def __init__(self, base_url: str, client: Optional[httpx.AsyncClient] = None, pairs: Optional[str] = None):
+        self.base_url = base_url
+        self._client = client
+        self.logger = setup_logger(f"{__name__}.{self.name}_Http")
+        # Remote providers cannot be asked what they serve, so the pair set comes from settings. None keeps the
+        # provider open in the pair index, but the refresher has nothing to poll for it.
+        self.supported_pairs = parse_pairs(pairs if pairs is not None else getattr(settings, f"{self.name}_PAIRS"))
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client if self._client is not None else get_http_client(self.base_url)
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        # 429 means the provider is overloaded, which the circuit breaker has to see
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            self.logger.warning("%s - Rejected request (%s): %s", self.name, response.status_code, response.text)
+            raise ProviderRejectedError(f"{self.name} rejected the request: {response.text}")
+
+        response.raise_for_status()
+
+
+class API1HttpProvider(_HttpProvider):
+    name = "API1"
+
+    def __init__(self, base_url: str = settings.API1_URL, client: Optional[httpx.AsyncClient] = None,
+                 pairs: Optional[str] = None):
+        super().__init__(base_url, client, pairs)
+
+    async def get_exchange_rate(self, request: API1Request) -> API1Response:
+        response = await self.client.post(
+            "/exchange/rate",
+            content=request.model_dump_json(by_alias=True),
+            headers={"Content-Type": "application/json"}
+        )
+        self._raise_for_status(response)
+
+        return API1Response.model_validate_json(response.content)
+
+
+class API2HttpProvider(_HttpProvider):
+    name = "API2"
+
+    def __init__(self, base_url: str = settings.API2_URL, client: Optional[httpx.AsyncClient] = None,
+                 pairs: Optional[str] = None):
+        super().__init__(base_url, client, pairs)
+
+    async def get_exchange_rate(self, request: API2Request) -> API2Response:
+        response = await self.client.post(
+            "/exchange/rate",
+            content=request.to_xml(),
+            headers={"Content-Type": "application/xml"}
+        )
+        self._raise_for_status(response)
+
+        return API2Response.from_xml(response.text)
+
+    async def get_exchange_rates(self, requests: List[API2Request]) -> List[Union[API2Response, ValueError]]:
+        response = await self.client.post(
+            "/exchange/rate/batch",
+            content=xml_codec.encode_batch_request(
+                (request.From, request.To, str(request.Amount)) for request in requests),
+            headers={"Content-Type": "application/xml"}
+        )
+        self._raise_for_status(response)
+
+        results = xml_codec.decode_batch_response(response.content)
+        if len(results) != len(requests):
+            raise ValueError(f"API2 returned {len(results)} results for {len(requests)} exchanges")
+
+        return [
+            ProviderRejectedError(str(result)) if isinstance(result, ValueError) else API2Response(Result=Decimal(result))
+            for result in results
+        ]
+
+
+class API3HttpProvider(_HttpProvider):
+    name = "API3"
+
+    def __init__(self, base_url: str = settings.API3_URL, client: Optional[httpx.AsyncClient] = None,
+                 pairs: Optional[str] = None):
+        super().__init__(base_url, client, pairs)
+
+    async def get_exchange_rate(self, request: API3Request) -> API3Response:
+        response = await self.client.post(
+            "/exchange/rate",
+            content=request.model_dump_json(),
+            headers={"Content-Type": "application/json"}
+        )
+        self._raise_for_status(response)
+
+        return API3Response.model_validate_json(response.content)
@@ -0,0 +1,36 @@
+from typing import Dict, Iterator, List
+
+from common.providers.adapters import ProviderAdapter
+
+
+class ProviderRegistry:
+    def __init__(self):
+        self._adapters: Dict[str, ProviderAdapter] = {}
+
+    def register(self, adapter: ProviderAdapter) -> ProviderAdapter:
+        if adapter.name in self._adapters:
+            raise ValueError(f"Provider {adapter.name} is already registered")
+
+        self._adapters[adapter.name] = adapter
+        return adapter
+
+    def unregister(self, name: str) -> None:
+        self._adapters.pop(name, None)
+
+    def get(self, name: str) -> ProviderAdapter:
+        try:
+            return self._adapters[name]
+        except KeyError:
+            raise KeyError(f"Provider {name} is not registered") from None
+
+    def names(self) -> List[str]:
+        return list(self._adapters)
+
+    def __iter__(self) -> Iterator[ProviderAdapter]:
+        return iter(list(self._adapters.values()))
+
+    def __len__(self) -> int:
+        return len(self._adapters)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._adapters
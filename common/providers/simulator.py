@@ -0,0 +1,195 @@
+import asyncio
+import json
+import math
+import os
+import random
+from decimal import Decimal
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from common.config.settings import settings
+from common.models.money import from_fixed_rate, to_fixed_rate
+from common.providers.errors import ProviderRejectedError
+
+CurrencyPair = Tuple[str, str]
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_RATES_FILE = os.path.join(DATA_DIR, "usd_rates.json")
+
+# Defaults mirror the behaviour of the hand-written direct providers
+DEFAULT_PROVIDER_CONFIGS = {
+    "API1": {"latency": {"distribution": "uniform", "min_ms": 100, "max_ms": 300}, "jitter": 0.02},
+    "API2": {"latency": {"distribution": "uniform", "min_ms": 200, "max_ms": 400}, "jitter": 0.015, "spread": 0.005},
+    "API3": {"latency": {"distribution": "uniform", "min_ms": 150, "max_ms": 350}, "jitter": 0.025, "spread": 0.01},
+}
+
+
+class SimulatedProviderError(ConnectionError):
+    pass
+
+
+class SimulatedTimeoutError(TimeoutError):
+    pass
+
+
+def load_base_rates(path: Optional[str] = None) -> Dict[str, float]:
+    with open(path or settings.SIMULATOR_RATES_FILE or DEFAULT_RATES_FILE) as file:
+        document = json.load(file)
+
+    rates = {currency: float(rate) for currency, rate in document["rates"].items()}
+    if rates.get(document.get("base", "USD")) != 1.0:
+        raise ValueError("The base currency of a rate table must have a rate of 1")
+    return rates
+
+
+def load_simulator_config(path: Optional[str] = None) -> dict:
+    path = path or settings.SIMULATOR_CONFIG_FILE
+    if not path:
+        return {"seed": settings.SIMULATOR_SEED, "providers": {}}
+
+    with open(path) as file:
+        config = json.load(file)
+    config.setdefault("seed", settings.SIMULATOR_SEED)
+    config.setdefault("providers", {})
+    return config
+
+
+class LatencyModel:
+    DISTRIBUTIONS = ("constant", "uniform", "lognormal", "pareto")
+
+    def __init__(self, distribution: str = "constant", tail_probability: float = 0.0, tail_multiplier: float = 1.0,
+                 **parameters: float):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}'. Expected one of: "
+                             f"{', '.join(self.DISTRIBUTIONS)}")
+
+        self.distribution = distribution
+        self.parameters = parameters
+        self.tail_probability = tail_probability
+        self.tail_multiplier = tail_multiplier
+
+    def sample_ms(self, rng: random.Random) -> float:
+        p = self.parameters
+        if self.distribution == "constant":
+            latency = p.get("ms", 0.0)
+        elif self.distribution == "uniform":
+            latency = rng.uniform(p["min_ms"], p["max_ms"])
+        elif self.distribution == "lognormal":
+            latency = rng.lognormvariate(math.log(p["median_ms"]), p.get("sigma", 0.5))
+        else:
+            latency = p["scale_ms"] * rng.paretovariate(p.get("alpha", 2.0))
+
+        # An occasional much slower call on top of the base distribution models GC pauses, retries upstream, ...
+        if self.tail_probability and rng.random() < self.tail_probability:
+            latency *= self.tail_multiplier
+        return latency
+
+    def stats(self) -> dict:
+        return {"distribution": self.distribution, **self.parameters,
+                "tailProbability": self.tail_probability, "tailMultiplier": self.tail_multiplier}
+
+
+class ProviderSimulator:
+    # Every random draw comes from one RNG seeded per provider, so the same sequence of calls always sees
+    # the same latencies, failures and rates.
+    def __init__(self, name: str, base_rates: Dict[str, float], seed: int = 42,
+                 latency: Optional[LatencyModel] = None, pairs: Optional[FrozenSet[CurrencyPair]] = None,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, timeout_ms: float = 5000,
+                 spread: float = 0.0, jitter: float = 0.0, volatility: float = 0.0, mean_reversion: float = 0.0):
+        self.name = name
+        self.base_rates = base_rates
+        self.seed = seed
+        self.rng = random.Random(f"{seed}:{name}")
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_ms = timeout_ms
+        self.spread = spread
+        self.jitter = jitter
+        self.volatility = volatility
+        self.mean_reversion = mean_reversion
+
+        self.supported_pairs = pairs if pairs is not None else frozenset(
+            (source, target) for source in base_rates for target in base_rates if source != target)
+
+        self.calls = 0
+        self.injected_failures = 0
+        self.outage = False
+        self._drift: Dict[CurrencyPair, float] = {}
+
+    @classmethod
+    def from_config(cls, name: str, config: dict, base_rates: Dict[str, float], seed: int) -> "ProviderSimulator":
+        drift = config.get("drift", {})
+        pairs = config.get("pairs", "all")
+        return cls(
+            name,
+            base_rates,
+            seed=config.get("seed", seed),
+            latency=LatencyModel(**config.get("latency", {})),
+            pairs=None if pairs == "all" else frozenset(tuple(pair.split("/")) for pair in pairs),
+            error_rate=config.get("error_rate", 0.0),
+            timeout_rate=config.get("timeout_rate", 0.0),
+            timeout_ms=config.get("timeout_ms", 5000),
+            spread=config.get("spread", 0.0),
+            jitter=config.get("jitter", 0.0),
+            volatility=drift.get("volatility", 0.0),
+            mean_reversion=drift.get("mean_reversion", 0.0)
+        )
+
+    def inject_failures(self, count: int) -> None:
+        # The next `count` calls fail regardless of the configured error rate
+        self.injected_failures += count
+
+    def reference_rate(self, source_currency: str, target_currency: str) -> float:
+        return self.base_rates[target_currency] / self.base_rates[source_currency]
+
+    def next_rate(self, source_currency: str, target_currency: str) -> float:
+        # Drift is a mean-reverting random walk on the log of the rate, advanced one step per quote
+        pair = (source_currency, target_currency)
+        deviation = self._drift.get(pair, 0.0)
+        if self.volatility:
+            deviation = deviation * (1 - self.mean_reversion) + self.rng.gauss(0.0, self.volatility)
+            self._drift[pair] = deviation
+
+        noise = self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return self.reference_rate(source_currency, target_currency) * math.exp(deviation) * (1 + self.spread) * (1 + noise)
+
+    async def quote(self, source_currency: str, target_currency: str) -> Decimal:
+        self.calls += 1
+        latency_ms = self.latency.sample_ms(self.rng)
+        outcome = self.rng.random()
+
+        if (source_currency, target_currency) not in self.supported_pairs:
+            await asyncio.sleep(latency_ms / 1000)
+            raise ProviderRejectedError(
+                f"Currency conversion from {source_currency} to {target_currency} is not supported by {self.name}")
+
+        if outcome < self.timeout_rate:
+            await asyncio.sleep(self.timeout_ms / 1000)
+            raise SimulatedTimeoutError(f"{self.name} timed out after {self.timeout_ms:g} ms")
+
+        await asyncio.sleep(latency_ms / 1000)
+
+        if self.outage or self.injected_failures or outcome < self.timeout_rate + self.error_rate:
+            self.injected_failures = max(0, self.injected_failures - 1)
+            raise SimulatedProviderError(f"{self.name} simulated failure")
+
+        return from_fixed_rate(to_fixed_rate(self.next_rate(source_currency, target_currency)))
+
+    def stats(self) -> dict:
+        return {
+            "seed": self.seed,
+            "calls": self.calls,
+            "latency": self.latency.stats(),
+            "errorRate": self.error_rate,
+            "timeoutRate": self.timeout_rate,
+            "outage": self.outage,
+            "pairs": len(self.supported_pairs)
+        }
+
+
+def create_simulator(name: str, config: Optional[dict] = None,
+                     base_rates: Optional[Dict[str, float]] = None) -> ProviderSimulator:
+    config = config if config is not None else load_simulator_config()
+    provider_config = {**DEFAULT_PROVIDER_CONFIGS.get(name, {}), **config["providers"].get(name, {})}
+    return ProviderSimulator.from_config(
+        name, provider_config, base_rates if base_rates is not None else load_base_rates(), config["seed"])
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from common.services.metrics import MetricsRegistry
+
+T = TypeVar("T")
+
+
+class _SharedCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    # Identical calls that overlap in time share one execution: the first caller starts it and every
+    # duplicate arriving before it finishes awaits the same task. Nothing is kept once the call completes,
+    # so a result is never served to a request that arrived after it was produced.
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._calls: Dict[Hashable, _SharedCall] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+        self.bypassed = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        shared = self._calls.get(key)
+        if shared is None:
+            if len(self._calls) >= self.max_keys:
+                # Bookkeeping is bounded; past the limit new keys simply run on their own
+                self.bypassed += 1
+                return await call()
+
+            self.leaders += 1
+            shared = _SharedCall(asyncio.ensure_future(self._run_and_release(key, call)))
+            self._calls[key] = shared
+        else:
+            self.coalesced += 1
+
+        shared.waiters += 1
+        try:
+            # Shielded so that one cancelled caller does not cancel the call shared with the others
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            if shared.waiters == 1 and not shared.task.done():
+                shared.task.cancel()
+                await asyncio.wait({shared.task})
+            raise
+        finally:
+            shared.waiters -= 1
+
+    async def _run_and_release(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await call()
+        finally:
+            self._calls.pop(key, None)
+
+    def coalesce_ratio(self) -> float:
+        total = self.leaders + self.coalesced + self.bypassed
+        return self.coalesced / total if total else 0.0
+
+    def register_metrics(self, metrics: MetricsRegistry, operation: str) -> None:
+        requests = metrics.counter(
+            "ratecompare_coalescer_requests", "Requests seen by the coalescer by outcome", ("operation", "outcome"))
+        ratio = metrics.gauge(
+            "ratecompare_coalescer_ratio", "Requests served by joining an identical in-flight call", ("operation",))
+        in_flight = metrics.gauge(
+            "ratecompare_coalescer_in_flight_keys", "Distinct calls currently shared", ("operation",))
+
+        def collect() -> None:
+            requests.labels(operation, "leader").set(self.leaders)
+            requests.labels(operation, "coalesced").set(self.coalesced)
+            requests.labels(operation, "bypassed").set(self.bypassed)
+            ratio.labels(operation).set(round(self.coalesce_ratio(), 4))
+            in_flight.labels(operation).set(len(self._calls))
+
+        metrics.add_collector(collect)
+
+    def stats(self) -> dict:
+        return {
+            "inFlight": len(self._calls),
+            "maxKeys": self.max_keys,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+            "coalesceRatio": round(self.coalesce_ratio(), 4)
+        }
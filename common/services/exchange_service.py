@@ -1,169 +1,643 @@
 import asyncio
 import time
-from typing import Optional
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-from common.models.api_formats import (
-    API1Request, API1Response,
-    API2Request, API2Response,
-    API3Request, API3Response,
-    API3ExchangeData
+from common.config.settings import settings
+from common.models.money import convert, to_fixed_rate, to_minor
+from common.models.request import ExchangeRequest, SUPPORTED_CURRENCIES
+from common.models.response import (
+    ExchangeLeg, ExchangeResponse, BestExchangeResponse, ComparisonData,
+    BatchExchangeResult, BatchComparisonData, BatchExchangeResponse
+)
+from common.providers.adapters import ProviderAdapter
+from common.providers.errors import ProviderRejectedError
+from common.providers.factory import create_provider_registry
+from common.providers.registry import ProviderRegistry
+from common.services.latency import LatencyTracker
+from common.services.metrics import MetricsRegistry
+from common.services.pair_index import PairIndex
+from common.services.rate_cache import RateCache
+from common.services.rate_history import RateHistoryStore
+from common.services.rate_refresher import RateRefresher
+from common.services.rate_table import RateTable
+from common.services.shared_rate_table import SharedRateTable
+from common.services.triangulation import RateGraph, RateLeg
+from common.services.warm_start import WarmStarter
+from common.services.resilience import (
+    AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitOpenError, ConcurrencyLimitError, ProviderUnavailableError
 )
-from common.models.request import ExchangeRequest
-from common.models.response import ExchangeResponse, BestExchangeResponse, ComparisonData
-from common.providers.api1_provider import API1DirectProvider
-from common.providers.api2_provider import API2DirectProvider
-from common.providers.api3_provider import API3DirectProvider
 from common.utils.logger import setup_logger
 
 
+TRIANGULATED_PROVIDER = "TRIANGULATED"
+
+
+class ProviderQuote:
+    __slots__ = ("provider", "rate", "fixed_rate", "response_time_ms", "path")
+
+    def __init__(self, provider: str, rate: Decimal, response_time_ms: int, path: Optional[List[RateLeg]] = None):
+        # Quotes are compared and converted as fixed-point integers; the provider's Decimal is only echoed back
+        self.provider = provider
+        self.rate = rate
+        self.fixed_rate = to_fixed_rate(rate)
+        self.response_time_ms = response_time_ms
+        self.path = path
+
+
 class ExchangeService:
-    def __init__(self):
-        self.api1_provider = API1DirectProvider()
-        self.api2_provider = API2DirectProvider()
-        self.api3_provider = API3DirectProvider()
+    def __init__(self, registry: Optional[ProviderRegistry] = None):
+        self.registry = registry if registry is not None else create_provider_registry(settings.PROVIDER_MODE)
+        self.pair_index = PairIndex(self.registry)
+        self.rate_graph = RateGraph(settings.TRIANGULATION_MAX_RATE_AGE_SECONDS)
+        self.rate_table = RateTable()
+        self.rate_table.subscribe(self.rate_graph.update)
+        self.rate_history: Optional[RateHistoryStore] = None
+        self.rate_refresher = RateRefresher(self)
+        self.warm_starter: Optional[WarmStarter] = None
+        self.warm_start_hits = 0
+        self._revalidations: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._standby_task: Optional[asyncio.Task] = None
 
-        self.logger = setup_logger(__name__)
-        self.logger.info("ExchangeService initialized with direct format providers")
+        self.rate_cache = RateCache(settings.RATE_CACHE_TTL_SECONDS, settings.RATE_CACHE_MAX_ENTRIES)
+        self.latency_tracker = LatencyTracker(min_samples=settings.HEDGE_MIN_SAMPLES)
+        self.hedged_requests = 0
 
-    async def get_best_exchange_rate(self, request: ExchangeRequest) -> BestExchangeResponse:
+        self.circuit_breakers = {
+            name: CircuitBreaker(
+                failure_rate_threshold=settings.BREAKER_FAILURE_RATE,
+                slow_call_seconds=settings.BREAKER_SLOW_CALL_MS / 1000,
+                window_size=settings.BREAKER_WINDOW_SIZE,
+                min_calls=settings.BREAKER_MIN_CALLS,
+                open_seconds=settings.BREAKER_OPEN_SECONDS
+            )
+            for name in self.registry.names()
+        }
+        self.concurrency_limiters = {
+            name: AdaptiveConcurrencyLimiter(
+                initial_limit=settings.LIMITER_INITIAL_LIMIT,
+                max_limit=settings.LIMITER_MAX_LIMIT,
+                latency_target_seconds=settings.LIMITER_LATENCY_TARGET_MS / 1000
+            )
+            for name in self.registry.names()
+        }
+
+        self.metrics = MetricsRegistry()
+        self._register_metrics()
+
+        self.logger = setup_logger(__name__)
         self.logger.info(
-            f"Getting best exchange rate for {request.amount} {request.source_currency} to {request.target_currency}")
+            "ExchangeService initialized with %s format providers: %s",
+            settings.PROVIDER_MODE, ", ".join(self.registry.names()))
 
-        api1_request = API1Request(
-            **{"from": request.source_currency, "to": request.target_currency, "value": request.amount}
-        )
+    def _register_metrics(self) -> None:
+        self.provider_latency = self.metrics.histogram(
+            "ratecompare_provider_request_duration_seconds", "Latency of single provider calls", ("provider",))
+        self.provider_requests = self.metrics.counter(
+            "ratecompare_provider_requests", "Provider calls by outcome and error class", ("provider", "outcome", "error"))
+        self.compare_latency = self.metrics.histogram(
+            "ratecompare_compare_duration_seconds", "End-to-end latency of compare operations", ("operation",))
+        self.compares_in_flight = self.metrics.gauge(
+            "ratecompare_compares_in_flight", "Compare operations in progress", ("operation",))
 
-        api2_request = API2Request(
-            From=request.source_currency,
-            To=request.target_currency,
-            Amount=request.amount
-        )
+        provider_in_flight = self.metrics.gauge(
+            "ratecompare_provider_in_flight", "Provider calls in progress", ("provider",))
+        provider_limit = self.metrics.gauge(
+            "ratecompare_provider_concurrency_limit", "Adaptive concurrency limit per provider", ("provider",))
+        circuit_open = self.metrics.gauge(
+            "ratecompare_circuit_open", "1 while the provider circuit breaker is open", ("provider",))
+        cache_lookups = self.metrics.counter(
+            "ratecompare_rate_cache_lookups", "Rate cache lookups by result", ("result",))
+        cache_hit_ratio = self.metrics.gauge("ratecompare_rate_cache_hit_ratio", "Rate cache hits over all lookups")
+        cache_entries = self.metrics.gauge("ratecompare_rate_cache_entries", "Rates currently cached")
+
+        def collect() -> None:
+            for name, limiter in self.concurrency_limiters.items():
+                provider_in_flight.labels(name).set(limiter.in_flight)
+                provider_limit.labels(name).set(int(limiter.limit))
+            for name, breaker in self.circuit_breakers.items():
+                circuit_open.labels(name).set(int(breaker.state == CircuitBreaker.OPEN))
+
+            cache = self.rate_cache.stats()
+            for result in ("hits", "misses", "coalesced"):
+                cache_lookups.labels(result).set(cache[result])
+            cache_hit_ratio.set(cache["hitRatio"])
+            cache_entries.set(cache["entries"])
+
+        self.metrics.add_collector(collect)
+
+    @contextmanager
+    def _track_compare(self, operation: str):
+        in_flight = self.compares_in_flight.labels(operation)
+        in_flight.inc()
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            in_flight.dec()
+            self.compare_latency.labels(operation).observe(time.monotonic() - start_time)
+
+    @property
+    def api1_provider(self):
+        return self.registry.get("API1").provider
+
+    @api1_provider.setter
+    def api1_provider(self, provider) -> None:
+        self.registry.get("API1").provider = provider
+        self.pair_index.rebuild()
+
+    @property
+    def api2_provider(self):
+        return self.registry.get("API2").provider
+
+    @api2_provider.setter
+    def api2_provider(self, provider) -> None:
+        self.registry.get("API2").provider = provider
+        self.pair_index.rebuild()
+
+    @property
+    def api3_provider(self):
+        return self.registry.get("API3").provider
+
+    @api3_provider.setter
+    def api3_provider(self, provider) -> None:
+        self.registry.get("API3").provider = provider
+        self.pair_index.rebuild()
+
+    def use_shared_rate_table(self, path: str) -> SharedRateTable:
+        # Worker processes share one table: the elected writer refreshes it and the others only read
+        self.rate_table = SharedRateTable(path, self.registry.names(), SUPPORTED_CURRENCIES)
+        self.rate_table.subscribe(self.rate_graph.update)
+        self.rate_table.subscribe_shared(self.rate_graph.update)
+        if self.rate_history is not None:
+            self.rate_table.subscribe(self.rate_history.record)
+        return self.rate_table
 
-        api3_request = API3Request(
-            exchange=API3ExchangeData(
-                sourceCurrency=request.source_currency,
-                targetCurrency=request.target_currency,
-                quantity=request.amount
+    def use_rate_history(self, directory: str, segment_capacity: int, max_read_segments: int = 64) -> RateHistoryStore:
+        # Every quote fetched from a provider lands in the rate table, so the history listens there
+        self.rate_history = RateHistoryStore(directory, segment_capacity, max_read_segments)
+        self.rate_table.subscribe(self.rate_history.record)
+        return self.rate_history
+
+    def use_warm_start(self, path: str, interval_seconds: float, max_age_seconds: float) -> WarmStarter:
+        # Loads the last snapshot right away; call before the service accepts traffic
+        self.warm_starter = WarmStarter(self, path, interval_seconds, max_age_seconds)
+        self.warm_starter.restore()
+        return self.warm_starter
+
+    def start_background_refresh(self, poll_seconds: float = settings.SHARED_RATE_TABLE_POLL_SECONDS) -> None:
+        # A reader of the shared table waits for the writer's lock instead of polling providers itself
+        if isinstance(self.rate_table, SharedRateTable) and not self.rate_table.is_writer:
+            if self._standby_task is None or self._standby_task.done():
+                self._standby_task = asyncio.ensure_future(self._standby(self.rate_table, poll_seconds))
+            return
+        self.rate_refresher.start()
+
+    async def stop_background_refresh(self) -> None:
+        if self._standby_task is not None:
+            self._standby_task.cancel()
+            await asyncio.wait([self._standby_task])
+            self._standby_task = None
+        await self.rate_refresher.stop()
+
+    async def _standby(self, shared_rates: SharedRateTable, poll_seconds: float) -> None:
+        while not shared_rates.try_become_writer():
+            # Keeps triangulation on the same rates the writer publishes
+            shared_rates.poll_shared()
+            await asyncio.sleep(poll_seconds)
+
+        self.logger.info("Took over the shared rate table %s", shared_rates.path)
+        self.rate_refresher.start()
+        if self.warm_starter is not None:
+            self.warm_starter.start()
+
+    async def get_best_exchange_rate(self, request: ExchangeRequest,
+                                     deadline_ms: Optional[int] = None) -> BestExchangeResponse:
+        with self._track_compare("compare"):
+            return await self._get_best_exchange_rate(request, deadline_ms)
+
+    async def get_best_exchange_rates(self, requests: List[ExchangeRequest],
+                                      max_concurrency: Optional[int] = None) -> BatchExchangeResponse:
+        with self._track_compare("batch"):
+            return await self._get_best_exchange_rates(requests, max_concurrency)
+
+    async def _get_best_exchange_rate(self, request: ExchangeRequest,
+                                      deadline_ms: Optional[int] = None) -> BestExchangeResponse:
+        if not self.pair_index.providers_for(request.source_currency, request.target_currency) \
+                and not self._can_triangulate(request.source_currency, request.target_currency):
+            raise ValueError(self._unsupported_pair_message(request))
+
+        self.logger.info("Getting best exchange rate for %s %s to %s",
+                         request.amount, request.source_currency, request.target_currency)
+
+        quotes, timed_out = await self._fetch_quotes(request, deadline_ms)
+
+        return self._build_best_response(request, quotes, timed_out)
+
+    async def _get_best_exchange_rates(self, requests: List[ExchangeRequest],
+                                       max_concurrency: Optional[int] = None) -> BatchExchangeResponse:
+        pair_requests: Dict[Tuple[str, str], ExchangeRequest] = {}
+        for request in requests:
+            pair_requests.setdefault((request.source_currency, request.target_currency), request)
+
+        self.logger.info("Getting best exchange rates for %d requests over %d distinct pairs",
+                         len(requests), len(pair_requests))
+
+        self._prefetch_batches(pair_requests)
+
+        semaphore = asyncio.Semaphore(max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+
+        async def fetch_pair(pair_request: ExchangeRequest) -> Tuple[list, List[str]]:
+            async with semaphore:
+                return await self._fetch_quotes(pair_request)
+
+        pair_quotes = await asyncio.gather(*[fetch_pair(r) for r in pair_requests.values()])
+        quotes_by_pair = dict(zip(pair_requests.keys(), pair_quotes))
+
+        results, successful_count = self._build_batch_results(requests, quotes_by_pair)
+
+        return BatchExchangeResponse.model_construct(
+            statusCode=200,
+            message=f"Batch exchange comparison completed. {successful_count} of {len(requests)} requests succeeded",
+            data=BatchComparisonData.model_construct(
+                results=results,
+                totalRequests=len(requests),
+                distinctPairs=len(pair_requests),
+                successfulRequests=successful_count,
+                failedRequests=len(requests) - successful_count
             )
         )
 
-        tasks = [
-            self._call_api1(api1_request, request),
-            self._call_api2(api2_request, request),
-            self._call_api3(api3_request, request)
-        ]
+    def _prefetch_batches(self, pair_requests: Dict[Tuple[str, str], ExchangeRequest]) -> None:
+        # Pairs a batch-capable provider would otherwise be asked for one by one are fetched in one
+        # round-trip; the per-pair lookups that follow join those fetches through the rate cache
+        for adapter in self.registry:
+            if not adapter.supports_batch():
+                continue
+
+            keys = [
+                (adapter.name, source, target) for source, target in pair_requests
+                if adapter.supports(source, target) and self.rate_table.get_fresh(
+                    adapter.name, source, target, settings.RATE_TABLE_MAX_STALENESS_SECONDS) is None
+            ]
+            if len(keys) < 2:
+                continue
+
+            self.rate_cache.prefetch_many(keys, lambda missing, adapter=adapter: self.fetch_provider_rates(
+                adapter, [(source, target, pair_requests[(source, target)].amount) for _, source, target in missing]
+            ))
+
+    def _build_batch_results(self, requests: List[ExchangeRequest],
+                             quotes_by_pair: Dict[Tuple[str, str], Tuple[list, List[str]]]) -> Tuple[list, int]:
+        results = []
+        successful_count = 0
+        for index, request in enumerate(requests):
+            try:
+                quotes, timed_out = quotes_by_pair[(request.source_currency, request.target_currency)]
+                response = self._build_best_response(request, quotes, timed_out)
+                results.append(BatchExchangeResult.model_construct(
+                    index=index,
+                    statusCode=response.statusCode,
+                    message=response.message,
+                    data=response.data
+                ))
+                successful_count += 1
+            except ValueError as e:
+                results.append(BatchExchangeResult.model_construct(
+                    index=index, statusCode=400, message=str(e), data=None))
+
+        return results, successful_count
+
+    async def _fetch_quotes(self, request: ExchangeRequest,
+                            deadline_ms: Optional[int] = None) -> Tuple[list, List[str]]:
+        adapters = self.pair_index.providers_for(request.source_currency, request.target_currency)
+
+        if not adapters:
+            if not self._can_triangulate(request.source_currency, request.target_currency):
+                return [], []
+            return [(TRIANGULATED_PROVIDER, await self._triangulate(request, deadline_ms))], []
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        table_quotes = self._quotes_from_table(adapters, request.source_currency, request.target_currency)
+        if table_quotes is not None:
+            return table_quotes, []
 
-        successful_offers = []
+        tasks = [asyncio.ensure_future(self._call_provider(adapter, request)) for adapter in adapters]
+
+        deadline_ms = settings.COMPARE_DEADLINE_MS if deadline_ms is None else deadline_ms
+        pending = set()
+        try:
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=deadline_ms / 1000 if deadline_ms > 0 else None)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if pending:
+            await asyncio.wait(pending)
+
+        quotes = []
+        timed_out = []
+
+        for adapter, task in zip(adapters, tasks):
+            if task.cancelled():
+                self.logger.warning("Provider %s timed out after %s ms", adapter.name, deadline_ms)
+                timed_out.append(adapter.name)
+                quotes.append((adapter.name, None))
+            elif task.exception() is not None:
+                quotes.append((adapter.name, task.exception()))
+            else:
+                quotes.append((adapter.name, task.result()))
+
+        return quotes, timed_out
+
+    def _quotes_from_table(self, adapters, source_currency: str, target_currency: str) -> Optional[list]:
+        quotes = []
+        for adapter in adapters:
+            rate = self.rate_table.get_fresh(
+                adapter.name, source_currency, target_currency, settings.RATE_TABLE_MAX_STALENESS_SECONDS)
+            if rate is None:
+                return None
+            quotes.append((adapter.name, ProviderQuote(adapter.name, rate, 0)))
+        return quotes
+
+    def _build_best_response(self, request: ExchangeRequest, quotes: list,
+                             timed_out: Optional[List[str]] = None) -> BestExchangeResponse:
+        successful_quotes = []
         failed_count = 0
-        provider_names = ["API1", "API2", "API3"]
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.error(f"Provider {provider_names[i]} failed: {str(result)}")
+        for provider_name, quote in quotes:
+            if isinstance(quote, Exception):
+                self.logger.error("Provider %s failed: %s", provider_name, quote)
                 failed_count += 1
-            elif result:
-                successful_offers.append(result)
+            elif quote:
+                successful_quotes.append(quote)
             else:
                 failed_count += 1
 
-        if not successful_offers:
-            if failed_count == len(provider_names):
-                raise ValueError(
-                    "All providers failed to provide exchange rates. Please check currency codes and try again.")
-            else:
-                raise ValueError("No providers returned valid exchange rates")
+        if not successful_quotes:
+            raise ValueError(self._no_offer_message(request, quotes))
 
-        best_offer = max(successful_offers, key=lambda x: x.convertedAmount)
+        # For one amount the converted amount only grows with the rate, so the highest rate is the best offer
+        best_quote = max(successful_quotes, key=lambda quote: quote.fixed_rate)
+        amount = to_minor(request.amount, request.source_currency)
+        successful_offers = [self._offer_from_quote(request, quote, amount) for quote in successful_quotes]
+        best_offer = successful_offers[successful_quotes.index(best_quote)]
 
-        comparison_data = ComparisonData(
+        comparison_data = ComparisonData.model_construct(
             bestOffer=best_offer,
             allOffers=successful_offers,
-            totalProvidersQueried=len(provider_names),
+            totalProvidersQueried=len(quotes),
             successfulProviders=len(successful_offers),
-            failedProviders=failed_count
+            failedProviders=failed_count,
+            timedOutProviders=timed_out or []
         )
 
-        return BestExchangeResponse(
+        return BestExchangeResponse.model_construct(
             statusCode=200,
-            message=f"Exchange comparison completed successfully. Best rate from {best_offer.provider}: {best_offer.rate}",
+            message=self._best_offer_message(best_offer),
             data=comparison_data
         )
 
-    async def _call_api1(self, api1_request: API1Request, original_request: ExchangeRequest) -> Optional[
-        ExchangeResponse]:
+    @staticmethod
+    def _offer_from_quote(request: ExchangeRequest, quote: ProviderQuote, amount: int) -> ExchangeResponse:
+        # Every field already has its final type, so the models are constructed without re-validation
+        path = [
+            ExchangeLeg.model_construct(sourceCurrency=source, targetCurrency=target, rate=rate, provider=provider)
+            for source, target, provider, rate in quote.path
+        ] if quote.path else None
+
+        return ExchangeResponse.model_construct(
+            sourceCurrency=request.source_currency,
+            targetCurrency=request.target_currency,
+            amount=request.amount,
+            convertedAmount=convert(amount, request.source_currency, request.target_currency, quote.fixed_rate),
+            rate=quote.rate,
+            provider=quote.provider,
+            responseTimeMs=quote.response_time_ms,
+            path=path
+        )
+
+    @staticmethod
+    def _best_offer_message(best_offer: ExchangeResponse) -> str:
+        return f"Exchange comparison completed successfully. Best rate from {best_offer.provider}: {best_offer.rate}"
+
+    def _no_offer_message(self, request: ExchangeRequest, quotes: list) -> str:
+        if not quotes:
+            return self._unsupported_pair_message(request)
+        if all(isinstance(quote, Exception) or not quote for _, quote in quotes):
+            return "All providers failed to provide exchange rates. Please check currency codes and try again."
+        return "No providers returned valid exchange rates"
+
+    @staticmethod
+    def _unsupported_pair_message(request: ExchangeRequest) -> str:
+        return (f"All providers failed to provide exchange rates: no provider supports "
+                f"{request.source_currency} to {request.target_currency}. Please check currency codes and try again.")
+
+    async def _call_provider(self, adapter: ProviderAdapter,
+                             original_request: ExchangeRequest) -> Optional[ProviderQuote]:
+        source_currency = original_request.source_currency
+        target_currency = original_request.target_currency
+
         try:
-            start_time = time.time()
-            api1_response: API1Response = await self.api1_provider.get_exchange_rate(api1_request)
-            response_time = int((time.time() - start_time) * 1000)
-
-            converted_amount = api1_response.rate * original_request.amount
-
-            return ExchangeResponse(
-                sourceCurrency=original_request.source_currency,
-                targetCurrency=original_request.target_currency,
-                amount=original_request.amount,
-                convertedAmount=converted_amount,
-                rate=api1_response.rate,
-                provider="API1",
-                responseTimeMs=response_time
-            )
+            start_time = time.monotonic()
+            rate = self.rate_table.get_fresh(
+                adapter.name, source_currency, target_currency, settings.RATE_TABLE_MAX_STALENESS_SECONDS)
+            if rate is None and self.warm_starter is not None:
+                rate = self._warm_start_rate(adapter, source_currency, target_currency, original_request.amount)
+            if rate is None:
+                rate = await self.rate_cache.get_or_fetch(
+                    (adapter.name, source_currency, target_currency),
+                    lambda: self.fetch_provider_rate(adapter, source_currency, target_currency, original_request.amount)
+                )
+            response_time = int((time.monotonic() - start_time) * 1000)
+
+            return ProviderQuote(adapter.name, rate, response_time)
+        except ProviderUnavailableError as e:
+            self.logger.debug("%s skipped: %s", adapter.name, e)
+            return None
         except (ValueError, TypeError, KeyError, AttributeError) as e:
-            self.logger.error(f"API1 conversion error: {str(e)}")
+            self.logger.error("%s conversion error: %s", adapter.name, e)
             return None
         except Exception as e:
-            self.logger.error(f"API1 unexpected error: {str(e)}")
+            self.logger.error("%s unexpected error: %s", adapter.name, e)
             return None
 
-    async def _call_api2(self, api2_request: API2Request, original_request: ExchangeRequest) -> Optional[
-        ExchangeResponse]:
-        try:
-            start_time = time.time()
-            api2_response: API2Response = await self.api2_provider.get_exchange_rate(api2_request)
-            response_time = int((time.time() - start_time) * 1000)
-
-            rate = api2_response.Result
-            converted_amount = rate * original_request.amount
-
-            return ExchangeResponse(
-                sourceCurrency=original_request.source_currency,
-                targetCurrency=original_request.target_currency,
-                amount=original_request.amount,
-                convertedAmount=converted_amount,
-                rate=rate,
-                provider="API2",
-                responseTimeMs=response_time
-            )
-        except (ValueError, TypeError, KeyError, AttributeError) as e:
-            self.logger.error(f"API2 conversion error: {str(e)}")
+    def _warm_start_rate(self, adapter: ProviderAdapter, source_currency: str, target_currency: str,
+                         amount: Decimal) -> Optional[Decimal]:
+        # Stale while revalidate: a rate restored from the snapshot answers right away while one background
+        # fetch per key replaces it, so a fresh instance does not fan out to every provider on its first requests
+        rate = self.rate_table.get_stale(
+            adapter.name, source_currency, target_currency, self.warm_starter.max_age_seconds)
+        if rate is None:
             return None
-        except Exception as e:
-            self.logger.error(f"API2 unexpected error: {str(e)}")
+
+        key = (adapter.name, source_currency, target_currency)
+        if key not in self._revalidations:
+            task = asyncio.ensure_future(self.rate_cache.get_or_fetch(
+                key, lambda: self.fetch_provider_rate(adapter, source_currency, target_currency, amount)))
+            self._revalidations[key] = task
+            task.add_done_callback(lambda done: self._revalidated(key, done))
+
+        self.warm_start_hits += 1
+        return rate
+
+    def _revalidated(self, key: Tuple[str, str, str], task: asyncio.Task) -> None:
+        self._revalidations.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.debug("Revalidating %s failed: %s", key, task.exception())
+
+    async def fetch_provider_rate(self, adapter: ProviderAdapter, source_currency: str, target_currency: str,
+                                  amount: Decimal) -> Decimal:
+        rate = await self._provider_fetch(
+            adapter.name, lambda: adapter.fetch_rate(source_currency, target_currency, amount))
+        self.rate_table.update(adapter.name, source_currency, target_currency, rate)
+        return rate
+
+    async def fetch_provider_rates(self, adapter: ProviderAdapter,
+                                   items: Sequence[Tuple[str, str, Decimal]]) -> List[Union[Decimal, Exception]]:
+        batch_size = settings.PROVIDER_BATCH_MAX_ITEMS
+        chunks = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+        results = []
+        for chunk_results in await asyncio.gather(*[
+            self._guarded_fetch(adapter.name, lambda chunk=chunk: adapter.fetch_rates(chunk), track_latency=False)
+            for chunk in chunks
+        ]):
+            results.extend(chunk_results)
+
+        for (source_currency, target_currency, _), result in zip(items, results):
+            if not isinstance(result, Exception):
+                self.rate_table.update(adapter.name, source_currency, target_currency, result)
+        return results
+
+    def _can_triangulate(self, source_currency: str, target_currency: str) -> bool:
+        return settings.TRIANGULATION_ENABLED and bool(
+            self.pair_index.route_legs(source_currency, target_currency, settings.TRIANGULATION_MAX_LEGS))
+
+    async def _triangulate(self, request: ExchangeRequest, deadline_ms: Optional[int] = None) -> Optional[ProviderQuote]:
+        start_time = time.monotonic()
+        max_legs = settings.TRIANGULATION_MAX_LEGS
+        path = self.rate_graph.best_path(request.source_currency, request.target_currency, max_legs)
+
+        if path is None:
+            # Cold graph: fetch the legs of the shortest routes once, later lookups are served from memory
+            legs = self.pair_index.route_legs(request.source_currency, request.target_currency, max_legs)
+            await asyncio.gather(*[
+                self._fetch_quotes(
+                    ExchangeRequest.model_construct(source_currency=source, target_currency=target,
+                                                    amount=request.amount),
+                    deadline_ms
+                )
+                for source, target in legs
+            ])
+            path = self.rate_graph.best_path(request.source_currency, request.target_currency, max_legs)
+
+        if path is None:
+            self.logger.warning("No triangulation path for %s to %s", request.source_currency, request.target_currency)
             return None
 
-    async def _call_api3(self, api3_request: API3Request, original_request: ExchangeRequest) -> Optional[
-        ExchangeResponse]:
+        rate = Decimal(1)
+        for _, _, _, leg_rate in path:
+            rate *= leg_rate
+
+        return ProviderQuote(TRIANGULATED_PROVIDER, rate, int((time.monotonic() - start_time) * 1000), path)
+
+    async def _provider_fetch(self, provider: str, fetch: Callable[[], Awaitable[Decimal]]) -> Decimal:
+        hedge_after = self.latency_tracker.percentile(provider, settings.HEDGE_PERCENTILE) \
+            if settings.HEDGE_ENABLED else None
+
+        if hedge_after is None:
+            return await self._guarded_fetch(provider, fetch)
+
+        attempts = {asyncio.ensure_future(self._guarded_fetch(provider, fetch))}
         try:
-            start_time = time.time()
-            api3_response: API3Response = await self.api3_provider.get_exchange_rate(api3_request)
-            response_time = int((time.time() - start_time) * 1000)
-
-            converted_amount = api3_response.data.total
-            rate = converted_amount / original_request.amount
-
-            return ExchangeResponse(
-                sourceCurrency=original_request.source_currency,
-                targetCurrency=original_request.target_currency,
-                amount=original_request.amount,
-                convertedAmount=converted_amount,
-                rate=rate,
-                provider="API3",
-                responseTimeMs=response_time
-            )
-        except (ValueError, TypeError, KeyError, AttributeError) as e:
-            self.logger.error(f"API3 conversion error: {str(e)}")
-            return None
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done:
+                self.hedged_requests += 1
+                self.logger.info("Hedging %s request after %d ms", provider, hedge_after * 1000)
+                attempts.add(asyncio.ensure_future(self._guarded_fetch(provider, fetch)))
+
+            while True:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                failures = [attempt for attempt in done if attempt.exception() is not None]
+                successes = [attempt for attempt in done if attempt.exception() is None]
+
+                if successes:
+                    return successes[0].result()
+                if not attempts:
+                    raise failures[0].exception()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _guarded_fetch(self, provider: str, fetch: Callable[[], Awaitable[Decimal]],
+                             track_latency: bool = True) -> Decimal:
+        breaker = self.circuit_breakers[provider]
+        limiter = self.concurrency_limiters[provider]
+
+        if not breaker.allow_request():
+            self.provider_requests.labels(provider, "skipped", "CircuitOpenError").inc()
+            raise CircuitOpenError(provider)
+        if not limiter.try_acquire():
+            breaker.record_ignored()
+            self.provider_requests.labels(provider, "skipped", "ConcurrencyLimitError").inc()
+            raise ConcurrencyLimitError(provider, int(limiter.limit))
+
+        start_time = time.monotonic()
+        try:
+            rate = await fetch()
+        except ProviderRejectedError as e:
+            # Unsupported pairs and rejected requests are not a sign of an unhealthy provider; malformed
+            # responses (ValidationError, JSONDecodeError and other ValueErrors) still count as failures
+            breaker.record_ignored()
+            limiter.release()
+            self.provider_requests.labels(provider, "rejected", type(e).__name__).inc()
+            raise
         except Exception as e:
-            self.logger.error(f"API3 unexpected error: {str(e)}")
-            return None
+            latency = time.monotonic() - start_time
+            breaker.record_failure()
+            limiter.release(latency, success=False)
+            self.provider_requests.labels(provider, "error", type(e).__name__).inc()
+            if track_latency:
+                self.provider_latency.labels(provider).observe(latency)
+            raise
+        except asyncio.CancelledError:
+            breaker.record_ignored()
+            limiter.release()
+            self.provider_requests.labels(provider, "cancelled", "").inc()
+            raise
+
+        latency = time.monotonic() - start_time
+        breaker.record_success(latency)
+        limiter.release(latency, success=True)
+        self.provider_requests.labels(provider, "success", "").inc()
+        if track_latency:
+            # Batch latencies would inflate the single-call percentiles that drive hedging
+            self.latency_tracker.record(provider, latency)
+            self.provider_latency.labels(provider).observe(latency)
+        return rate
+
+    def get_stats(self) -> dict:
+        latency = self.latency_tracker.stats()
+        return {
+            "providers": {
+                provider: {
+                    "capabilities": self.registry.get(provider).capabilities(),
+                    "circuitBreaker": self.circuit_breakers[provider].stats(),
+                    "concurrencyLimiter": self.concurrency_limiters[provider].stats(),
+                    "latency": latency.get(provider)
+                }
+                for provider in self.circuit_breakers
+            },
+            "pairIndex": self.pair_index.stats(),
+            "rateGraph": self.rate_graph.stats(),
+            "rateCache": self.rate_cache.stats(),
+            "rateTable": self.rate_table.stats(settings.RATE_TABLE_MAX_STALENESS_SECONDS),
+            "refresher": self.rate_refresher.stats(),
+            "rateHistory": self.rate_history.stats() if self.rate_history is not None else None,
+            "warmStart": {**self.warm_starter.stats(), "staleHits": self.warm_start_hits}
+            if self.warm_starter is not None else None,
+            "hedgedRequests": self.hedged_requests
+        }
@@ -0,0 +1,43 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+class LatencyTracker:
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, seconds: float) -> None:
+        samples = self._samples.get(provider)
+        if samples is None:
+            samples = self._samples[provider] = deque(maxlen=self.window_size)
+        samples.append(seconds)
+
+    def samples(self) -> Dict[str, List[float]]:
+        return {provider: list(samples) for provider, samples in self._samples.items()}
+
+    def restore(self, provider: str, samples: List[float]) -> None:
+        for seconds in samples[-self.window_size:]:
+            self.record(provider, seconds)
+
+    def percentile(self, provider: str, quantile: float) -> Optional[float]:
+        samples = self._samples.get(provider)
+        if not samples or len(samples) < self.min_samples:
+            return None
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        stats = {}
+        for provider, samples in self._samples.items():
+            p50 = self.percentile(provider, 0.50)
+            p95 = self.percentile(provider, 0.95)
+            stats[provider] = {
+                "samples": len(samples),
+                "p50Ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95Ms": round(p95 * 1000, 1) if p95 is not None else None
+            }
+        return stats
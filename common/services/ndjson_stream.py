@@ -0,0 +1,85 @@
+import asyncio
+import json
+from collections import deque
+from typing import AsyncIterator, Tuple
+
+from pydantic import ValidationError
+
+from common.models.request import ExchangeRequest
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes],
+                            max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[Tuple[int, bytes]]:
+    buffer = b""
+    line_number = 0
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+        if len(buffer) > max_line_bytes:
+            raise ValueError(f"NDJSON line {line_number + 1} exceeds {max_line_bytes} bytes")
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _error_line(line_number: int, status_code: int, message: str, error: str) -> bytes:
+    return json.dumps({
+        "statusCode": status_code,
+        "message": message,
+        "data": {"line": line_number, "error": error}
+    }, separators=(",", ":")).encode() + b"\n"
+
+
+async def _compare_line(exchange_service, line_number: int, line: bytes) -> bytes:
+    try:
+        request = ExchangeRequest.model_validate_json(line)
+    except ValidationError as e:
+        message = "; ".join(error["msg"] for error in e.errors())
+        return _error_line(line_number, 400, message, "Validation Error")
+
+    try:
+        response = await exchange_service.get_best_exchange_rate(request)
+    except ValueError as e:
+        return _error_line(line_number, 400, str(e), "Validation Error")
+    except Exception as e:
+        return _error_line(line_number, 500, str(e), "Internal Server Error")
+
+    return response.model_dump_json().encode() + b"\n"
+
+
+async def stream_best_exchange_rates(exchange_service, chunks: AsyncIterator[bytes],
+                                     max_in_flight: int) -> AsyncIterator[bytes]:
+    pending: deque = deque()
+    body_error = None
+
+    try:
+        try:
+            async for line_number, line in iter_ndjson_lines(chunks):
+                pending.append(asyncio.ensure_future(_compare_line(exchange_service, line_number, line)))
+
+                # Results are emitted in input order; the body is not read further while the window is full
+                while len(pending) >= max_in_flight:
+                    yield await pending.popleft()
+
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+        except ValueError as e:
+            body_error = e
+
+        while pending:
+            yield await pending.popleft()
+
+        if body_error is not None:
+            yield _error_line(0, 413, str(body_error), "Payload Too Large")
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,89 @@
+from typing import Dict, List, Set, Tuple
+
+from common.providers.adapters import CurrencyPair, ProviderAdapter
+from common.providers.registry import ProviderRegistry
+
+
+class PairIndex:
+    def __init__(self, registry: ProviderRegistry):
+        self.registry = registry
+        self._providers_by_pair: Dict[CurrencyPair, Tuple[ProviderAdapter, ...]] = {}
+        self._open_providers: Tuple[ProviderAdapter, ...] = ()
+        self._adjacency: Dict[str, Set[str]] = {}
+        self._routes: Dict[Tuple[str, str, int], List[CurrencyPair]] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        providers_by_pair: Dict[CurrencyPair, list] = {}
+        open_providers = []
+
+        for adapter in self.registry:
+            pairs = adapter.supported_pairs()
+            if pairs is None:
+                open_providers.append(adapter)
+                continue
+            for pair in pairs:
+                providers_by_pair.setdefault(pair, []).append(adapter)
+
+        # Providers that do not advertise their pairs are attempted for every pair, after the advertised ones
+        self._open_providers = tuple(open_providers)
+        self._providers_by_pair = {
+            pair: tuple(adapters) + self._open_providers for pair, adapters in providers_by_pair.items()
+        }
+
+        self._adjacency = {}
+        for source, target in self._providers_by_pair:
+            self._adjacency.setdefault(source, set()).add(target)
+        self._routes = {}
+
+    def providers_for(self, source_currency: str, target_currency: str) -> Tuple[ProviderAdapter, ...]:
+        return self._providers_by_pair.get((source_currency, target_currency), self._open_providers)
+
+    def route_legs(self, source_currency: str, target_currency: str, max_legs: int) -> List[CurrencyPair]:
+        # Legs of every shortest multi-hop route between two currencies over the advertised pairs
+        key = (source_currency, target_currency, max_legs)
+        if key not in self._routes:
+            self._routes[key] = self._shortest_route_legs(source_currency, target_currency, max_legs)
+        return self._routes[key]
+
+    def _shortest_route_legs(self, source_currency: str, target_currency: str, max_legs: int) -> List[CurrencyPair]:
+        predecessors: Dict[str, Set[str]] = {source_currency: set()}
+        layer = {source_currency}
+
+        for _ in range(max_legs):
+            next_layer: Dict[str, Set[str]] = {}
+            for currency in layer:
+                for target in self._adjacency.get(currency, ()):
+                    if target not in predecessors:
+                        next_layer.setdefault(target, set()).add(currency)
+            if not next_layer:
+                return []
+            predecessors.update(next_layer)
+            if target_currency in next_layer:
+                break
+            layer = set(next_layer)
+
+        if target_currency not in predecessors or target_currency == source_currency:
+            return []
+
+        legs = []
+        stack = [target_currency]
+        seen = set()
+        while stack:
+            currency = stack.pop()
+            for previous in predecessors[currency]:
+                if (previous, currency) not in seen:
+                    seen.add((previous, currency))
+                    legs.append((previous, currency))
+                    stack.append(previous)
+        return legs
+
+    def __contains__(self, pair: CurrencyPair) -> bool:
+        return bool(self.providers_for(*pair))
+
+    def stats(self) -> dict:
+        return {
+            "indexedPairs": len(self._providers_by_pair),
+            "cachedRoutes": len(self._routes),
+            "openProviders": [adapter.name for adapter in self._open_providers]
+        }
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+RateKey = Tuple[str, str, str]
+
+
+class _InFlight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+def _retrieve_exception(task: asyncio.Future) -> None:
+    # Prefetched keys nobody ends up asking for must not log "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+class RateCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[RateKey, Tuple[float, Decimal]]" = OrderedDict()
+        self._in_flight: Dict[RateKey, _InFlight] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: RateKey) -> Optional[Decimal]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, rate = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return rate
+
+    def set(self, key: RateKey, rate: Decimal) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, rate)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch(self, key: RateKey, fetch: Callable[[], Awaitable[Decimal]]) -> Decimal:
+        rate = self.get(key)
+        if rate is not None:
+            self.hits += 1
+            return rate
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            self.misses += 1
+            flight = _InFlight(asyncio.ensure_future(self._fetch_and_store(key, fetch)))
+            self._in_flight[key] = flight
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # Shielded so that one cancelled caller does not cancel the fetch shared with the others
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+                await asyncio.wait({flight.task})
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def prefetch_many(self, keys: List[RateKey],
+                      fetch_many: Callable[[List[RateKey]], Awaitable[List[Union[Decimal, Exception]]]]
+                      ) -> Optional[asyncio.Task]:
+        # Starts one shared fetch for every key that is neither cached nor already in flight. Each key gets
+        # its own in-flight entry, so later get_or_fetch calls for those keys join the batch.
+        missing = [key for key in dict.fromkeys(keys) if self.get(key) is None and key not in self._in_flight]
+        if not missing:
+            return None
+
+        batch = asyncio.ensure_future(fetch_many(missing))
+        batch.add_done_callback(_retrieve_exception)
+        for index, key in enumerate(missing):
+            self.misses += 1
+            flight = _InFlight(asyncio.ensure_future(self._store_from_batch(key, batch, index)))
+            flight.task.add_done_callback(_retrieve_exception)
+            self._in_flight[key] = flight
+        return batch
+
+    async def _store_from_batch(self, key: RateKey, batch: asyncio.Future, index: int) -> Decimal:
+        try:
+            result = (await asyncio.shield(batch))[index]
+            if isinstance(result, Exception):
+                raise result
+            self.set(key, result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _fetch_and_store(self, key: RateKey, fetch: Callable[[], Awaitable[Decimal]]) -> Decimal:
+        try:
+            rate = await fetch()
+            self.set(key, rate)
+            return rate
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "inFlight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,511 @@
+import asyncio
+import fcntl
+import json
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from common.models.money import to_fixed_rate
+from common.utils.logger import setup_logger
+
+# One directory per currency pair holding one segment file per UTC day (DATE.bin, then DATE.1.bin, ... once a
+# segment is full). A segment is a 64 byte header followed by three fixed-capacity columns: int64 timestamps in
+# microseconds, int64 fixed-point rates and uint8 provider ids. The row count in the header is written after
+# the row itself, so readers only ever see complete rows.
+_MAGIC = b"RCHIST01"
+_HEADER = struct.Struct("<8sQQ")
+_HEADER_SIZE = 64
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = 16
+_INT64 = struct.Struct("<q")
+_UINT8 = struct.Struct("<B")
+
+Column = memoryview
+PointColumns = Tuple[Column, Column, Column]
+# (bucket_us, provider_id, open, high, low, close, count), sorted by bucket and then provider
+CandleRow = Tuple[int, int, int, int, int, int, int]
+# (pair, day, first part worth opening)
+SegmentKey = Tuple[Tuple[str, str], str, int]
+
+# Quotes waiting for their segment or provider id; past this, new quotes are dropped
+_MAX_PENDING_ROWS = 10000
+# The next day's segment is created once a quote lands this close to midnight UTC
+_PREPARE_AHEAD_US = 600 * 1_000_000
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    # Imported on the first OHLC query rather than at startup; without numpy candles are built in Python
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _day_of(timestamp_us: int) -> str:
+    return datetime.fromtimestamp(timestamp_us / 1_000_000, timezone.utc).strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=64)
+def _next_day(day: str) -> Tuple[str, int]:
+    # The day after day and its first microsecond
+    start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+    return start.strftime("%Y-%m-%d"), int(start.timestamp()) * 1_000_000
+
+
+def _candle_rows(timestamps: Column, providers: Column, rates: Column, interval_us: int,
+                 provider_id: Optional[int], limit: Optional[int]) -> List[CandleRow]:
+    # Candles of one segment's columns. Any candle past the first limit of a segment is also past the first
+    # limit overall, so the rest are never built.
+    np = _numpy()
+    if np is None:
+        return _candle_rows_python(timestamps, providers, rates, interval_us, provider_id, limit)
+
+    timestamps = np.frombuffer(timestamps, dtype=np.int64)
+    providers = np.frombuffer(providers, dtype=np.uint8)
+    rates = np.frombuffer(rates, dtype=np.int64)
+    if provider_id is not None:
+        mask = providers == provider_id
+        timestamps, providers, rates = timestamps[mask], providers[mask], rates[mask]
+    if not len(timestamps):
+        return []
+
+    buckets = timestamps - timestamps % interval_us
+    # Stable sort by bucket, then provider, keeping rows in time order within each candle
+    order = np.lexsort((providers, buckets))
+    buckets, providers, rates = buckets[order], providers[order], rates[order]
+
+    boundaries = np.flatnonzero((buckets[1:] != buckets[:-1]) | (providers[1:] != providers[:-1])) + 1
+    starts = np.concatenate(([0], boundaries))[:limit]
+    ends = np.append(boundaries, len(buckets))[:limit]
+    rates = rates[:ends[-1]]
+
+    return list(zip(
+        buckets[starts].tolist(), providers[starts].tolist(), rates[starts].tolist(),
+        np.maximum.reduceat(rates, starts).tolist(), np.minimum.reduceat(rates, starts).tolist(),
+        rates[ends - 1].tolist(), (ends - starts).tolist()))
+
+
+def _candle_rows_python(timestamps: Column, providers: Column, rates: Column, interval_us: int,
+                        provider_id: Optional[int], limit: Optional[int]) -> List[CandleRow]:
+    candles: Dict[Tuple[int, int], List[int]] = {}
+    last_bucket = None
+    for timestamp_us, row_provider, fixed_rate in zip(timestamps, providers, rates):
+        if provider_id is not None and row_provider != provider_id:
+            continue
+        bucket = timestamp_us - timestamp_us % interval_us
+        candle = candles.get((bucket, row_provider))
+        if candle is None:
+            # Rows are in time order, so every candle built so far sorts before a later bucket
+            if limit is not None and len(candles) >= limit and bucket != last_bucket:
+                break
+            last_bucket = bucket
+            candles[(bucket, row_provider)] = [fixed_rate, fixed_rate, fixed_rate, fixed_rate, 1]
+        else:
+            candle[1] = max(candle[1], fixed_rate)
+            candle[2] = min(candle[2], fixed_rate)
+            candle[3] = fixed_rate
+            candle[4] += 1
+    return [(bucket, row_provider, *candle) for (bucket, row_provider), candle in sorted(candles.items())[:limit]]
+
+
+class HistorySegment:
+    def __init__(self, path: str, capacity: int, writable: bool):
+        self.path = path
+        exists = os.path.exists(path)
+
+        if writable:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            if not exists:
+                os.ftruncate(self._fd, _HEADER_SIZE + capacity * 17)
+            self._mmap = mmap.mmap(self._fd, 0)
+            if not exists:
+                _HEADER.pack_into(self._mmap, 0, _MAGIC, capacity, 0)
+        else:
+            self._fd = os.open(path, os.O_RDONLY)
+            self._mmap = mmap.mmap(self._fd, 0, prot=mmap.PROT_READ)
+
+        magic, self.capacity, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a rate history segment")
+
+        buffer = memoryview(self._mmap)
+        self._timestamps_offset = _HEADER_SIZE
+        self._rates_offset = _HEADER_SIZE + self.capacity * 8
+        self._providers_offset = _HEADER_SIZE + self.capacity * 16
+        self.timestamps = buffer[self._timestamps_offset:self._rates_offset].cast("q")
+        self.rates = buffer[self._rates_offset:self._providers_offset].cast("q")
+        self.providers = buffer[self._providers_offset:self._providers_offset + self.capacity]
+
+    def __len__(self) -> int:
+        return _COUNT.unpack_from(self._mmap, _COUNT_OFFSET)[0]
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.capacity
+
+    def append(self, timestamp_us: int, provider_id: int, fixed_rate: int) -> None:
+        count = len(self)
+        _INT64.pack_into(self._mmap, self._timestamps_offset + count * 8, timestamp_us)
+        _INT64.pack_into(self._mmap, self._rates_offset + count * 8, fixed_rate)
+        _UINT8.pack_into(self._mmap, self._providers_offset + count, provider_id)
+        _COUNT.pack_into(self._mmap, _COUNT_OFFSET, count + 1)
+
+    def columns(self, start_us: int, end_us: int) -> PointColumns:
+        # Zero-copy slices of the rows with start_us <= timestamp < end_us; timestamps are non-decreasing
+        count = len(self)
+        timestamps = self.timestamps[:count]
+        low = bisect_left(timestamps, start_us)
+        high = bisect_left(timestamps, end_us, low)
+        return timestamps[low:high], self.providers[low:high], self.rates[low:high]
+
+    def last_timestamp(self) -> Optional[int]:
+        count = len(self)
+        return self.timestamps[count - 1] if count else None
+
+    def close(self) -> None:
+        for view in (self.timestamps, self.rates, self.providers):
+            view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a slice of this segment; the mapping goes away once that is released
+            pass
+        os.close(self._fd)
+
+
+class RateHistoryStore:
+    # Append-only history of every provider quote. Recording a quote on the event loop only writes to
+    # memory-mapped pages; creating segment files and registering new providers runs on a writer thread, and
+    # quotes that arrive before their segment or provider id is ready wait in a short queue. The next segment
+    # of a pair is created ahead of time, so the queue is normally only used for a pair's first quote.
+    # A single process can hold the directory lock and write, any number of processes can read.
+    def __init__(self, directory: str, segment_capacity: int = 262144, max_read_segments: int = 64):
+        self.directory = directory
+        self.segment_capacity = segment_capacity
+        self.max_read_segments = max_read_segments
+        self.logger = setup_logger(__name__)
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_fd = os.open(os.path.join(directory, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.writable = True
+        except BlockingIOError:
+            self.writable = False
+            self.logger.warning("Rate history in %s is written by another process; opened read-only", directory)
+
+        self._providers_path = os.path.join(directory, "providers.json")
+        self.provider_names: List[str] = self._load_provider_names()
+        self._provider_ids = {name: index for index, name in enumerate(self.provider_names)}
+
+        self._writing: Dict[Tuple[str, str], Tuple[str, int, HistorySegment]] = {}
+        # Segments mapped for range queries, least recently used first; evicted ones are closed
+        self._reading: "OrderedDict[str, HistorySegment]" = OrderedDict()
+        self._last_timestamps: Dict[Tuple[str, str], int] = {}
+
+        # Filled in by the writer thread; the event loop only takes finished work out of them
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="rate-history") if self.writable else None
+        self._prepared: Dict[SegmentKey, Union[Tuple[int, HistorySegment], Exception]] = {}
+        self._provider_errors: Dict[str, Exception] = {}
+        self._scheduled: Set[Union[SegmentKey, str]] = set()
+        # (provider, source_currency, target_currency, timestamp_us, fixed_rate), in arrival order
+        self._pending: Deque[Tuple[str, str, str, int, int]] = deque()
+
+        self.appended = 0
+        self.dropped = 0
+
+    def _load_provider_names(self) -> List[str]:
+        if not os.path.exists(self._providers_path):
+            return []
+        with open(self._providers_path) as file:
+            return json.load(file)
+
+    def _schedule(self, key: Union[SegmentKey, str], work, *args) -> None:
+        if key in self._scheduled:
+            return
+        self._scheduled.add(key)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        def wake(_):
+            # Writes whatever was waiting for this work without waiting for the next quote
+            try:
+                loop.call_soon_threadsafe(self._drain)
+            except RuntimeError:
+                pass
+
+        future = self._executor.submit(work, key, *args)
+        if loop is not None:
+            future.add_done_callback(wake)
+
+    def _register_provider(self, provider: str) -> None:
+        # Writer thread. Ids are never reassigned, so segments written before a provider was added stay readable
+        try:
+            names = self.provider_names + [provider]
+            if len(names) > 256:
+                raise ValueError("Rate history supports at most 256 providers")
+            with open(self._providers_path + ".tmp", "w") as file:
+                json.dump(names, file)
+            os.replace(self._providers_path + ".tmp", self._providers_path)
+        except (OSError, ValueError) as e:
+            self._provider_errors[provider] = e
+            return
+
+        self.provider_names = names
+        self._provider_ids[provider] = len(names) - 1
+
+    def _open_segment(self, key: SegmentKey) -> None:
+        # Writer thread: opens the first segment of the day from the given part on that still has room
+        (source_currency, target_currency), day, part = key
+        try:
+            directory = self._pair_directory(source_currency, target_currency)
+            os.makedirs(directory, exist_ok=True)
+            while True:
+                name = f"{day}.bin" if part == 0 else f"{day}.{part}.bin"
+                segment = HistorySegment(os.path.join(directory, name), self.segment_capacity, writable=True)
+                if not segment.full:
+                    break
+                segment.close()
+                part += 1
+        except (OSError, ValueError) as e:
+            self._prepared[key] = e
+            return
+        self._prepared[key] = (part, segment)
+
+    def _provider_name(self, provider_id: int) -> str:
+        if provider_id >= len(self.provider_names):
+            # Read-only stores pick up providers the writer registered after they were opened
+            self.provider_names = self._load_provider_names()
+            self._provider_ids = {name: index for index, name in enumerate(self.provider_names)}
+        return self.provider_names[provider_id]
+
+    def _pair_directory(self, source_currency: str, target_currency: str) -> str:
+        return os.path.join(self.directory, f"{source_currency}{target_currency}")
+
+    def _segment_for_append(self, pair: Tuple[str, str], day: str) -> Optional[HistorySegment]:
+        # The open segment for pair and day, or None while the writer thread is still creating it
+        current = self._writing.get(pair)
+        if current is not None and current[0] == day and not current[2].full:
+            return current[2]
+
+        key = (pair, day, current[1] + 1 if current is not None and current[0] == day else 0)
+        prepared = self._prepared.pop(key, None)
+        if prepared is None:
+            self._schedule(key, self._open_segment)
+            return None
+        self._scheduled.discard(key)
+        if isinstance(prepared, Exception):
+            raise prepared
+
+        if current is not None:
+            current[2].close()
+        part, segment = prepared
+        self._writing[pair] = (day, part, segment)
+        if pair not in self._last_timestamps:
+            self._last_timestamps[pair] = segment.last_timestamp() or 0
+        return segment
+
+    def _prepare_next(self, pair: Tuple[str, str], day: str, part: int, segment: HistorySegment,
+                      timestamp_us: int) -> None:
+        if len(segment) >= segment.capacity - segment.capacity // 8:
+            self._schedule((pair, day, part + 1), self._open_segment)
+        next_day, next_day_us = _next_day(day)
+        if next_day_us - timestamp_us <= _PREPARE_AHEAD_US:
+            self._schedule((pair, next_day, 0), self._open_segment)
+
+    def _drain(self) -> None:
+        while self._pending:
+            provider, source_currency, target_currency, timestamp_us, fixed_rate = self._pending[0]
+            pair = (source_currency, target_currency)
+            # Rows stay sorted by time within a pair even if the wall clock steps back
+            timestamp_us = max(timestamp_us, self._last_timestamps.get(pair, 0))
+            day = _day_of(timestamp_us)
+
+            try:
+                if provider in self._provider_errors:
+                    raise self._provider_errors[provider]
+                provider_id = self._provider_ids.get(provider)
+                if provider_id is None:
+                    self._schedule(provider, self._register_provider)
+                segment = self._segment_for_append(pair, day)
+                if provider_id is None or segment is None:
+                    # Picked up again once the writer thread is done
+                    return
+            except (OSError, ValueError) as e:
+                self._pending.popleft()
+                self.dropped += 1
+                self.logger.warning("Rate history append for %s/%s failed: %s", source_currency, target_currency, e)
+                continue
+
+            self._pending.popleft()
+            timestamp_us = max(timestamp_us, self._last_timestamps[pair])
+            segment.append(timestamp_us, provider_id, fixed_rate)
+            self._last_timestamps[pair] = timestamp_us
+            self.appended += 1
+            self._prepare_next(pair, day, self._writing[pair][1], segment, timestamp_us)
+
+    def append(self, provider: str, source_currency: str, target_currency: str, rate: Decimal,
+               timestamp: Optional[float] = None) -> None:
+        if not self.writable:
+            return
+
+        if len(self._pending) >= _MAX_PENDING_ROWS:
+            self.dropped += 1
+            self.logger.warning("Rate history queue is full; dropping %s/%s quote", source_currency, target_currency)
+            return
+
+        timestamp_us = int((timestamp if timestamp is not None else time.time()) * 1_000_000)
+        self._pending.append((provider, source_currency, target_currency, timestamp_us, to_fixed_rate(rate)))
+        self._drain()
+
+    def flush(self) -> None:
+        # Blocks until every queued quote is written; meant for shutdown and tests, not the event loop
+        while self._pending:
+            # The writer thread runs one task at a time, so this returns once the earlier ones are done
+            self._executor.submit(lambda: None).result()
+            self._drain()
+
+    def record(self, provider: str, source_currency: str, target_currency: str, rate: Decimal,
+               updated_at: float) -> None:
+        # RateTable listener: updated_at is monotonic, so the quote is stamped with the wall clock instead
+        self.append(provider, source_currency, target_currency, rate)
+
+    def _segment_paths(self, source_currency: str, target_currency: str, start_us: int, end_us: int) -> List[str]:
+        directory = self._pair_directory(source_currency, target_currency)
+        if not os.path.isdir(directory):
+            return []
+
+        # ISO day strings sort like the days themselves, so one listing covers any range
+        first_day = _day_of(start_us)
+        last_day = _day_of(max(start_us, end_us - 1))
+
+        def order(name: str) -> Tuple[str, int]:
+            parts = name.split(".")
+            return parts[0], int(parts[1]) if len(parts) == 3 else 0
+
+        names = [name for name in os.listdir(directory)
+                 if name.endswith(".bin") and first_day <= name.split(".")[0] <= last_day]
+        return [os.path.join(directory, name) for name in sorted(names, key=order)]
+
+    def _segment_for_read(self, path: str) -> Optional[HistorySegment]:
+        for _, _, segment in self._writing.values():
+            if segment.path == path:
+                return segment
+
+        segment = self._reading.get(path)
+        if segment is not None:
+            self._reading.move_to_end(path)
+            return segment
+
+        try:
+            segment = self._reading[path] = HistorySegment(path, self.segment_capacity, writable=False)
+        except ValueError:
+            # The writer has created the file but not its header yet
+            return None
+
+        while len(self._reading) > self.max_read_segments:
+            # Slices a caller still holds keep the mapping alive until they are released
+            self._reading.popitem(last=False)[1].close()
+        return segment
+
+    def read(self, source_currency: str, target_currency: str, start: float, end: float) -> Iterator[PointColumns]:
+        # Yields zero-copy (timestamps_us, provider_ids, fixed_rates) column slices, oldest segment first
+        start_us, end_us = int(start * 1_000_000), int(end * 1_000_000)
+        for path in self._segment_paths(source_currency, target_currency, start_us, end_us):
+            segment = self._segment_for_read(path)
+            if segment is None:
+                continue
+            columns = segment.columns(start_us, end_us)
+            if len(columns[0]):
+                yield columns
+
+    def points(self, source_currency: str, target_currency: str, start: float, end: float,
+               provider: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple[int, str, int]]:
+        provider_id = self._provider_ids.get(provider) if provider else None
+        if provider and provider_id is None:
+            return []
+
+        points = []
+        for timestamps, providers, rates in self.read(source_currency, target_currency, start, end):
+            for timestamp_us, row_provider, fixed_rate in zip(timestamps, providers, rates):
+                if provider_id is None or row_provider == provider_id:
+                    points.append((timestamp_us, self._provider_name(row_provider), fixed_rate))
+                    if limit is not None and len(points) >= limit:
+                        return points
+        return points
+
+    def ohlc(self, source_currency: str, target_currency: str, start: float, end: float, interval_seconds: float,
+             provider: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        # The first limit candles of interval_seconds aligned to the epoch, one series per provider; within a
+        # bucket, providers come in the order they were first recorded
+        provider_id = self._provider_ids.get(provider) if provider else None
+        if provider and provider_id is None:
+            return []
+
+        interval_us = max(1, int(interval_seconds * 1_000_000))
+        candles: Dict[Tuple[int, int], List[int]] = {}
+        last_bucket = None
+
+        for columns in self.read(source_currency, target_currency, start, end):
+            rows = _candle_rows(*columns, interval_us, provider_id, limit)
+            if not rows:
+                continue
+            # Segments are read in time order: once limit candles end before this segment, later rows cannot
+            # change them
+            if limit is not None and len(candles) >= limit and rows[0][0] > last_bucket:
+                break
+
+            for bucket, row_provider, open_, high, low, close, count in rows:
+                candle = candles.get((bucket, row_provider))
+                if candle is None:
+                    candles[(bucket, row_provider)] = [open_, high, low, close, count]
+                else:
+                    candle[1] = max(candle[1], high)
+                    candle[2] = min(candle[2], low)
+                    candle[3] = close
+                    candle[4] += count
+            last_bucket = rows[-1][0]
+
+        return [
+            {"start_us": bucket, "provider": self._provider_name(row_provider), "open": candle[0],
+             "high": candle[1], "low": candle[2], "close": candle[3], "count": candle[4]}
+            for (bucket, row_provider), candle in sorted(candles.items())[:limit]
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "writable": self.writable,
+            "openSegments": len(self._writing) + len(self._reading),
+            "appended": self.appended,
+            "pending": len(self._pending),
+            "dropped": self.dropped
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self.flush()
+            self._executor.shutdown()
+        for prepared in self._prepared.values():
+            if not isinstance(prepared, Exception):
+                prepared[1].close()
+        for _, _, segment in self._writing.values():
+            segment.close()
+        for segment in self._reading.values():
+            segment.close()
+        self._writing.clear()
+        self._reading.clear()
+        os.close(self._lock_fd)
@@ -0,0 +1,131 @@
+import asyncio
+import random
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from common.config.settings import settings
+from common.providers.adapters import ProviderAdapter
+from common.utils.logger import setup_logger
+
+
+def parse_refresh_intervals(value: str) -> Dict[str, float]:
+    intervals = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, seconds = item.partition("=")
+        intervals[name.strip().upper()] = float(seconds)
+    return intervals
+
+
+class RateRefresher:
+    def __init__(self, exchange_service, default_interval_seconds: float = settings.REFRESH_INTERVAL_SECONDS,
+                 intervals: Optional[Dict[str, float]] = None, jitter_ratio: float = settings.REFRESH_JITTER_RATIO,
+                 max_backoff_seconds: float = settings.REFRESH_MAX_BACKOFF_SECONDS,
+                 max_concurrency: int = settings.REFRESH_MAX_CONCURRENCY,
+                 reference_amount: Decimal = Decimal("100")):
+        self.exchange_service = exchange_service
+        self.default_interval_seconds = default_interval_seconds
+        self.intervals = intervals if intervals is not None else parse_refresh_intervals(settings.REFRESH_INTERVALS)
+        self.jitter_ratio = jitter_ratio
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_concurrency = max_concurrency
+        self.reference_amount = reference_amount
+
+        self.rounds: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.logger = setup_logger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        adapters = []
+        for adapter in self.exchange_service.registry:
+            if adapter.supported_pairs():
+                adapters.append(adapter)
+            else:
+                self.logger.warning("%s does not advertise its currency pairs and will not be refreshed", adapter.name)
+        if not adapters:
+            self.logger.error("Rate refresher enabled but no provider advertises currency pairs; nothing to poll")
+
+        self._tasks = [asyncio.ensure_future(self._run(adapter)) for adapter in adapters]
+        self.logger.info("Rate refresher started for %d providers", len(self._tasks))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+        self._tasks = []
+
+    def interval_for(self, provider: str) -> float:
+        return self.intervals.get(provider, self.default_interval_seconds)
+
+    def next_delay(self, provider: str) -> float:
+        failures = self.failures.get(provider, 0)
+        interval = self.interval_for(provider)
+        if failures:
+            interval = min(self.max_backoff_seconds, interval * 2 ** failures)
+
+        # Jitter spreads the polls of many instances so they do not hit a provider in lockstep
+        return interval * random.uniform(1 - self.jitter_ratio, 1 + self.jitter_ratio)
+
+    async def refresh_provider(self, adapter: ProviderAdapter) -> int:
+        if adapter.supports_batch():
+            return await self._refresh_provider_batch(adapter)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def refresh_pair(source_currency: str, target_currency: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.exchange_service.fetch_provider_rate(
+                        adapter, source_currency, target_currency, self.reference_amount)
+                    return True
+                except Exception as e:
+                    self.logger.debug("%s refresh of %s/%s failed: %s", adapter.name, source_currency, target_currency, e)
+                    return False
+
+        results = await asyncio.gather(*[refresh_pair(source, target) for source, target in adapter.supported_pairs()])
+        return sum(results)
+
+    async def _refresh_provider_batch(self, adapter: ProviderAdapter) -> int:
+        try:
+            results = await self.exchange_service.fetch_provider_rates(
+                adapter, [(source, target, self.reference_amount) for source, target in adapter.supported_pairs()])
+        except Exception as e:
+            self.logger.debug("%s batch refresh failed: %s", adapter.name, e)
+            return 0
+
+        return sum(not isinstance(result, Exception) for result in results)
+
+    async def _run(self, adapter: ProviderAdapter) -> None:
+        while True:
+            refreshed = await self.refresh_provider(adapter)
+            self.rounds[adapter.name] = self.rounds.get(adapter.name, 0) + 1
+
+            if refreshed:
+                self.failures[adapter.name] = 0
+            else:
+                self.failures[adapter.name] = self.failures.get(adapter.name, 0) + 1
+                self.logger.warning(
+                    "%s refresh round failed, backing off (%s in a row)", adapter.name, self.failures[adapter.name])
+
+            await asyncio.sleep(self.next_delay(adapter.name))
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "providers": {
+                adapter.name: {
+                    "intervalSeconds": self.interval_for(adapter.name),
+                    "rounds": self.rounds.get(adapter.name, 0),
+                    "consecutiveFailures": self.failures.get(adapter.name, 0)
+                }
+                for adapter in self.exchange_service.registry
+            }
+        }
@@ -0,0 +1,79 @@
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+RateKey = Tuple[str, str, str]
+RateListener = Callable[[str, str, str, Decimal, float], None]
+
+
+class RateEntry:
+    __slots__ = ("rate", "updated_at", "timestamp", "stale")
+
+    def __init__(self, rate: Decimal, updated_at: float, timestamp: float, stale: bool = False):
+        self.rate = rate
+        self.updated_at = updated_at
+        self.timestamp = timestamp
+        self.stale = stale
+
+
+class RateTable:
+    def __init__(self):
+        self._entries: Dict[RateKey, RateEntry] = {}
+        self._listeners: List[RateListener] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def subscribe(self, listener: RateListener) -> None:
+        self._listeners.append(listener)
+
+    def update(self, provider: str, source_currency: str, target_currency: str, rate: Decimal,
+               updated_at: Optional[float] = None) -> None:
+        updated_at = updated_at if updated_at is not None else time.monotonic()
+        self._entries[(provider, source_currency, target_currency)] = RateEntry(
+            rate, updated_at, time.time() - (time.monotonic() - updated_at)
+        )
+
+        for listener in self._listeners:
+            listener(provider, source_currency, target_currency, rate, updated_at)
+
+    def restore(self, provider: str, source_currency: str, target_currency: str, rate: Decimal,
+                timestamp: float) -> Optional[float]:
+        # Rates from a warm-start snapshot keep their real age and are only served through get_stale;
+        # anything fetched since startup wins
+        key = (provider, source_currency, target_currency)
+        if key in self._entries:
+            return None
+        updated_at = time.monotonic() - max(0.0, time.time() - timestamp)
+        self._entries[key] = RateEntry(rate, updated_at, timestamp, stale=True)
+        return updated_at
+
+    def get(self, provider: str, source_currency: str, target_currency: str) -> Optional[RateEntry]:
+        return self._entries.get((provider, source_currency, target_currency))
+
+    def get_fresh(self, provider: str, source_currency: str, target_currency: str,
+                  max_age_seconds: float) -> Optional[Decimal]:
+        entry = self._entries.get((provider, source_currency, target_currency))
+        if entry is None or time.monotonic() - entry.updated_at > max_age_seconds:
+            return None
+        return entry.rate
+
+    def get_stale(self, provider: str, source_currency: str, target_currency: str,
+                  max_age_seconds: float) -> Optional[Decimal]:
+        entry = self.get(provider, source_currency, target_currency)
+        if entry is None or not entry.stale or time.monotonic() - entry.updated_at > max_age_seconds:
+            return None
+        return entry.rate
+
+    def items(self):
+        return self._entries.items()
+
+    def stats(self, max_age_seconds: float) -> dict:
+        now = time.monotonic()
+        fresh = sum(1 for entry in self._entries.values() if now - entry.updated_at <= max_age_seconds)
+        return {
+            "entries": len(self._entries),
+            "freshEntries": fresh,
+            "staleEntries": sum(1 for entry in self._entries.values() if entry.stale),
+            "maxStalenessSeconds": max_age_seconds
+        }
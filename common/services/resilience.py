@@ -0,0 +1,168 @@
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+
+class ProviderUnavailableError(Exception):
+    pass
+
+
+class CircuitOpenError(ProviderUnavailableError):
+    def __init__(self, provider: str):
+        super().__init__(f"Circuit for {provider} is open")
+
+
+class ConcurrencyLimitError(ProviderUnavailableError):
+    def __init__(self, provider: str, limit: int):
+        super().__init__(f"{provider} concurrency limit of {limit} reached")
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate_threshold: float = 0.5, slow_call_seconds: float = 1.0,
+                 window_size: int = 20, min_calls: int = 10, open_seconds: float = 10.0,
+                 half_open_max_calls: int = 1):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected_calls = 0
+
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._half_open_calls = 0
+
+    def allow_request(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected_calls += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._half_open_calls = 0
+
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.rejected_calls += 1
+                return False
+            self._half_open_calls += 1
+
+        return True
+
+    def record_success(self, latency_seconds: float) -> None:
+        if latency_seconds > self.slow_call_seconds:
+            self.record_failure()
+            return
+
+        if self.state == self.HALF_OPEN:
+            self._close()
+            return
+
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+
+        self._outcomes.append(False)
+
+        if len(self._outcomes) >= self.min_calls and self.failure_rate() >= self.failure_rate_threshold:
+            self._open()
+
+    def record_ignored(self) -> None:
+        # Calls that say nothing about provider health (cancellations, unsupported pairs) free a probe slot
+        if self.state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def snapshot(self) -> Tuple[str, Optional[float], int, List[bool]]:
+        open_for = time.monotonic() - self.opened_at if self.opened_at is not None else None
+        return self.state, open_for, self.times_opened, list(self._outcomes)
+
+    def restore(self, state: str, open_for: Optional[float], times_opened: int, outcomes: List[bool]) -> None:
+        # An open breaker keeps its remaining open time, so a provider that was failing before a restart
+        # is not hit by every request again right after it
+        self.state = state
+        self.opened_at = time.monotonic() - open_for if open_for is not None else None
+        if self.state == self.OPEN and self.opened_at is None:
+            self.state = self.CLOSED
+        self.times_opened = times_opened
+        self._half_open_calls = 0
+        self._outcomes.clear()
+        self._outcomes.extend(outcomes)
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._outcomes.clear()
+
+    def _close(self) -> None:
+        self.state = self.CLOSED
+        self.opened_at = None
+        self._outcomes.clear()
+
+    def stats(self) -> dict:
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 3)
+
+        return {
+            "state": self.state,
+            "failureRate": round(self.failure_rate(), 4),
+            "windowCalls": len(self._outcomes),
+            "timesOpened": self.times_opened,
+            "rejectedCalls": self.rejected_calls,
+            "retryInSeconds": retry_in
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, initial_limit: float = 20, min_limit: float = 1, max_limit: float = 200,
+                 latency_target_seconds: float = 1.0, backoff_ratio: float = 0.5):
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.latency_target_seconds = latency_target_seconds
+        self.backoff_ratio = backoff_ratio
+
+        self.in_flight = 0
+        self.rejected_calls = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            self.rejected_calls += 1
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self, latency_seconds: Optional[float] = None, success: Optional[bool] = None) -> None:
+        self.in_flight -= 1
+
+        if success is None:
+            return
+
+        if success and latency_seconds <= self.latency_target_seconds:
+            # Additive increase: roughly +1 per limit's worth of successful calls
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "inFlight": self.in_flight,
+            "rejectedCalls": self.rejected_calls
+        }
@@ -0,0 +1,210 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from decimal import Context, Decimal
+from typing import Dict, List, Optional, Sequence
+
+from common.services.rate_table import RateEntry, RateKey, RateListener, RateTable
+
+# Layout: a 64 byte header followed by one 64 byte slot per (provider, source, target) combination.
+# Each slot starts with a sequence number: odd while the writer is inside the slot, bumped to the next
+# even value once it is done. Readers copy the slot and retry when the sequence was odd or moved.
+_MAGIC = b"RCRATES1"
+_HEADER = struct.Struct("<8s32sII")
+_HEADER_SIZE = 64
+_SEQUENCE = struct.Struct("<Q")
+_PAYLOAD = struct.Struct("<ddB39s")
+_SLOT = struct.Struct("<QddB39s")
+_SLOT_SIZE = 64
+_MAX_RATE_TEXT = 39
+_MAX_READ_ATTEMPTS = 16
+
+# Rates are stored as decimal text so readers see exactly the Decimal the writer had
+_RATE_CONTEXT = Context(prec=30)
+
+
+class SharedRateTable(RateTable):
+    # A RateTable whose entries are also published to a memory-mapped file shared by several worker
+    # processes. The process holding the file lock is the only writer; every other process reads the
+    # published slots without locking, keeps its own fetches in its local table and retries the lock
+    # through try_become_writer so a new writer takes over when the old one exits.
+    def __init__(self, path: str, providers: Sequence[str], currencies: Sequence[str]):
+        super().__init__()
+        self.path = path
+        self.providers = sorted(providers)
+        self.currencies = sorted(currencies)
+
+        self._provider_ids = {name: index for index, name in enumerate(self.providers)}
+        self._currency_ids = {code: index for index, code in enumerate(self.currencies)}
+        self._slot_count = len(self.providers) * len(self.currencies) ** 2
+        self._layout = hashlib.sha256(
+            ("|".join(self.providers) + "/" + "|".join(self.currencies)).encode()).digest()
+
+        self.torn_reads = 0
+        self.retried_reads = 0
+        self._layout_checked = False
+        self._shared_listeners: List[RateListener] = []
+        self._delivered: Dict[RateKey, float] = {}
+
+        self._size = _HEADER_SIZE + self._slot_count * _SLOT_SIZE
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < self._size:
+            os.ftruncate(self._fd, self._size)
+        self._mmap = mmap.mmap(self._fd, self._size)
+
+        self.is_writer = False
+        self.try_become_writer()
+
+    def _lock(self) -> bool:
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def try_become_writer(self) -> bool:
+        if self.is_writer:
+            return True
+        if not self._lock():
+            return False
+
+        # Hand what the previous writer published to the shared listeners and the local table, since a
+        # writer only serves its local entries from now on
+        self.poll_shared()
+        for key, entry in self.shared_entries().items():
+            local = self._entries.get(key)
+            if local is None or entry.updated_at > local.updated_at:
+                self._entries[key] = entry
+
+        magic, layout, _, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or layout != self._layout:
+            # Left over from a deployment with other providers or currencies; start from empty slots
+            self._mmap[:self._size] = bytes(self._size)
+            _HEADER.pack_into(self._mmap, 0, _MAGIC, self._layout, len(self.providers), len(self.currencies))
+        self._layout_checked = True
+        self.is_writer = True
+        return True
+
+    def subscribe_shared(self, listener: RateListener) -> None:
+        # Called from poll_shared with rates other processes published, unlike subscribe which only sees
+        # this process's own updates
+        self._shared_listeners.append(listener)
+
+    def poll_shared(self) -> int:
+        delivered = 0
+        for key, entry in self.shared_entries().items():
+            if self._delivered.get(key, float("-inf")) >= entry.updated_at:
+                continue
+            local = self._entries.get(key)
+            if local is not None and local.updated_at >= entry.updated_at:
+                continue
+
+            self._delivered[key] = entry.updated_at
+            for listener in self._shared_listeners:
+                listener(*key, entry.rate, entry.updated_at)
+            delivered += 1
+        return delivered
+
+    def close(self) -> None:
+        if self._mmap.closed:
+            return
+        self._mmap.close()
+        os.close(self._fd)
+
+    def _slot_offset(self, provider: str, source_currency: str, target_currency: str) -> Optional[int]:
+        provider_id = self._provider_ids.get(provider)
+        source_id = self._currency_ids.get(source_currency)
+        target_id = self._currency_ids.get(target_currency)
+        if provider_id is None or source_id is None or target_id is None:
+            return None
+
+        currencies = len(self.currencies)
+        slot = (provider_id * currencies + source_id) * currencies + target_id
+        return _HEADER_SIZE + slot * _SLOT_SIZE
+
+    def update(self, provider: str, source_currency: str, target_currency: str, rate: Decimal,
+               updated_at: Optional[float] = None) -> None:
+        updated_at = updated_at if updated_at is not None else time.monotonic()
+        super().update(provider, source_currency, target_currency, rate, updated_at)
+
+        offset = self._slot_offset(provider, source_currency, target_currency)
+        if not self.is_writer or offset is None:
+            return
+
+        entry = self._entries[(provider, source_currency, target_currency)]
+        text = str(rate)
+        if len(text) > _MAX_RATE_TEXT:
+            text = str(_RATE_CONTEXT.plus(rate))
+        encoded = text.encode()
+
+        sequence = _SEQUENCE.unpack_from(self._mmap, offset)[0] | 1
+        _SEQUENCE.pack_into(self._mmap, offset, sequence)
+        _PAYLOAD.pack_into(self._mmap, offset + _SEQUENCE.size, updated_at, entry.timestamp, len(encoded), encoded)
+        _SEQUENCE.pack_into(self._mmap, offset, sequence + 1)
+
+    def _layout_matches(self) -> bool:
+        # Until the writer has claimed the file its slots may belong to an older layout
+        if not self._layout_checked:
+            magic, layout, _, _ = _HEADER.unpack_from(self._mmap, 0)
+            self._layout_checked = magic == _MAGIC and layout == self._layout
+        return self._layout_checked
+
+    def _read_shared(self, key: RateKey) -> Optional[RateEntry]:
+        offset = self._slot_offset(*key)
+        if offset is None or not self._layout_matches():
+            return None
+
+        for _ in range(_MAX_READ_ATTEMPTS):
+            sequence, updated_at, timestamp, length, encoded = _SLOT.unpack_from(self._mmap, offset)
+            if sequence == 0:
+                return None
+            if not sequence & 1 and _SEQUENCE.unpack_from(self._mmap, offset)[0] == sequence:
+                return RateEntry(Decimal(encoded[:length].decode()), updated_at, timestamp)
+            self.retried_reads += 1
+
+        # The writer kept the slot busy; the caller falls back to a fetch as if the rate were missing
+        self.torn_reads += 1
+        return None
+
+    def get(self, provider: str, source_currency: str, target_currency: str) -> Optional[RateEntry]:
+        local = self._entries.get((provider, source_currency, target_currency))
+        if self.is_writer:
+            return local
+
+        shared = self._read_shared((provider, source_currency, target_currency))
+        if local is None or (shared is not None and shared.updated_at > local.updated_at):
+            return shared
+        return local
+
+    def get_fresh(self, provider: str, source_currency: str, target_currency: str,
+                  max_age_seconds: float) -> Optional[Decimal]:
+        entry = self.get(provider, source_currency, target_currency)
+        if entry is None or time.monotonic() - entry.updated_at > max_age_seconds:
+            return None
+        return entry.rate
+
+    def shared_entries(self) -> Dict[RateKey, RateEntry]:
+        entries = {}
+        for provider in self.providers:
+            for source_currency in self.currencies:
+                for target_currency in self.currencies:
+                    key = (provider, source_currency, target_currency)
+                    entry = self._read_shared(key)
+                    if entry is not None:
+                        entries[key] = entry
+        return entries
+
+    def stats(self, max_age_seconds: float) -> dict:
+        stats = super().stats(max_age_seconds)
+        stats["shared"] = {
+            "path": self.path,
+            "role": "writer" if self.is_writer else "reader",
+            "pid": os.getpid(),
+            "slots": self._slot_count,
+            "retriedReads": self.retried_reads,
+            "tornReads": self.torn_reads
+        }
+        return stats
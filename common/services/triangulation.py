@@ -0,0 +1,121 @@
+import math
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+# (source, target, provider, rate)
+RateLeg = Tuple[str, str, str, Decimal]
+PathKey = Tuple[str, str, int]
+
+
+class RateGraph:
+    def __init__(self, max_rate_age_seconds: float = 60.0):
+        self.max_rate_age_seconds = max_rate_age_seconds
+        self.version = 0
+
+        # source -> target -> provider -> (rate, -log(rate), updated_at)
+        self._edges: Dict[str, Dict[str, Dict[str, Tuple[Decimal, float, float]]]] = {}
+        self._paths: Dict[PathKey, Optional[List[RateLeg]]] = {}
+        # currency -> cached paths that start, end or pass through it
+        self._paths_by_currency: Dict[str, Set[PathKey]] = {}
+
+    def update(self, provider: str, source_currency: str, target_currency: str, rate: Decimal,
+               updated_at: Optional[float] = None) -> None:
+        if rate <= 0:
+            return
+
+        updated_at = updated_at if updated_at is not None else time.monotonic()
+        providers = self._edges.setdefault(source_currency, {}).setdefault(target_currency, {})
+        previous = providers.get(provider)
+        providers[provider] = (rate, -math.log(rate), updated_at)
+        self.version += 1
+
+        if previous is None or updated_at - previous[2] > self.max_rate_age_seconds:
+            # A new or revived edge can open routes between any two currencies
+            self._paths.clear()
+            self._paths_by_currency.clear()
+        else:
+            # A re-priced edge only changes the paths around its two currencies; the rest stay cached
+            affected = self._paths_by_currency.get(source_currency, set()) | \
+                self._paths_by_currency.get(target_currency, set())
+            for key in affected:
+                self._forget(key)
+
+    def _remember(self, key: PathKey, path: Optional[List[RateLeg]]) -> Optional[List[RateLeg]]:
+        self._paths[key] = path
+        for currency in {key[0], key[1], *(leg[1] for leg in path or ())}:
+            self._paths_by_currency.setdefault(currency, set()).add(key)
+        return path
+
+    def _forget(self, key: PathKey) -> None:
+        path = self._paths.pop(key, None)
+        for currency in {key[0], key[1], *(leg[1] for leg in path or ())}:
+            self._paths_by_currency.get(currency, set()).discard(key)
+
+    def edge_count(self) -> int:
+        return sum(len(providers) for targets in self._edges.values() for providers in targets.values())
+
+    def _best_edges(self, source_currency: str, now: float) -> List[Tuple[str, str, Decimal, float]]:
+        edges = []
+        for target, providers in self._edges.get(source_currency, {}).items():
+            best = None
+            for provider, (rate, weight, updated_at) in providers.items():
+                if now - updated_at > self.max_rate_age_seconds:
+                    continue
+                if best is None or weight < best[3]:
+                    best = (target, provider, rate, weight)
+            if best is not None:
+                edges.append(best)
+        return edges
+
+    def best_path(self, source_currency: str, target_currency: str, max_legs: int) -> Optional[List[RateLeg]]:
+        key = (source_currency, target_currency, max_legs)
+        if key not in self._paths:
+            return self._remember(key, self._search(source_currency, target_currency, max_legs))
+
+        path = self._paths[key]
+        if path is not None and not self._is_fresh(path):
+            self._forget(key)
+            path = self._remember(key, self._search(source_currency, target_currency, max_legs))
+        return path
+
+    def _is_fresh(self, path: List[RateLeg]) -> bool:
+        now = time.monotonic()
+        for source, target, provider, _ in path:
+            edge = self._edges[source][target][provider]
+            if now - edge[2] > self.max_rate_age_seconds:
+                return False
+        return True
+
+    def _search(self, source_currency: str, target_currency: str, max_legs: int) -> Optional[List[RateLeg]]:
+        # Hop-bounded Bellman-Ford over -log(rate): the cheapest path maximises the product of the rates.
+        # Paths are kept simple (no currency visited twice) so arbitrage cycles cannot be exploited.
+        now = time.monotonic()
+        best: Dict[str, Tuple[float, List[RateLeg]]] = {source_currency: (0.0, [])}
+        frontier = dict(best)
+
+        for _ in range(max_legs):
+            next_frontier: Dict[str, Tuple[float, List[RateLeg]]] = {}
+            for currency, (cost, path) in frontier.items():
+                visited = {source_currency, *(leg[1] for leg in path)}
+                for target, provider, rate, weight in self._best_edges(currency, now):
+                    if target in visited:
+                        continue
+                    candidate = cost + weight
+                    if target not in best or candidate < best[target][0]:
+                        best[target] = next_frontier[target] = (candidate, path + [(currency, target, provider, rate)])
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        if target_currency not in best or target_currency == source_currency:
+            return None
+        return best[target_currency][1]
+
+    def stats(self) -> dict:
+        return {
+            "currencies": len(self._edges),
+            "edges": self.edge_count(),
+            "version": self.version,
+            "cachedPaths": len(self._paths)
+        }
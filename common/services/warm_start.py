@@ -0,0 +1,237 @@
+import asyncio
+import os
+import struct
+import time
+import zlib
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from common.utils.logger import setup_logger
+
+# File layout: header (magic, version, wall-clock write time, crc32 of the body) followed by a zlib body of
+# three sections: rates, latency samples and circuit breaker states. Strings are length-prefixed UTF-8.
+_MAGIC = b"RCSNAP01"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHdI")
+_COUNT = struct.Struct("<I")
+_RATE = struct.Struct("<d")
+_BREAKER = struct.Struct("<BdIH")
+_NOT_OPEN = -1.0
+
+_BREAKER_STATES = ("closed", "open", "half_open")
+
+RateRecord = Tuple[str, str, str, Decimal, float]
+BreakerRecord = Tuple[str, Optional[float], int, List[bool]]
+
+
+class _Writer:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, layout: struct.Struct, *values) -> None:
+        self.buffer += layout.pack(*values)
+
+    def string(self, value: str) -> None:
+        encoded = value.encode()
+        self.buffer.append(len(encoded))
+        self.buffer += encoded
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def string(self) -> str:
+        length = self.data[self.offset]
+        self.offset += 1 + length
+        return self.data[self.offset - length:self.offset].decode()
+
+    def floats(self, count: int) -> List[float]:
+        values = struct.unpack_from(f"<{count}f", self.data, self.offset)
+        self.offset += 4 * count
+        return list(values)
+
+
+class WarmStartSnapshot:
+    def __init__(self, written_at: float, rates: List[RateRecord], latency: Dict[str, List[float]],
+                 breakers: Dict[str, BreakerRecord]):
+        self.written_at = written_at
+        self.rates = rates
+        self.latency = latency
+        self.breakers = breakers
+
+    @classmethod
+    def capture(cls, exchange_service, max_age_seconds: float) -> "WarmStartSnapshot":
+        now = time.time()
+        rates = [
+            (provider, source_currency, target_currency, entry.rate, entry.timestamp)
+            for (provider, source_currency, target_currency), entry in exchange_service.rate_table.items()
+            if now - entry.timestamp <= max_age_seconds
+        ]
+        breakers = {name: breaker.snapshot() for name, breaker in exchange_service.circuit_breakers.items()}
+        return cls(now, rates, exchange_service.latency_tracker.samples(), breakers)
+
+    def apply(self, exchange_service, max_age_seconds: float) -> int:
+        # Rates come back marked stale; breakers and latency windows pick up where the last process left off
+        restored = 0
+        for provider, source_currency, target_currency, rate, timestamp in self.rates:
+            if time.time() - timestamp > max_age_seconds:
+                continue
+            updated_at = exchange_service.rate_table.restore(provider, source_currency, target_currency, rate, timestamp)
+            if updated_at is not None:
+                exchange_service.rate_graph.update(provider, source_currency, target_currency, rate, updated_at)
+                restored += 1
+
+        for provider, samples in self.latency.items():
+            exchange_service.latency_tracker.restore(provider, samples)
+
+        elapsed = max(0.0, time.time() - self.written_at)
+        for name, (state, open_for, times_opened, outcomes) in self.breakers.items():
+            breaker = exchange_service.circuit_breakers.get(name)
+            if breaker is not None:
+                breaker.restore(state, open_for + elapsed if open_for is not None else None, times_opened, outcomes)
+        return restored
+
+    def to_bytes(self) -> bytes:
+        writer = _Writer()
+
+        writer.pack(_COUNT, len(self.rates))
+        for provider, source_currency, target_currency, rate, timestamp in self.rates:
+            writer.string(provider)
+            writer.string(source_currency)
+            writer.string(target_currency)
+            writer.string(str(rate))
+            writer.pack(_RATE, timestamp)
+
+        writer.pack(_COUNT, len(self.latency))
+        for provider, samples in self.latency.items():
+            writer.string(provider)
+            writer.pack(_COUNT, len(samples))
+            writer.buffer += struct.pack(f"<{len(samples)}f", *samples)
+
+        writer.pack(_COUNT, len(self.breakers))
+        for name, (state, open_for, times_opened, outcomes) in self.breakers.items():
+            writer.string(name)
+            writer.pack(_BREAKER, _BREAKER_STATES.index(state), open_for if open_for is not None else _NOT_OPEN,
+                        times_opened, len(outcomes))
+            writer.buffer += bytes(outcomes)
+
+        body = zlib.compress(bytes(writer.buffer))
+        return _HEADER.pack(_MAGIC, _VERSION, self.written_at, zlib.crc32(body)) + body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WarmStartSnapshot":
+        if len(data) < _HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, written_at, checksum = _HEADER.unpack_from(data)
+        body = data[_HEADER.size:]
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a warm-start snapshot of this version")
+        if zlib.crc32(body) != checksum:
+            raise ValueError("Snapshot checksum mismatch")
+
+        reader = _Reader(zlib.decompress(body))
+        try:
+            rates = []
+            for _ in range(reader.unpack(_COUNT)[0]):
+                provider, source_currency, target_currency = reader.string(), reader.string(), reader.string()
+                rate = Decimal(reader.string())
+                rates.append((provider, source_currency, target_currency, rate, reader.unpack(_RATE)[0]))
+
+            latency = {}
+            for _ in range(reader.unpack(_COUNT)[0]):
+                provider = reader.string()
+                latency[provider] = reader.floats(reader.unpack(_COUNT)[0])
+
+            breakers = {}
+            for _ in range(reader.unpack(_COUNT)[0]):
+                name = reader.string()
+                state, open_for, times_opened, outcome_count = reader.unpack(_BREAKER)
+                outcomes = [bool(outcome) for outcome in reader.data[reader.offset:reader.offset + outcome_count]]
+                reader.offset += outcome_count
+                breakers[name] = (_BREAKER_STATES[state], open_for if open_for != _NOT_OPEN else None,
+                                  times_opened, outcomes)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"Snapshot is corrupt: {e}")
+
+        return cls(written_at, rates, latency, breakers)
+
+
+def write_snapshot(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+class WarmStarter:
+    def __init__(self, exchange_service, path: str, interval_seconds: float, max_age_seconds: float):
+        self.exchange_service = exchange_service
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+
+        self.snapshots_written = 0
+        self.rates_restored = 0
+        self._task: Optional[asyncio.Task] = None
+        self.logger = setup_logger(__name__)
+
+    def restore(self) -> int:
+        try:
+            with open(self.path, "rb") as file:
+                snapshot = WarmStartSnapshot.from_bytes(file.read())
+        except FileNotFoundError:
+            self.logger.info("No warm-start snapshot at %s, starting cold", self.path)
+            return 0
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring warm-start snapshot %s: %s", self.path, e)
+            return 0
+
+        self.rates_restored = snapshot.apply(self.exchange_service, self.max_age_seconds)
+        self.logger.info("Warm start restored %d rates from a snapshot written %.0f s ago",
+                         self.rates_restored, time.time() - snapshot.written_at)
+        return self.rates_restored
+
+    async def save(self) -> None:
+        # Capturing reads live state and stays on the loop; the file write does not
+        data = WarmStartSnapshot.capture(self.exchange_service, self.max_age_seconds).to_bytes()
+        await asyncio.to_thread(write_snapshot, self.path, data)
+        self.snapshots_written += 1
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            self._task = None
+            try:
+                await self.save()
+            except OSError as e:
+                self.logger.warning("Final warm-start snapshot failed: %s", e)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.save()
+            except OSError as e:
+                self.logger.warning("Warm-start snapshot failed: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "snapshotsWritten": self.snapshots_written,
+            "ratesRestored": self.rates_restored
+        }
@@ -1,7 +1,146 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
 from common.config.settings import settings
 
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed through `extra` and goes into the JSON document
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_listener_lock = threading.Lock()
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, ratio = item.partition("=")
+        rates[name.strip()] = float(ratio)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                document[key] = value
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            document["exception"] = record.exc_text
+
+        return json.dumps(document, default=str, ensure_ascii=False)
+
+
+class LazyQueueHandler(QueueHandler):
+    # QueueHandler.prepare() renders the message on the calling thread; here the record is only made safe to
+    # hand over (exception text captured) and msg % args is left to the listener thread.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    # Keeps one in every round(1 / ratio) records below WARNING; warnings and errors always pass
+    def __init__(self, ratio: float):
+        super().__init__()
+        self.every = max(1, round(1 / ratio)) if ratio > 0 else 0
+        self.seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+
+        self.seen += 1
+        return (self.seen - 1) % self.every == 0
+
+
+class RateLimitFilter(logging.Filter):
+    # Token bucket over records below WARNING; the next record let through reports how many were dropped
+    def __init__(self, max_per_second: float):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self.tokens = max_per_second
+        self.updated_at = time.monotonic()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        self.tokens = min(self.max_per_second, self.tokens + (now - self.updated_at) * self.max_per_second)
+        self.updated_at = now
+
+        if self.tokens < 1:
+            self.suppressed += 1
+            return False
+
+        self.tokens -= 1
+        if self.suppressed:
+            record.suppressed = self.suppressed
+            self.suppressed = 0
+        return True
+
+
+def _build_formatter() -> logging.Formatter:
+    return JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def _output_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_build_formatter())
+    return handler
+
+
+def _get_queue_handler() -> QueueHandler:
+    global _listener, _queue_handler
+
+    with _listener_lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            _queue_handler = LazyQueueHandler(log_queue)
+            _listener = QueueListener(log_queue, _output_handler(), respect_handler_level=False)
+            _listener.start()
+            atexit.register(stop_logging)
+    return _queue_handler
+
+
+def stop_logging() -> None:
+    # Drains the records still queued before the interpreter exits
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _sample_rate_for(name: str, rates: Dict[str, float]) -> Optional[float]:
+    # The longest configured prefix wins, so "common.providers" covers every provider logger
+    matches = [prefix for prefix in rates if name == prefix or name.startswith(prefix + ".")]
+    return rates[max(matches, key=len)] if matches else None
+
 
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -9,14 +148,13 @@ def setup_logger(name: str) -> logging.Logger:
     if not logger.handlers:
         logger.setLevel(getattr(logging, settings.LOG_LEVEL))
 
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
-
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
+        handler = _get_queue_handler() if settings.LOG_ASYNC else _output_handler()
+        logger.addHandler(handler)
 
-        logger.addHandler(console_handler)
+        sample_rate = _sample_rate_for(name, parse_sample_rates(settings.LOG_SAMPLE_RATES))
+        if sample_rate is not None:
+            logger.addFilter(SamplingFilter(sample_rate))
+        if settings.LOG_RATE_LIMIT_PER_SECOND > 0:
+            logger.addFilter(RateLimitFilter(settings.LOG_RATE_LIMIT_PER_SECOND))
 
     return logger
@@ -0,0 +1,12 @@
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(Response):
+    # Serializes an already-built response model straight to JSON bytes in pydantic-core, skipping the
+    # re-validation and dict round-trip FastAPI performs for response_model. Decimals keep their exact
+    # string form and the output is byte-identical to FastAPI's JSONResponse.
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
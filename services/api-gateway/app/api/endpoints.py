@@ -1,29 +1,49 @@
-import os
-import sys
+from functools import lru_cache
 
-from fastapi import APIRouter, HTTPException, Request, Response
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
+from common.config.settings import settings
 from common.models.api_formats import (
     API1Request, API1Response,
     API2Request, API3Request, API3Response
 )
-from common.models.request import ExchangeRequest, VALID_CURRENCIES
-from common.models.response import BestExchangeResponse
-from common.providers.api1_provider import API1DirectProvider
-from common.providers.api2_provider import API2DirectProvider
-from common.providers.api3_provider import API3DirectProvider
+from common.models.request import ExchangeRequest, BatchExchangeRequest, SUPPORTED_CURRENCIES
+from common.models.response import BestExchangeResponse, BatchExchangeResponse
+from common.providers.factory import create_direct_provider
+from common.services.coalescer import RequestCoalescer
 from common.services.exchange_service import ExchangeService
+from common.services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
 from common.utils.logger import setup_logger
+from common.utils.responses import ModelJSONResponse
 
 router = APIRouter()
 logger = setup_logger(__name__)
 
-exchange_service = ExchangeService()
-api1_direct_provider = API1DirectProvider()
-api2_direct_provider = API2DirectProvider()
-api3_direct_provider = API3DirectProvider()
+VALIDATION_ERROR_DATA = {"error": "Validation Error", "supported_currencies": SUPPORTED_CURRENCIES}
+
+
+def get_exchange_service(request: Request) -> ExchangeService:
+    return request.app.state.exchange_service
+
+
+def get_compare_coalescer(request: Request) -> RequestCoalescer:
+    return request.app.state.compare_coalescer
+
+
+# The single-provider endpoints are rarely used, so their providers are only built on the first call
+@lru_cache(maxsize=None)
+def get_api1_provider():
+    return create_direct_provider("API1")
+
+
+@lru_cache(maxsize=None)
+def get_api2_provider():
+    return create_direct_provider("API2")
+
+
+@lru_cache(maxsize=None)
+def get_api3_provider():
+    return create_direct_provider("API3")
 
 
 @router.get("/",
@@ -39,6 +59,18 @@ async def root():
                 "url": "POST /exchange/compare",
                 "format": "Unified format: {source_currency, target_currency, amount}"
             },
+            "stats": {
+                "url": "GET /exchange/stats",
+                "format": "Provider circuit breakers, concurrency limits, cache and coalescer counters"
+            },
+            "metrics": {
+                "url": "GET /metrics",
+                "format": "Prometheus text exposition format"
+            },
+            "compare_batch": {
+                "url": "POST /exchange/compare/batch",
+                "format": "{requests: [{source_currency, target_currency, amount}, ...]}"
+            },
             "individual_apis": [
                 {
                     "name": "API1 (JSON)",
@@ -70,31 +102,64 @@ async def root():
              tags=["API EXCHANGE"],
              summary="Compare exchange rates from all APIs",
              description="Compares rates from API1, API2, and API3 and returns the best offer")
-async def get_exchange_rate(request: ExchangeRequest):
+async def get_exchange_rate(request: ExchangeRequest,
+                            exchange_service: ExchangeService = Depends(get_exchange_service),
+                            compare_coalescer: RequestCoalescer = Depends(get_compare_coalescer)):
     try:
-        logger.info(f"Received exchange request: {request}")
+        logger.info("Received exchange request: %s", request)
 
-        result = await exchange_service.get_best_exchange_rate(request)
+        if settings.COALESCE_ENABLED:
+            # The amount is keyed by its text because the response echoes it back as sent
+            key = (request.source_currency, request.target_currency, str(request.amount))
+            result = await compare_coalescer.run(key, lambda: exchange_service.get_best_exchange_rate(request))
+        else:
+            result = await exchange_service.get_best_exchange_rate(request)
 
-        logger.info(
-            f"Exchange completed successfully. Best rate: {result.data.bestOffer.rate} from {result.data.bestOffer.provider}")
-        return result
+        logger.info("Exchange completed successfully. Best rate: %s from %s",
+                    result.data.bestOffer.rate, result.data.bestOffer.provider)
+        return ModelJSONResponse(result)
 
     except ValueError as e:
-        logger.warning(f"Validation error: {str(e)}")
+        logger.warning("Validation error: %s", e)
         raise HTTPException(status_code=400, detail={
             "statusCode": 400,
             "message": str(e),
+            "data": VALIDATION_ERROR_DATA
+        })
+    except Exception as e:
+        logger.error("Error processing exchange request: %s", e)
+        raise HTTPException(status_code=500, detail={
+            "statusCode": 500,
+            "message": "Internal server error occurred during exchange comparison",
             "data": {
-                "error": "Validation Error",
-                "supported_currencies": sorted(list(VALID_CURRENCIES))
+                "error": "Internal Server Error",
+                "details": str(e)
             }
         })
+
+
+@router.post("/exchange/compare/batch",
+             response_model=BatchExchangeResponse,
+             tags=["API EXCHANGE"],
+             summary="Compare exchange rates for many requests at once",
+             description="Compares rates for a list of requests, querying each distinct currency pair only once, "
+                         "and returns the best offer for every request in input order")
+async def get_exchange_rates_batch(request: BatchExchangeRequest,
+                                   exchange_service: ExchangeService = Depends(get_exchange_service)):
+    try:
+        logger.info("Received batch exchange request with %d items", len(request.requests))
+
+        result = await exchange_service.get_best_exchange_rates(request.requests)
+
+        logger.info("Batch exchange completed. %d of %d succeeded",
+                    result.data.successfulRequests, result.data.totalRequests)
+        return ModelJSONResponse(result)
+
     except Exception as e:
-        logger.error(f"Error processing exchange request: {str(e)}")
+        logger.error("Error processing batch exchange request: %s", e)
         raise HTTPException(status_code=500, detail={
             "statusCode": 500,
-            "message": "Internal server error occurred during exchange comparison",
+            "message": "Internal server error occurred during batch exchange comparison",
             "data": {
                 "error": "Internal Server Error",
                 "details": str(e)
@@ -102,23 +167,41 @@ async def get_exchange_rate(request: ExchangeRequest):
         })
 
 
+@router.get("/exchange/stats",
+            tags=["API EXCHANGE"],
+            summary="Provider health and cache statistics",
+            description="Circuit breaker state, adaptive concurrency limits, latency percentiles and rate cache counters")
+async def get_exchange_stats(exchange_service: ExchangeService = Depends(get_exchange_service),
+                             compare_coalescer: RequestCoalescer = Depends(get_compare_coalescer)):
+    return {**exchange_service.get_stats(), "coalescer": compare_coalescer.stats()}
+
+
+@router.get("/metrics",
+            tags=["API EXCHANGE"],
+            summary="Prometheus metrics",
+            description="Provider latency histograms, outcome counters, cache hit ratio, in-flight gauges "
+                        "and end-to-end compare latency")
+async def get_metrics(exchange_service: ExchangeService = Depends(get_exchange_service)):
+    return Response(content=exchange_service.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @router.post("/exchange/rate/api1",
              response_model=API1Response,
              tags=["API1 (JSON)"],
              summary="Get exchange rate from API1",
              description="API1 JSON Format: Input {from, to, value} → Output {rate}")
-async def get_api1_rate(request: API1Request):
+async def get_api1_rate(request: API1Request, provider=Depends(get_api1_provider)):
     try:
-        logger.info(f"API1 request: {request}")
+        logger.info("API1 request: %s", request)
 
-        result = await api1_direct_provider.get_exchange_rate(request)
+        result = await provider.get_exchange_rate(request)
 
-        logger.info(f"API1 completed successfully. Rate: {result.rate}")
+        logger.info("API1 completed successfully. Rate: %s", result.rate)
 
         return result
 
     except ValueError as e:
-        logger.warning(f"API1 validation error: {str(e)}")
+        logger.warning("API1 validation error: %s", e)
         raise HTTPException(status_code=400, detail={
             "error": "Validation Error",
             "message": str(e),
@@ -130,7 +213,7 @@ async def get_api1_rate(request: API1Request):
             }
         })
     except Exception as e:
-        logger.error(f"Error with API1 provider: {str(e)}")
+        logger.error("Error with API1 provider: %s", e)
         raise HTTPException(status_code=500, detail={
             "error": "API1 Provider Error",
             "message": str(e)
@@ -150,20 +233,20 @@ async def get_api1_rate(request: API1Request):
                  400: {"description": "Invalid XML format or validation error"},
                  500: {"description": "Internal server error"}
              })
-async def get_api2_rate(request: Request):
+async def get_api2_rate(request: Request, provider=Depends(get_api2_provider)):
     try:
         xml_body = await request.body()
         xml_string = xml_body.decode('utf-8')
 
-        logger.info(f"API2 XML request: {xml_string}")
+        logger.info("API2 XML request: %s", xml_string)
 
         api2_request = API2Request.from_xml(xml_string)
 
-        result = await api2_direct_provider.get_exchange_rate(api2_request)
+        result = await provider.get_exchange_rate(api2_request)
 
         xml_response = result.to_xml()
 
-        logger.info(f"API2 completed successfully. XML Result: {xml_response}")
+        logger.info("API2 completed successfully. XML Result: %s", xml_response)
 
         return Response(
             content=xml_response,
@@ -172,7 +255,7 @@ async def get_api2_rate(request: Request):
         )
 
     except ValueError as e:
-        logger.warning(f"API2 validation error: {str(e)}")
+        logger.warning("API2 validation error: %s", e)
 
         error_xml = f"""<XML><Error>
             <Code>ValidationError</Code>
@@ -183,7 +266,7 @@ async def get_api2_rate(request: Request):
         return Response(content=error_xml, media_type="application/xml", status_code=400)
 
     except Exception as e:
-        logger.error(f"Error with API2 provider: {str(e)}")
+        logger.error("Error with API2 provider: %s", e)
         error_xml = f"""<XML><Error>
             <Code>InternalError</Code>
             <Message>{str(e)}</Message>
@@ -196,18 +279,18 @@ async def get_api2_rate(request: Request):
              tags=["API3 (JSON)"],
              summary="Get exchange rate from API3",
              description="API3 Nested JSON Format: Input {exchange: {sourceCurrency, targetCurrency, quantity}} → Output {statusCode, message, data: {total}}")
-async def get_api3_rate(request: API3Request):
+async def get_api3_rate(request: API3Request, provider=Depends(get_api3_provider)):
     try:
-        logger.info(f"API3 request: {request}")
+        logger.info("API3 request: %s", request)
 
-        result = await api3_direct_provider.get_exchange_rate(request)
+        result = await provider.get_exchange_rate(request)
 
-        logger.info(f"API3 completed successfully. Total: {result.data.total}")
+        logger.info("API3 completed successfully. Total: %s", result.data.total)
 
         return result
 
     except ValueError as e:
-        logger.warning(f"API3 validation error: {str(e)}")
+        logger.warning("API3 validation error: %s", e)
         raise HTTPException(status_code=400, detail={
             "error": "Validation Error",
             "message": str(e),
@@ -221,7 +304,7 @@ async def get_api3_rate(request: API3Request):
             }
         })
     except Exception as e:
-        logger.error(f"Error with API3 provider: {str(e)}")
+        logger.error("Error with API3 provider: %s", e)
         raise HTTPException(status_code=500, detail={
             "error": "API3 Provider Error",
             "message": str(e)
@@ -1,6 +1,50 @@
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .api.endpoints import router
+from common.config.settings import settings
+from common.providers.http_client import close_http_clients
+from common.services.coalescer import RequestCoalescer
+from common.services.exchange_service import ExchangeService
+
+DEFAULT_SHARED_RATE_TABLE_PATH = "/dev/shm/ratecompare-rates" if os.path.isdir("/dev/shm") else os.path.join(
+    tempfile.gettempdir(), "ratecompare-rates")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Built at startup rather than at import time, so importing the app stays cheap
+    exchange_service = app.state.exchange_service = ExchangeService()
+    app.state.compare_coalescer = RequestCoalescer(settings.COALESCE_MAX_KEYS)
+    app.state.compare_coalescer.register_metrics(exchange_service.metrics, "compare")
+
+    shared_rates = None
+    if settings.SHARED_RATE_TABLE_PATH:
+        shared_rates = exchange_service.use_shared_rate_table(settings.SHARED_RATE_TABLE_PATH)
+
+    # Every worker loads the snapshot, only the writer (or the single process) keeps it up to date
+    warm_starter = None
+    if settings.WARM_START_ENABLED:
+        warm_starter = exchange_service.use_warm_start(
+            settings.WARM_START_SNAPSHOT_PATH, settings.WARM_START_INTERVAL_SECONDS, settings.WARM_START_MAX_AGE_SECONDS)
+        if shared_rates is None or shared_rates.is_writer:
+            warm_starter.start()
+
+    # With several workers only the one holding the shared table refreshes it, so provider traffic does
+    # not grow with the number of workers; the others stand by to take over if it exits
+    if shared_rates is not None or settings.RATE_REFRESHER_ENABLED:
+        exchange_service.start_background_refresh()
+    yield
+    await exchange_service.stop_background_refresh()
+    if warm_starter is not None:
+        await warm_starter.stop()
+    await close_http_clients()
+    if shared_rates is not None:
+        shared_rates.close()
+
 
 app = FastAPI(
     title="RateCompare API",
@@ -8,6 +52,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
     openapi_tags=[
         {
             "name": "API EXCHANGE",
@@ -32,10 +77,13 @@ app.include_router(router)
 
 if __name__ == "__main__":
     import uvicorn
-    import os
 
-    uvicorn.run(
-        app,
-        host=os.getenv("HOST", "0.0.0.0"),
-        port=int(os.getenv("PORT", "8000"))
-    )
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", "8000"))
+
+    if settings.GATEWAY_WORKERS > 1:
+        # Workers are spawned fresh and read their settings from the environment they inherit
+        os.environ.setdefault("SHARED_RATE_TABLE_PATH", DEFAULT_SHARED_RATE_TABLE_PATH)
+        uvicorn.run("app.main:app", host=host, port=port, workers=settings.GATEWAY_WORKERS)
+    else:
+        uvicorn.run(app, host=host, port=port)
@@ -1,19 +1,21 @@
-import os
-import sys
+from functools import lru_cache
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-
-from common.providers.api1_provider import API1DirectProvider
 from common.models.api_formats import API1Request, API1Response
+from common.providers.factory import create_direct_provider
 from common.utils.logger import setup_logger
 
 router = APIRouter()
-provider = API1DirectProvider()
 logger = setup_logger("API1_Endpoints")
 
 
+@lru_cache(maxsize=None)
+def get_provider():
+    # Built on the first request instead of at import, which keeps the service's startup short
+    return create_direct_provider("API1")
+
+
 @router.get("/")
 async def root():
     return {
@@ -27,17 +29,17 @@ async def root():
 
 
 @router.post("/exchange/rate")
-async def get_exchange_rate(request: API1Request) -> API1Response:
+async def get_exchange_rate(request: API1Request, provider=Depends(get_provider)) -> API1Response:
     try:
-        logger.info(f"API1 request received: {request.from_} -> {request.to}, amount: {request.value}")
+        logger.info("API1 request received: %s -> %s, amount: %s", request.from_, request.to, request.value)
         response = await provider.get_exchange_rate(request)
-        logger.info(f"API1 response: rate {response.rate}")
+        logger.info("API1 response: rate %s", response.rate)
         return response
     except ValueError as e:
-        logger.error(f"API1 error: {str(e)}")
+        logger.error("API1 error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"API1 unexpected error: {str(e)}")
+        logger.error("API1 unexpected error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -1,19 +1,24 @@
-import os
-import sys
+from decimal import Decimal
+from functools import lru_cache
 
-from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-
-from common.providers.api2_provider import API2DirectProvider
+from common.config.settings import settings
+from common.models import xml_codec
 from common.models.api_formats import API2Request
+from common.providers.factory import create_direct_provider
 from common.utils.logger import setup_logger
 
 router = APIRouter()
-provider = API2DirectProvider()
 logger = setup_logger("API2_Endpoints")
 
 
+@lru_cache(maxsize=None)
+def get_provider():
+    # Built on the first request instead of at import, which keeps the service's startup short
+    return create_direct_provider("API2")
+
+
 @router.get("/")
 async def root():
     return {
@@ -23,17 +28,20 @@ async def root():
         "endpoint": "POST /exchange/rate",
         "input_format": "<XML><From>string</From><To>string</To><Amount>number</Amount></XML>",
         "output_format": "<XML><Result>number</Result></XML>",
+        "batch_endpoint": "POST /exchange/rate/batch",
+        "batch_input_format": "<XML><Exchange><From>string</From><To>string</To><Amount>number</Amount></Exchange>...</XML>",
+        "batch_output_format": "<XML><Result>number</Result> or <Error>string</Error>, one per <Exchange>...</XML>",
         "content_type": "application/xml"
     }
 
 
 @router.post("/exchange/rate")
-async def get_exchange_rate_xml(request: Request):
+async def get_exchange_rate_xml(request: Request, provider=Depends(get_provider)):
     try:
         xml_content = await request.body()
         xml_text = xml_content.decode('utf-8')
 
-        logger.info(f"API2 XML request received: {xml_text}")
+        logger.info("API2 XML request received: %s", xml_text)
 
         api2_request = API2Request.from_xml(xml_text)
 
@@ -41,7 +49,7 @@ async def get_exchange_rate_xml(request: Request):
 
         xml_response = response.to_xml()
 
-        logger.info(f"API2 XML response: {xml_response}")
+        logger.info("API2 XML response: %s", xml_response)
 
         return Response(
             content=xml_response,
@@ -49,13 +57,62 @@ async def get_exchange_rate_xml(request: Request):
         )
 
     except ValueError as e:
-        logger.error(f"API2 error: {str(e)}")
+        logger.error("API2 error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"API2 unexpected error: {str(e)}")
+        logger.error("API2 unexpected error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/exchange/rate/batch")
+async def get_exchange_rates_xml(request: Request, provider=Depends(get_provider)):
+    try:
+        reader = xml_codec.BatchDocumentReader()
+        items = []
+        async for chunk in request.stream():
+            items.extend(_batch_item(element) for element in reader.feed(chunk))
+            if len(items) > settings.PROVIDER_BATCH_MAX_ITEMS:
+                raise HTTPException(status_code=413,
+                                    detail=f"A batch can contain at most {settings.PROVIDER_BATCH_MAX_ITEMS} exchanges")
+        items.extend(_batch_item(element) for element in reader.close())
+
+        logger.info("API2 XML batch request received: %d exchanges", len(items))
+
+        valid_requests = [item for item in items if isinstance(item, API2Request)]
+        responses = iter(await provider.get_exchange_rates(valid_requests))
+
+        results = []
+        for item in items:
+            response = next(responses) if isinstance(item, API2Request) else item
+            results.append(response if isinstance(response, Exception) else str(response.Result))
+
+        return Response(
+            content=xml_codec.encode_batch_response(results),
+            media_type="application/xml"
+        )
+
+    except HTTPException:
+        raise
+    # ElementTree's ParseError is a SyntaxError; catching that keeps ElementTree out of the startup imports
+    except (ValueError, SyntaxError) as e:
+        logger.error("API2 batch error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("API2 batch unexpected error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _batch_item(element):
+    # Invalid exchanges are answered with an <Error> in their position instead of failing the whole batch
+    try:
+        from_currency, to_currency, amount = xml_codec.exchange_from_element(element)
+        return API2Request(From=from_currency, To=to_currency, Amount=Decimal(amount))
+    except ArithmeticError:
+        return ValueError(f"Invalid amount: {amount}")
+    except ValueError as e:
+        return ValueError(str(e))
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "API2"}
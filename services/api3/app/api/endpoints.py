@@ -1,19 +1,21 @@
-import os
-import sys
+from functools import lru_cache
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-
-from common.providers.api3_provider import API3DirectProvider
 from common.models.api_formats import API3Request, API3Response
+from common.providers.factory import create_direct_provider
 from common.utils.logger import setup_logger
 
 router = APIRouter()
-provider = API3DirectProvider()
 logger = setup_logger("API3_Endpoints")
 
 
+@lru_cache(maxsize=None)
+def get_provider():
+    # Built on the first request instead of at import, which keeps the service's startup short
+    return create_direct_provider("API3")
+
+
 @router.get("/")
 async def root():
     return {
@@ -27,18 +29,18 @@ async def root():
 
 
 @router.post("/exchange/rate")
-async def get_exchange_rate(request: API3Request) -> API3Response:
+async def get_exchange_rate(request: API3Request, provider=Depends(get_provider)) -> API3Response:
     try:
-        logger.info(
-            f"API3 request received: {request.exchange.sourceCurrency} -> {request.exchange.targetCurrency}, amount: {request.exchange.quantity}")
+        logger.info("API3 request received: %s -> %s, amount: %s",
+                    request.exchange.sourceCurrency, request.exchange.targetCurrency, request.exchange.quantity)
         response = await provider.get_exchange_rate(request)
-        logger.info(f"API3 response: total {response.data.total}")
+        logger.info("API3 response: total %s", response.data.total)
         return response
     except ValueError as e:
-        logger.error(f"API3 error: {str(e)}")
+        logger.error("API3 error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"API3 unexpected error: {str(e)}")
+        logger.error("API3 unexpected error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
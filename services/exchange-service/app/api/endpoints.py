@@ -1,19 +1,41 @@
-import os
-import sys
+import math
+import time
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
+from common.config.settings import settings
+from common.models.money import from_fixed_rate
+from common.models.request import VALID_CURRENCIES
 from common.services.exchange_service import ExchangeService
-from common.models.request import ExchangeRequest
-from common.models.response import BestExchangeResponse
+from common.services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from common.services.ndjson_stream import stream_best_exchange_rates
+from common.models.request import ExchangeRequest, BatchExchangeRequest
+from common.models.response import BestExchangeResponse, BatchExchangeResponse
 from common.utils.logger import setup_logger
+from common.utils.responses import ModelJSONResponse
 
 router = APIRouter()
-exchange_service = ExchangeService()
 logger = setup_logger("Exchange_Service_Endpoints")
 
+# 9999-12-31T23:59:59Z, the last second datetime can represent
+MAX_EPOCH_SECONDS = 253402300799.0
+
+
+def get_exchange_service(request: Request) -> ExchangeService:
+    return request.app.state.exchange_service
+
+
+class RequestBodyStreamingResponse(StreamingResponse):
+    # The body iterator reads the request body itself, so receive() must not be polled concurrently
+    # for disconnects; a disconnect surfaces as ClientDisconnect from request.stream() instead.
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
 
 @router.get("/")
 async def root():
@@ -22,23 +44,124 @@ async def root():
         "version": "1.0.0",
         "description": "Compares exchange rates from multiple providers and returns the best offer",
         "endpoint": "POST /exchange/compare",
+        "batch_endpoint": "POST /exchange/compare/batch",
+        "stats_endpoint": "GET /exchange/stats",
+        "metrics_endpoint": "GET /metrics",
+        "stream_endpoint": "POST /exchange/compare/stream (application/x-ndjson)",
+        "history_endpoint": "GET /exchange/history/{source}/{target}?start=&end=&provider=&interval=",
         "input_format": {"source_currency": "string", "target_currency": "string", "amount": "number"}
     }
 
 
 @router.post("/exchange/compare")
-async def compare_exchange_rates(request: ExchangeRequest) -> BestExchangeResponse:
+async def compare_exchange_rates(
+        request: ExchangeRequest,
+        exchange_service: ExchangeService = Depends(get_exchange_service)) -> BestExchangeResponse:
     try:
-        logger.info(
-            f"Exchange compare request: {request.source_currency} -> {request.target_currency}, amount: {request.amount}")
+        logger.info("Exchange compare request: %s -> %s, amount: %s",
+                    request.source_currency, request.target_currency, request.amount)
         response = await exchange_service.get_best_exchange_rate(request)
-        logger.info(f"Exchange compare completed successfully. Best rate from {response.data.bestOffer.provider}")
-        return response
+        logger.info("Exchange compare completed successfully. Best rate from %s", response.data.bestOffer.provider)
+        return ModelJSONResponse(response)
+    except Exception as e:
+        logger.error("Exchange compare error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/exchange/compare/batch")
+async def compare_exchange_rates_batch(
+        request: BatchExchangeRequest,
+        exchange_service: ExchangeService = Depends(get_exchange_service)) -> BatchExchangeResponse:
+    try:
+        logger.info("Exchange batch compare request: %d items", len(request.requests))
+        response = await exchange_service.get_best_exchange_rates(request.requests)
+        logger.info("Exchange batch compare completed. %d of %d succeeded",
+                    response.data.successfulRequests, response.data.totalRequests)
+        return ModelJSONResponse(response)
     except Exception as e:
-        logger.error(f"Exchange compare error: {str(e)}")
+        logger.error("Exchange batch compare error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/exchange/compare/stream")
+async def compare_exchange_rates_stream(request: Request,
+                                        exchange_service: ExchangeService = Depends(get_exchange_service)):
+    logger.info("Exchange stream compare request started")
+    return RequestBodyStreamingResponse(
+        stream_best_exchange_rates(exchange_service, request.stream(), settings.STREAM_MAX_IN_FLIGHT),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/exchange/stats")
+async def exchange_stats(exchange_service: ExchangeService = Depends(get_exchange_service)):
+    return exchange_service.get_stats()
+
+
+@router.get("/exchange/history/{source_currency}/{target_currency}")
+async def exchange_history(source_currency: str, target_currency: str,
+                           start: Optional[float] = Query(None, description="Epoch seconds, defaults to one hour ago"),
+                           end: Optional[float] = Query(None, description="Epoch seconds, defaults to now"),
+                           provider: Optional[str] = None,
+                           interval: Optional[float] = Query(None, description="OHLC bucket in seconds"),
+                           limit: int = Query(1000, gt=0),
+                           exchange_service: ExchangeService = Depends(get_exchange_service)):
+    history = exchange_service.rate_history
+    if history is None:
+        raise HTTPException(status_code=404, detail="Rate history is disabled")
+
+    source_currency, target_currency = source_currency.upper(), target_currency.upper()
+    if source_currency not in VALID_CURRENCIES or target_currency not in VALID_CURRENCIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported currency pair {source_currency}/{target_currency}")
+
+    if any(value is not None and not (math.isfinite(value) and 0 <= value <= MAX_EPOCH_SECONDS)
+           for value in (start, end)):
+        raise HTTPException(status_code=400, detail=f"start and end must be epoch seconds in [0, {MAX_EPOCH_SECONDS:.0f}]")
+    if interval is not None and not (math.isfinite(interval) and interval > 0):
+        raise HTTPException(status_code=400, detail="interval must be a positive number of seconds")
+
+    end = end if end is not None else time.time()
+    start = start if start is not None else max(0.0, end - 3600)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if end - start > settings.RATE_HISTORY_MAX_RANGE_SECONDS:
+        raise HTTPException(status_code=400,
+                            detail=f"Range exceeds {settings.RATE_HISTORY_MAX_RANGE_SECONDS:g} seconds")
+
+    limit = min(limit, settings.RATE_HISTORY_MAX_POINTS)
+    data = {"sourceCurrency": source_currency, "targetCurrency": target_currency, "start": start, "end": end}
+    if interval is not None:
+        if (end - start) / interval > settings.RATE_HISTORY_MAX_POINTS:
+            raise HTTPException(status_code=400,
+                                detail=f"interval is too small for the range, at most "
+                                       f"{settings.RATE_HISTORY_MAX_POINTS} candles per provider")
+        data["interval"] = interval
+        data["candles"] = [
+            {
+                "timestamp": candle["start_us"] / 1_000_000,
+                "provider": candle["provider"],
+                "open": str(from_fixed_rate(candle["open"])),
+                "high": str(from_fixed_rate(candle["high"])),
+                "low": str(from_fixed_rate(candle["low"])),
+                "close": str(from_fixed_rate(candle["close"])),
+                "count": candle["count"]
+            }
+            for candle in history.ohlc(source_currency, target_currency, start, end, interval, provider, limit)
+        ]
+    else:
+        data["points"] = [
+            {"timestamp": timestamp_us / 1_000_000, "provider": name, "rate": str(from_fixed_rate(fixed_rate))}
+            for timestamp_us, name, fixed_rate in history.points(
+                source_currency, target_currency, start, end, provider, limit)
+        ]
+    return {"success": True, "data": data}
+
+
+@router.get("/metrics")
+async def metrics(exchange_service: ExchangeService = Depends(get_exchange_service)):
+    return Response(content=exchange_service.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "Exchange Compare"}
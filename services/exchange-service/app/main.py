@@ -1,13 +1,44 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .api.endpoints import router
+from common.config.settings import settings
+from common.providers.http_client import close_http_clients
+from common.services.exchange_service import ExchangeService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Built at startup rather than at import time, so importing the app stays cheap
+    exchange_service = app.state.exchange_service = ExchangeService()
+
+    warm_starter = None
+    if settings.WARM_START_ENABLED:
+        warm_starter = exchange_service.use_warm_start(
+            settings.WARM_START_SNAPSHOT_PATH, settings.WARM_START_INTERVAL_SECONDS, settings.WARM_START_MAX_AGE_SECONDS)
+        warm_starter.start()
+    if settings.RATE_HISTORY_ENABLED:
+        exchange_service.use_rate_history(settings.RATE_HISTORY_DIR, settings.RATE_HISTORY_SEGMENT_CAPACITY,
+                                          settings.RATE_HISTORY_MAX_OPEN_SEGMENTS)
+    if settings.RATE_REFRESHER_ENABLED:
+        exchange_service.start_background_refresh()
+    yield
+    await exchange_service.stop_background_refresh()
+    if warm_starter is not None:
+        await warm_starter.stop()
+    await close_http_clients()
+    if exchange_service.rate_history is not None:
+        exchange_service.rate_history.close()
+
 
 app = FastAPI(
     title="RateCompare Exchange Compare Service",
     description="Exchange Rate Comparison Service - Compares rates from multiple APIs and selects the best deal",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.include_router(router)
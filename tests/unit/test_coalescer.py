@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from common.services.coalescer import RequestCoalescer
+from common.services.metrics import MetricsRegistry
+
+
+def counting_call(result="best", delay=0.01, error=None):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return call, calls
+
+
+class TestRequestCoalescer:
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_calls_share_one_execution(self):
+        """Test: concurrent duplicates await the first caller's result and the key is released afterwards."""
+        coalescer = RequestCoalescer(max_keys=10)
+        call, calls = counting_call()
+
+        results = await asyncio.gather(*[coalescer.run(("USD", "EUR", "100"), call) for _ in range(20)])
+
+        assert results == ["best"] * 20
+        assert len(calls) == 1
+        assert coalescer.leaders == 1
+        assert coalescer.coalesced == 19
+        assert len(coalescer) == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        """Test: a call starting after the previous one finished runs again, so results are never stale."""
+        coalescer = RequestCoalescer(max_keys=10)
+        call, calls = counting_call()
+
+        await coalescer.run("key", call)
+        await coalescer.run("key", call)
+
+        assert len(calls) == 2
+        assert coalescer.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """Test: a failing call raises in every coalesced caller and frees the key."""
+        coalescer = RequestCoalescer(max_keys=10)
+        call, calls = counting_call(error=ValueError("unsupported"))
+
+        results = await asyncio.gather(*[coalescer.run("key", call) for _ in range(5)], return_exceptions=True)
+
+        assert len(calls) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(coalescer) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test: cancelling one waiter leaves the shared call running for the others."""
+        coalescer = RequestCoalescer(max_keys=10)
+        call, calls = counting_call(delay=0.05)
+
+        first = asyncio.ensure_future(coalescer.run("key", call))
+        second = asyncio.ensure_future(coalescer.run("key", call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "best"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_bookkeeping_is_bounded(self):
+        """Test: past max_keys new keys run on their own without being tracked."""
+        coalescer = RequestCoalescer(max_keys=2)
+        call, calls = counting_call()
+
+        await asyncio.gather(*[coalescer.run(key, call) for key in ("a", "b", "c", "c")])
+
+        assert len(calls) == 4
+        assert coalescer.bypassed == 2
+        assert coalescer.leaders == 2
+
+    @pytest.mark.asyncio
+    async def test_metrics_expose_coalesce_ratio(self):
+        """Test: the coalesce ratio and outcome counters are rendered in the metrics registry."""
+        coalescer = RequestCoalescer(max_keys=10)
+        metrics = MetricsRegistry()
+        coalescer.register_metrics(metrics, "compare")
+        call, _ = counting_call()
+
+        await asyncio.gather(*[coalescer.run("key", call) for _ in range(4)])
+        output = metrics.render()
+
+        assert 'ratecompare_coalescer_ratio{operation="compare"} 0.75' in output
+        assert 'ratecompare_coalescer_requests_total{operation="compare",outcome="coalesced"} 3' in output
+        assert coalescer.stats()["coalesceRatio"] == 0.75
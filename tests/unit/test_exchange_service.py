@@ -4,6 +4,7 @@ import pytest
 
 from common.models.request import ExchangeRequest
 from common.services.exchange_service import ExchangeService
+from common.services.rate_cache import RateCache
 
 
 @pytest.fixture
@@ -174,3 +175,149 @@ class TestExchangeService:
 
         with pytest.raises(ValueError, match="All providers failed"):
             await service.get_best_exchange_rate(unsupported_request)
+
+    @pytest.mark.asyncio
+    async def test_batch_fetches_each_pair_once_and_keeps_order(self):
+        """Test: batch comparison queries every distinct pair once per provider and preserves input order."""
+        service = ExchangeService()
+        service.rate_cache = RateCache(ttl_seconds=0, max_entries=0)
+
+        class CountingProvider:
+            def __init__(self, response_factory):
+                self.response_factory = response_factory
+                self.calls = []
+
+            async def get_exchange_rate(self, request):
+                self.calls.append(request)
+                return self.response_factory(request)
+
+        from common.models.api_formats import API1Response, API2Response, API3Response, API3DataResponse
+        service.api1_provider = CountingProvider(lambda r: API1Response(rate=Decimal("0.85")))
+        service.api2_provider = CountingProvider(lambda r: API2Response(Result=Decimal("0.86")))
+        service.api3_provider = CountingProvider(lambda r: API3Response(
+            statusCode=200, message="Success",
+            data=API3DataResponse(total=Decimal("0.80") * r.exchange.quantity)))
+
+        requests = [
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100.00")),
+            ExchangeRequest(source_currency="USD", target_currency="GBP", amount=Decimal("10.00")),
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("250.00")),
+        ]
+
+        result = await service.get_best_exchange_rates(requests)
+
+        assert len(service.api1_provider.calls) == 2
+        assert len(service.api2_provider.calls) == 2
+        assert len(service.api3_provider.calls) == 2
+        assert result.data.distinctPairs == 2
+        assert [item.index for item in result.data.results] == [0, 1, 2]
+        assert result.data.results[2].data.bestOffer.provider == "API2"
+        assert result.data.results[2].data.bestOffer.convertedAmount == Decimal("0.86") * Decimal("250.00")
+        assert result.data.results[1].data.bestOffer.targetCurrency == "GBP"
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_round_trip_for_batch_capable_providers(self):
+        """Test: a provider that accepts batched requests is queried once for all distinct pairs."""
+        from common.models.api_formats import API2Response
+        from common.services.rate_table import RateTable
+        service = ExchangeService()
+        service.rate_table = RateTable()
+
+        class BatchProvider:
+            def __init__(self):
+                self.single_calls = 0
+                self.batches = []
+
+            async def get_exchange_rate(self, request):
+                self.single_calls += 1
+                return API2Response(Result=Decimal("0.86"))
+
+            async def get_exchange_rates(self, requests):
+                self.batches.append([(r.From, r.To) for r in requests])
+                return [ValueError("Not supported") if r.To == "JPY" else API2Response(Result=Decimal("0.86"))
+                        for r in requests]
+
+        service.api2_provider = BatchProvider()
+        requests = [
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100.00")),
+            ExchangeRequest(source_currency="USD", target_currency="GBP", amount=Decimal("10.00")),
+            ExchangeRequest(source_currency="USD", target_currency="JPY", amount=Decimal("10.00")),
+        ]
+
+        result = await service.get_best_exchange_rates(requests)
+
+        assert service.api2_provider.batches == [[("USD", "EUR"), ("USD", "GBP"), ("USD", "JPY")]]
+        assert service.api2_provider.single_calls == 0
+        assert "API2" in [offer.provider for offer in result.data.results[0].data.allOffers]
+        assert "API2" not in [offer.provider for offer in result.data.results[2].data.allOffers]
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_failed_items(self, unsupported_request, sample_request):
+        """Test: a batch keeps going when some items cannot be served and reports them individually."""
+        service = ExchangeService()
+
+        result = await service.get_best_exchange_rates([unsupported_request, sample_request])
+
+        assert result.statusCode == 200
+        assert result.data.successfulRequests == 1
+        assert result.data.failedRequests == 1
+        assert result.data.results[0].statusCode == 400
+        assert result.data.results[0].data is None
+        assert result.data.results[1].statusCode == 200
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_answered_providers(self, sample_request):
+        """Test: providers that miss the deadline are cancelled and reported as timed out."""
+        import asyncio
+        from common.models.api_formats import API1Response, API2Response, API3Response, API3DataResponse
+
+        service = ExchangeService()
+        cancelled = []
+
+        class DelayedProvider:
+            def __init__(self, delay, response):
+                self.delay = delay
+                self.response = response
+
+            async def get_exchange_rate(self, request):
+                try:
+                    await asyncio.sleep(self.delay)
+                except asyncio.CancelledError:
+                    cancelled.append(self)
+                    raise
+                return self.response
+
+        service.api1_provider = DelayedProvider(0.01, API1Response(rate=Decimal("0.85")))
+        service.api2_provider = DelayedProvider(5, API2Response(Result=Decimal("0.99")))
+        service.api3_provider = DelayedProvider(0.01, API3Response(
+            statusCode=200, message="Success", data=API3DataResponse(total=Decimal("86.0"))))
+
+        result = await service.get_best_exchange_rate(sample_request, deadline_ms=100)
+
+        assert result.data.bestOffer.provider == "API3"
+        assert result.data.timedOutProviders == ["API2"]
+        assert result.data.successfulProviders == 2
+        assert result.data.failedProviders == 1
+        assert cancelled == [service.api2_provider]
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_beats_slow_attempt(self, monkeypatch):
+        """Test: a provider call slower than its historical p95 is re-issued and the faster attempt wins."""
+        import asyncio
+        from common.config.settings import settings
+
+        monkeypatch.setattr(settings, "HEDGE_ENABLED", True)
+        service = ExchangeService()
+        for _ in range(service.latency_tracker.min_samples):
+            service.latency_tracker.record("API1", 0.01)
+
+        delays = [1.0, 0.0]
+
+        async def fetch():
+            await asyncio.sleep(delays.pop(0))
+            return Decimal("0.85")
+
+        rate = await asyncio.wait_for(service._provider_fetch("API1", fetch), timeout=0.5)
+
+        assert rate == Decimal("0.85")
+        assert service.hedged_requests == 1
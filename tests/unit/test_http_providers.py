@@ -0,0 +1,105 @@
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from common.models.api_formats import API1Request, API2Request, API3Request, API3ExchangeData
+from common.providers.api1_provider import API1DirectProvider
+from common.providers.factory import create_providers
+from common.providers.http_providers import API1HttpProvider, API2HttpProvider, API3HttpProvider
+
+
+def mock_client(handler):
+    return httpx.AsyncClient(base_url="http://provider", transport=httpx.MockTransport(handler))
+
+
+class TestHttpProviders:
+
+    @pytest.mark.asyncio
+    async def test_api1_http_provider_sends_json(self):
+        """Test: API1 HTTP provider posts {from, to, value} and parses {rate}."""
+        captured = {}
+
+        def handler(request):
+            captured["body"] = json.loads(request.content)
+            return httpx.Response(200, json={"rate": "0.85"})
+
+        provider = API1HttpProvider(client=mock_client(handler))
+        result = await provider.get_exchange_rate(API1Request(**{"from": "USD", "to": "EUR", "value": Decimal("100")}))
+
+        assert captured["body"]["from"] == "USD"
+        assert captured["body"]["to"] == "EUR"
+        assert result.rate == Decimal("0.85")
+
+    @pytest.mark.asyncio
+    async def test_api2_http_provider_speaks_xml(self):
+        """Test: API2 HTTP provider sends and receives XML documents."""
+        captured = {}
+
+        def handler(request):
+            captured["content_type"] = request.headers["content-type"]
+            captured["body"] = request.content.decode()
+            return httpx.Response(200, text="<XML><Result>0.86</Result></XML>",
+                                  headers={"Content-Type": "application/xml"})
+
+        provider = API2HttpProvider(client=mock_client(handler))
+        result = await provider.get_exchange_rate(API2Request(From="USD", To="EUR", Amount=Decimal("100.00")))
+
+        assert captured["content_type"] == "application/xml"
+        assert captured["body"] == "<XML><From>USD</From><To>EUR</To><Amount>100.00</Amount></XML>"
+        assert result.Result == Decimal("0.86")
+
+    @pytest.mark.asyncio
+    async def test_api2_http_provider_batches_exchanges(self):
+        """Test: API2 HTTP provider sends many exchanges in one XML document and keeps per-item errors."""
+        captured = {}
+
+        def handler(request):
+            captured["path"] = request.url.path
+            captured["body"] = request.content.decode()
+            return httpx.Response(200, text="<XML><Result>0.86</Result><Error>Not supported</Error></XML>",
+                                  headers={"Content-Type": "application/xml"})
+
+        provider = API2HttpProvider(client=mock_client(handler))
+        results = await provider.get_exchange_rates([
+            API2Request(From="USD", To="EUR", Amount=Decimal("100.00")),
+            API2Request(From="AED", To="QAR", Amount=Decimal("5")),
+        ])
+
+        assert captured["path"] == "/exchange/rate/batch"
+        assert captured["body"] == ("<XML><Exchange><From>USD</From><To>EUR</To><Amount>100.00</Amount></Exchange>"
+                                    "<Exchange><From>AED</From><To>QAR</To><Amount>5</Amount></Exchange></XML>")
+        assert results[0].Result == Decimal("0.86")
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_api3_http_provider_maps_client_errors_to_value_error(self):
+        """Test: a 4xx from API3 is surfaced as ValueError like the direct providers."""
+        def handler(request):
+            return httpx.Response(400, json={"detail": "Currency conversion from AED to QAR is not supported"})
+
+        provider = API3HttpProvider(client=mock_client(handler))
+        request = API3Request(exchange=API3ExchangeData(sourceCurrency="AED", targetCurrency="QAR",
+                                                        quantity=Decimal("10")))
+
+        with pytest.raises(ValueError):
+            await provider.get_exchange_rate(request)
+
+    def test_provider_mode_selects_implementation(self):
+        """Test: provider mode selects direct or HTTP implementations."""
+        direct = create_providers("direct")
+        http = create_providers("http")
+
+        assert isinstance(direct[0], API1DirectProvider)
+        assert isinstance(http[0], API1HttpProvider)
+        with pytest.raises(ValueError):
+            create_providers("carrier-pigeon")
+
+    def test_http_providers_advertise_configured_pairs(self):
+        """Test: HTTP providers take their pair set from settings, so the pair index and refresher can use them."""
+        provider = API1HttpProvider(client=mock_client(None), pairs="usd/eur, EUR/USD")
+
+        assert provider.supported_pairs == frozenset({("USD", "EUR"), ("EUR", "USD")})
+        assert API2HttpProvider(client=mock_client(None), pairs="").supported_pairs is None
+        assert ("USD", "EUR") in API3HttpProvider(client=mock_client(None)).supported_pairs
@@ -0,0 +1,72 @@
+import json
+import logging
+import queue
+
+from common.utils.logger import (
+    JsonFormatter, LazyQueueHandler, RateLimitFilter, SamplingFilter, parse_sample_rates, _sample_rate_for
+)
+
+
+def make_record(level=logging.INFO, msg="Rate %s", args=("0.85",), **extra):
+    record = logging.LogRecord("common.providers.api1", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class CountingArg:
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "rendered"
+
+
+class TestLogger:
+
+    def test_json_formatter_includes_extra_fields(self):
+        """Test: records are written as one JSON document with the rendered message and extra fields."""
+        document = json.loads(JsonFormatter().format(make_record(provider="API1")))
+
+        assert document["message"] == "Rate 0.85"
+        assert document["level"] == "INFO"
+        assert document["logger"] == "common.providers.api1"
+        assert document["provider"] == "API1"
+
+    def test_queue_handler_defers_message_rendering(self):
+        """Test: the calling thread only enqueues; msg % args is rendered by the writer."""
+        log_queue = queue.SimpleQueue()
+        argument = CountingArg()
+
+        LazyQueueHandler(log_queue).handle(make_record(args=(argument,)))
+
+        assert argument.renders == 0
+        assert log_queue.get_nowait().getMessage() == "Rate rendered"
+
+    def test_sampling_keeps_one_in_n_but_never_drops_warnings(self):
+        """Test: sampling thins out INFO records while warnings always pass."""
+        sampler = SamplingFilter(0.25)
+
+        kept = sum(sampler.filter(make_record()) for _ in range(100))
+
+        assert kept == 25
+        assert all(sampler.filter(make_record(level=logging.WARNING)) for _ in range(10))
+
+    def test_rate_limit_reports_suppressed_records(self):
+        """Test: records over the per-second budget are dropped and counted on the next record let through."""
+        limiter = RateLimitFilter(max_per_second=2)
+
+        assert [limiter.filter(make_record()) for _ in range(5)] == [True, True, False, False, False]
+
+        limiter.tokens = 1
+        record = make_record()
+        assert limiter.filter(record)
+        assert record.suppressed == 3
+
+    def test_sample_rates_match_longest_logger_prefix(self):
+        """Test: sampling configuration applies to child loggers, the most specific entry winning."""
+        rates = parse_sample_rates("common.providers=0.1, common.providers.api2=0.5")
+
+        assert _sample_rate_for("common.providers.api1_provider", rates) == 0.1
+        assert _sample_rate_for("common.providers.api2.API2_Direct", rates) == 0.5
+        assert _sample_rate_for("common.services", rates) is None
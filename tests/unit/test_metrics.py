@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+from common.models.request import ExchangeRequest
+from common.services.exchange_service import ExchangeService
+from common.services.metrics import MetricsRegistry
+
+
+class TestMetrics:
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test: histogram buckets are cumulative and end with +Inf, sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("provider",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.labels("API1").observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert 'latency_seconds_bucket{provider="API1",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{provider="API1",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{provider="API1",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{provider="API1"} 4' in lines
+
+    def test_counters_escape_label_values(self):
+        """Test: counters get the _total suffix and label values are escaped."""
+        registry = MetricsRegistry()
+        registry.counter("errors", "Errors", ("error",)).labels('bad "value"').inc()
+
+        lines = registry.render().splitlines()
+
+        assert lines[:2] == ["# HELP errors_total Errors", "# TYPE errors_total counter"]
+        assert 'errors_total{error="bad \\"value\\""} 1' in lines
+
+    def test_duplicate_metric_names_are_rejected(self):
+        """Test: registering the same metric twice is an error."""
+        registry = MetricsRegistry()
+        registry.gauge("in_flight", "In flight")
+
+        with pytest.raises(ValueError):
+            registry.counter("in_flight", "In flight")
+
+    @pytest.mark.asyncio
+    async def test_service_records_provider_outcomes_and_compare_latency(self):
+        """Test: a compare records provider outcomes by error class, latency and cache gauges."""
+        from common.models.api_formats import API1Response
+
+        class FailingProvider:
+            async def get_exchange_rate(self, request):
+                raise ConnectionError("API unavailable")
+
+        class WorkingProvider:
+            async def get_exchange_rate(self, request):
+                return API1Response(rate=Decimal("0.85"))
+
+        service = ExchangeService()
+        service.api1_provider = WorkingProvider()
+        service.api2_provider = FailingProvider()
+        service.api3_provider = FailingProvider()
+
+        await service.get_best_exchange_rate(
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100")))
+
+        lines = service.metrics.render().splitlines()
+
+        assert 'ratecompare_provider_requests_total{provider="API1",outcome="success",error=""} 1' in lines
+        assert 'ratecompare_provider_requests_total{provider="API2",outcome="error",error="ConnectionError"} 1' in lines
+        assert 'ratecompare_compare_duration_seconds_count{operation="compare"} 1' in lines
+        assert 'ratecompare_compares_in_flight{operation="compare"} 0' in lines
+        assert 'ratecompare_rate_cache_lookups_total{result="misses"} 3' in lines
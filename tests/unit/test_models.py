@@ -46,3 +46,34 @@ class TestModels:
                 target_currency="EUR",
                 amount=Decimal("-100.00")
             )
+
+    def test_currency_codes_are_normalized_to_canonical_strings(self):
+        """Test: lowercase codes are accepted and mapped to the shared canonical string."""
+        request = ExchangeRequest(source_currency="usd", target_currency="eur", amount=Decimal("10"))
+
+        assert request.source_currency == "USD"
+        assert request.target_currency is ExchangeRequest(
+            source_currency="USD", target_currency="EUR", amount=Decimal("1")).target_currency
+
+    def test_invalid_currency_message_lists_supported_currencies(self):
+        """Test: unknown codes report every supported currency, in sorted order."""
+        with pytest.raises(ValidationError, match="Invalid target currency 'XXX'. Supported currencies: AED, AUD"):
+            ExchangeRequest(source_currency="USD", target_currency="XXX", amount=Decimal("10"))
+
+        with pytest.raises(ValidationError, match="must contain only letters"):
+            ExchangeRequest(source_currency="U5D", target_currency="EUR", amount=Decimal("10"))
+
+    def test_amount_precision_and_limit(self):
+        """Test: amounts with more than 2 decimal places or above the limit are rejected."""
+        with pytest.raises(ValidationError, match="more than 2 decimal places") as error:
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100.005"))
+        assert error.value.errors()[0]["loc"] == ("amount",)
+
+        with pytest.raises(ValidationError, match="JPY amounts cannot have decimal places") as error:
+            ExchangeRequest(source_currency="JPY", target_currency="EUR", amount=Decimal("100.5"))
+        assert error.value.errors()[0]["loc"] == ("amount",)
+
+        with pytest.raises(ValidationError, match="cannot exceed"):
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("1000000.01"))
+
+        assert ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("1000000")).amount
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from common.models.money import (
+    RATE_SCALE, convert, from_fixed_rate, from_minor, minor_units, to_fixed_rate, to_minor
+)
+from common.models.request import ExchangeRequest
+
+
+class TestMoney:
+
+    def test_currency_minor_units(self):
+        """Test: JPY and KRW have no decimals, KWD and BHD have 3 and everything else 2."""
+        assert [minor_units(code) for code in ("JPY", "KRW", "KWD", "BHD", "USD", "EUR")] == [0, 0, 3, 3, 2, 2]
+
+    def test_fixed_rates_round_trip(self):
+        """Test: rates become integers scaled by 10**12 and come back as the same Decimal."""
+        assert to_fixed_rate(Decimal("0.85")) == 85 * RATE_SCALE // 100
+        assert to_fixed_rate(0.85) == to_fixed_rate(Decimal("0.85"))
+        assert str(from_fixed_rate(to_fixed_rate(Decimal("0.85")))) == "0.85"
+        assert str(from_fixed_rate(to_fixed_rate(Decimal("110")))) == "110"
+        assert from_fixed_rate(to_fixed_rate(Decimal("0.8658305939544604"))) == Decimal("0.865830593954")
+
+    def test_amounts_use_minor_units(self):
+        """Test: amounts are converted to and from integer minor units of their currency."""
+        assert to_minor(Decimal("100.50"), "USD") == 10050
+        assert to_minor(Decimal("1500"), "JPY") == 1500
+        assert to_minor(Decimal("1.234"), "KWD") == 1234
+        assert str(from_minor(8750, "EUR")) == "87.50"
+        assert str(from_minor(1234, "BHD")) == "1.234"
+
+    def test_conversion_rounds_to_target_minor_units(self):
+        """Test: converted amounts are rounded half to even in the target currency's minor units."""
+        usd_to_jpy = to_fixed_rate(Decimal("110.555"))
+        assert str(convert(10000, "USD", "JPY", usd_to_jpy)) == "11056"
+
+        usd_to_kwd = to_fixed_rate(Decimal("0.30705"))
+        assert str(convert(1000, "USD", "KWD", usd_to_kwd)) == "3.070"
+
+        jpy_to_usd = to_fixed_rate(Decimal("0.009"))
+        assert str(convert(1500, "JPY", "USD", jpy_to_usd)) == "13.50"
+
+    def test_request_amount_precision_follows_source_currency(self):
+        """Test: request amounts may not be finer than the minor unit of the source currency."""
+        with pytest.raises(ValidationError, match="JPY amounts cannot have decimal places"):
+            ExchangeRequest(source_currency="JPY", target_currency="USD", amount=Decimal("100.5"))
+
+        with pytest.raises(ValidationError, match="more than 3 decimal places"):
+            ExchangeRequest(source_currency="KWD", target_currency="USD", amount=Decimal("1.2345"))
+
+        assert ExchangeRequest(source_currency="KWD", target_currency="USD", amount=Decimal("1.234")).amount
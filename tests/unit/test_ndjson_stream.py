@@ -0,0 +1,97 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from common.models.response import BestExchangeResponse, ComparisonData, ExchangeResponse
+from common.services.ndjson_stream import iter_ndjson_lines, stream_best_exchange_rates
+
+
+class MockExchangeService:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_best_exchange_rate(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001 * (int(request.amount) % 3))
+        self.in_flight -= 1
+
+        offer = ExchangeResponse(
+            sourceCurrency=request.source_currency,
+            targetCurrency=request.target_currency,
+            amount=request.amount,
+            convertedAmount=request.amount * Decimal("0.85"),
+            rate=Decimal("0.85"),
+            provider="API1",
+            responseTimeMs=1
+        )
+        return BestExchangeResponse(
+            statusCode=200,
+            message="ok",
+            data=ComparisonData(bestOffer=offer, allOffers=[offer], totalProvidersQueried=1,
+                                successfulProviders=1, failedProviders=0)
+        )
+
+
+async def chunked(lines, chunk_size=7, consumed=None):
+    body = "".join(lines).encode()
+    for i in range(0, len(body), chunk_size):
+        if consumed is not None:
+            consumed.append(i)
+        yield body[i:i + chunk_size]
+
+
+def request_line(amount):
+    return json.dumps({"source_currency": "USD", "target_currency": "EUR", "amount": amount}) + "\n"
+
+
+class TestNDJSONStream:
+
+    @pytest.mark.asyncio
+    async def test_lines_are_split_across_chunks(self):
+        """Test: NDJSON lines are reassembled across chunk boundaries and blank lines are skipped."""
+        lines = [item async for item in iter_ndjson_lines(chunked(["{\"a\": 1}\n", "\n", "{\"b\": 2}"], 3))]
+
+        assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}')]
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order_with_bounded_concurrency(self):
+        """Test: streamed results follow input order and never exceed the in-flight window."""
+        service = MockExchangeService()
+        lines = [request_line(amount) for amount in range(1, 41)]
+
+        output = [json.loads(line) async for line in stream_best_exchange_rates(service, chunked(lines), 5)]
+
+        assert [item["data"]["bestOffer"]["amount"] for item in output] == [str(a) for a in range(1, 41)]
+        assert service.max_in_flight <= 5
+
+    @pytest.mark.asyncio
+    async def test_invalid_lines_are_reported_inline(self):
+        """Test: malformed or invalid lines produce an error line without stopping the stream."""
+        service = MockExchangeService()
+        lines = [request_line(10), "not json\n", json.dumps({"source_currency": "XXX", "target_currency": "EUR",
+                                                             "amount": 1}) + "\n", request_line(20)]
+
+        output = [json.loads(line) async for line in stream_best_exchange_rates(service, chunked(lines), 4)]
+
+        assert [item["statusCode"] for item in output] == [200, 400, 400, 200]
+        assert output[1]["data"]["line"] == 2
+        assert "Invalid source currency" in output[2]["message"]
+
+    @pytest.mark.asyncio
+    async def test_first_result_is_emitted_before_body_is_consumed(self):
+        """Test: the stream yields results before the whole request body has been read."""
+        service = MockExchangeService()
+        consumed = []
+        lines = [request_line(amount) for amount in range(1, 201)]
+        total_chunks = len("".join(lines).encode()) // 64 + 1
+
+        stream = stream_best_exchange_rates(service, chunked(lines, 64, consumed), 4)
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert json.loads(first)["statusCode"] == 200
+        assert len(consumed) < total_chunks
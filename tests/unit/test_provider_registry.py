@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+import pytest
+
+from common.models.request import ExchangeRequest
+from common.providers.adapters import API1Adapter, ProviderAdapter
+from common.providers.factory import create_provider_registry
+from common.providers.registry import ProviderRegistry
+from common.services.exchange_service import ExchangeService
+
+
+class FixedRateAdapter(ProviderAdapter):
+    name = "API4"
+    format = "json"
+
+    def build_request(self, source_currency, target_currency, amount):
+        return {"pair": (source_currency, target_currency), "amount": amount}
+
+    def extract_rate(self, request, response):
+        return response["rate"]
+
+
+class FixedRateProvider:
+    supported_pairs = {("USD", "EUR")}
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_exchange_rate(self, request):
+        self.calls += 1
+        return {"rate": Decimal("0.99")}
+
+
+class TestProviderRegistry:
+
+    def test_default_registry_contains_three_adapters(self):
+        """Test: the default registry registers API1, API2 and API3 with their advertised pairs."""
+        registry = create_provider_registry("direct")
+
+        assert registry.names() == ["API1", "API2", "API3"]
+        assert registry.get("API1").supports("USD", "EUR")
+        assert not registry.get("API1").supports("AED", "QAR")
+
+    def test_duplicate_registration_is_rejected(self):
+        """Test: a provider name can only be registered once."""
+        registry = ProviderRegistry()
+        registry.register(API1Adapter(FixedRateProvider()))
+
+        with pytest.raises(ValueError):
+            registry.register(API1Adapter(FixedRateProvider()))
+
+    def test_incomplete_adapter_cannot_be_instantiated(self):
+        """Test: an adapter missing build_request or extract_rate fails when it is created."""
+        class IncompleteAdapter(ProviderAdapter):
+            name = "API5"
+
+            def build_request(self, source_currency, target_currency, amount):
+                return None
+
+        with pytest.raises(TypeError):
+            IncompleteAdapter(FixedRateProvider())
+
+    @pytest.mark.asyncio
+    async def test_service_uses_registered_provider_generically(self):
+        """Test: a newly registered adapter takes part in the comparison without service changes."""
+        registry = ProviderRegistry()
+        provider = FixedRateProvider()
+        registry.register(FixedRateAdapter(provider))
+        service = ExchangeService(registry)
+
+        result = await service.get_best_exchange_rate(
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("10.00")))
+
+        assert result.data.bestOffer.provider == "API4"
+        assert result.data.bestOffer.convertedAmount == Decimal("9.9000")
+        assert result.data.totalProvidersQueried == 1
+
+    @pytest.mark.asyncio
+    async def test_unsupported_pairs_are_never_sent(self):
+        """Test: the service does not call a provider for a pair it does not advertise."""
+        registry = ProviderRegistry()
+        provider = FixedRateProvider()
+        registry.register(FixedRateAdapter(provider))
+        service = ExchangeService(registry)
+
+        with pytest.raises(ValueError, match="All providers failed"):
+            await service.get_best_exchange_rate(
+                ExchangeRequest(source_currency="GBP", target_currency="JPY", amount=Decimal("10.00")))
+
+        assert provider.calls == 0
+
+
+class TestPairIndex:
+
+    def test_index_maps_pairs_to_advertising_providers(self):
+        """Test: the pair index lists only the providers that advertise a pair."""
+        service = ExchangeService(create_provider_registry("direct"))
+
+        assert [a.name for a in service.pair_index.providers_for("USD", "EUR")] == ["API1", "API2", "API3"]
+        assert service.pair_index.providers_for("AED", "QAR") == ()
+
+    def test_providers_without_pair_list_are_always_attempted(self):
+        """Test: providers that do not advertise pairs are included for every pair."""
+        service = ExchangeService(create_provider_registry("direct"))
+
+        class OpaqueProvider:
+            async def get_exchange_rate(self, request):
+                raise ValueError("unsupported")
+
+        service.api2_provider = OpaqueProvider()
+
+        assert [a.name for a in service.pair_index.providers_for("AED", "QAR")] == ["API2"]
+        assert [a.name for a in service.pair_index.providers_for("USD", "EUR")] == ["API1", "API3", "API2"]
+
+    @pytest.mark.asyncio
+    async def test_unservable_pair_is_rejected_without_fan_out(self):
+        """Test: a pair no provider supports is rejected before any provider call."""
+        import time
+
+        service = ExchangeService(create_provider_registry("direct"))
+        request = ExchangeRequest(source_currency="AED", target_currency="QAR", amount=Decimal("10.00"))
+
+        start = time.perf_counter()
+        with pytest.raises(ValueError, match="no provider supports AED to QAR"):
+            await service.get_best_exchange_rate(request)
+
+        assert time.perf_counter() - start < 0.05
+        assert service.rate_cache.misses == 0
@@ -0,0 +1,93 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from common.models.request import ExchangeRequest
+from common.services.exchange_service import ExchangeService
+from common.services.rate_cache import RateCache
+
+
+class TestRateCache:
+
+    def test_expired_entries_are_dropped(self):
+        """Test: entries are not served after their TTL."""
+        cache = RateCache(ttl_seconds=0.01, max_entries=10)
+        cache.set(("API1", "USD", "EUR"), Decimal("0.85"))
+        assert cache.get(("API1", "USD", "EUR")) == Decimal("0.85")
+
+        cache._entries[("API1", "USD", "EUR")] = (0.0, Decimal("0.85"))
+        assert cache.get(("API1", "USD", "EUR")) is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test: the cache evicts the least recently used pair when full."""
+        cache = RateCache(ttl_seconds=60, max_entries=2)
+        cache.set(("API1", "USD", "EUR"), Decimal("0.85"))
+        cache.set(("API1", "USD", "GBP"), Decimal("0.73"))
+        cache.get(("API1", "USD", "EUR"))
+        cache.set(("API1", "USD", "JPY"), Decimal("110"))
+
+        assert cache.get(("API1", "USD", "GBP")) is None
+        assert cache.get(("API1", "USD", "EUR")) == Decimal("0.85")
+        assert cache.get(("API1", "USD", "JPY")) == Decimal("110")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Test: concurrent misses for the same key are coalesced into a single fetch."""
+        cache = RateCache(ttl_seconds=60, max_entries=10)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return Decimal("0.85")
+
+        results = await asyncio.gather(*[cache.get_or_fetch(("API1", "USD", "EUR"), fetch) for _ in range(50)])
+
+        assert calls == 1
+        assert all(result == Decimal("0.85") for result in results)
+        assert cache.misses == 1
+        assert cache.coalesced == 49
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """Test: a failed fetch is propagated to every waiter and retried on the next call."""
+        cache = RateCache(ttl_seconds=60, max_entries=10)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            raise ValueError("unsupported")
+
+        with pytest.raises(ValueError):
+            await cache.get_or_fetch(("API1", "AED", "QAR"), fetch)
+        with pytest.raises(ValueError):
+            await cache.get_or_fetch(("API1", "AED", "QAR"), fetch)
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_service_reuses_cached_rates_for_any_amount(self):
+        """Test: a cached provider rate answers requests for a different amount without calling providers."""
+        service = ExchangeService()
+        first = await service.get_best_exchange_rate(
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100.00")))
+
+        class FailingProvider:
+            async def get_exchange_rate(self, request):
+                raise Exception("API unavailable")
+
+        service.api1_provider = FailingProvider()
+        service.api2_provider = FailingProvider()
+        service.api3_provider = FailingProvider()
+
+        second = await service.get_best_exchange_rate(
+            ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("200.00")))
+
+        assert second.data.successfulProviders == 3
+        assert second.data.bestOffer.rate == first.data.bestOffer.rate
+        assert second.data.bestOffer.convertedAmount == (first.data.bestOffer.rate * Decimal("200.00")).quantize(
+            Decimal("0.01"))
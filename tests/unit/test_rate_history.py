@@ -0,0 +1,200 @@
+import asyncio
+import os
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from common.models.money import to_fixed_rate
+from common.services.exchange_service import ExchangeService
+from common.services import rate_history
+from common.services.rate_history import RateHistoryStore
+
+DAY = datetime(2026, 10, 16, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RateHistoryStore(str(tmp_path / "history"), segment_capacity=4)
+    yield store
+    store.close()
+
+
+class TestRateHistoryStore:
+
+    def test_appended_quotes_are_read_back_in_order(self, store):
+        """Test: quotes come back per pair, in time order and filtered by range and provider."""
+        store.append("API1", "USD", "EUR", Decimal("0.85"), DAY + 1)
+        store.append("API2", "USD", "EUR", Decimal("0.86"), DAY + 2)
+        store.append("API1", "USD", "GBP", Decimal("0.75"), DAY + 2)
+        store.append("API1", "USD", "EUR", Decimal("0.87"), DAY + 3)
+        store.flush()
+
+        points = store.points("USD", "EUR", DAY, DAY + 10)
+
+        assert points == [
+            (int((DAY + 1) * 1_000_000), "API1", to_fixed_rate(Decimal("0.85"))),
+            (int((DAY + 2) * 1_000_000), "API2", to_fixed_rate(Decimal("0.86"))),
+            (int((DAY + 3) * 1_000_000), "API1", to_fixed_rate(Decimal("0.87"))),
+        ]
+        assert [point[0] for point in store.points("USD", "EUR", DAY + 2, DAY + 3)] == [int((DAY + 2) * 1_000_000)]
+        assert len(store.points("USD", "EUR", DAY, DAY + 10, provider="API1")) == 2
+        assert store.points("USD", "EUR", DAY, DAY + 10, provider="API9") == []
+        assert store.points("EUR", "USD", DAY, DAY + 10) == []
+
+    def test_segments_rotate_by_day_and_capacity(self, store):
+        """Test: a new segment is opened for each UTC day and whenever the current one is full."""
+        for second in range(6):
+            store.append("API1", "USD", "EUR", Decimal("0.85"), DAY + second)
+        store.append("API1", "USD", "EUR", Decimal("0.85"), DAY + 86400)
+        store.flush()
+
+        files = sorted(os.listdir(os.path.join(store.directory, "USDEUR")))
+
+        assert files == ["2026-10-16.1.bin", "2026-10-16.bin", "2026-10-17.bin"]
+        assert len(store.points("USD", "EUR", DAY, DAY + 2 * 86400)) == 7
+
+    def test_reads_are_zero_copy_views(self, store):
+        """Test: read() yields memoryview columns over the mapped segment rather than copies."""
+        store.append("API1", "USD", "EUR", Decimal("0.85"), DAY)
+        store.flush()
+
+        timestamps, providers, rates = next(store.read("USD", "EUR", DAY, DAY + 1))
+
+        assert isinstance(timestamps, memoryview) and timestamps.format == "q"
+        assert list(rates) == [to_fixed_rate(Decimal("0.85"))]
+        assert list(providers) == [0]
+
+    def test_clock_going_backwards_keeps_rows_sorted(self, store):
+        """Test: a quote stamped earlier than the last one is stored at the last timestamp."""
+        store.append("API1", "USD", "EUR", Decimal("0.85"), DAY + 10)
+        store.append("API1", "USD", "EUR", Decimal("0.86"), DAY + 5)
+        store.flush()
+
+        assert [point[0] for point in store.points("USD", "EUR", DAY, DAY + 20)] == [int((DAY + 10) * 1_000_000)] * 2
+
+    def test_ohlc_downsampling(self, store):
+        """Test: candles hold open, high, low, close and count per bucket and provider."""
+        for second, rate in enumerate(["0.85", "0.88", "0.84", "0.86", "0.90"]):
+            store.append("API1", "USD", "EUR", Decimal(rate), DAY + second * 20)
+        store.flush()
+
+        candles = store.ohlc("USD", "EUR", DAY, DAY + 120, interval_seconds=60)
+
+        assert [(candle["start_us"], candle["count"]) for candle in candles] == [
+            (int(DAY * 1_000_000), 3), (int((DAY + 60) * 1_000_000), 2)]
+        assert candles[0]["open"] == to_fixed_rate(Decimal("0.85"))
+        assert candles[0]["high"] == to_fixed_rate(Decimal("0.88"))
+        assert candles[0]["low"] == to_fixed_rate(Decimal("0.84"))
+        assert candles[1]["close"] == to_fixed_rate(Decimal("0.90"))
+
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_ohlc_spans_segments_and_stops_at_limit(self, store, monkeypatch, vectorized):
+        """Test: candles merge across segments, keep providers apart and stop after limit candles."""
+        if not vectorized:
+            monkeypatch.setattr(rate_history, "_numpy", lambda: None)
+        for second, rate in enumerate(["0.85", "0.88", "0.84", "0.86", "0.90", "0.80", "0.81", "0.82"]):
+            store.append("API1" if second % 4 else "API2", "USD", "EUR", Decimal(rate), DAY + second * 10)
+        store.flush()
+
+        candles = store.ohlc("USD", "EUR", DAY, DAY + 120, interval_seconds=60)
+        limited = store.ohlc("USD", "EUR", DAY, DAY + 120, interval_seconds=60, limit=3)
+
+        assert [(candle["start_us"], candle["provider"], candle["count"]) for candle in candles] == [
+            (int(DAY * 1_000_000), "API2", 2), (int(DAY * 1_000_000), "API1", 4),
+            (int((DAY + 60) * 1_000_000), "API1", 2)]
+        assert (candles[0]["open"], candles[0]["close"]) == (to_fixed_rate(Decimal("0.85")), to_fixed_rate(Decimal("0.90")))
+        assert candles[1]["high"] == to_fixed_rate(Decimal("0.88"))
+        assert candles[1]["low"] == to_fixed_rate(Decimal("0.80"))
+        assert candles[1]["close"] == to_fixed_rate(Decimal("0.80"))
+        assert limited == candles
+        assert store.ohlc("USD", "EUR", DAY, DAY + 120, interval_seconds=60, limit=1) == candles[:1]
+        assert len(store.ohlc("USD", "EUR", DAY, DAY + 120, 60, provider="API2")) == 1
+
+    def test_read_segments_are_evicted_least_recently_used(self, tmp_path):
+        """Test: at most max_read_segments segments stay mapped for reads; evicted ones are closed."""
+        directory = str(tmp_path / "history")
+        writer = RateHistoryStore(directory, segment_capacity=4)
+        for day in range(5):
+            writer.append("API1", "USD", "EUR", Decimal("0.85"), DAY + day * 86400)
+        writer.close()
+
+        reader = RateHistoryStore(directory, segment_capacity=4, max_read_segments=2)
+
+        assert len(reader.points("USD", "EUR", DAY, DAY + 5 * 86400)) == 5
+        assert reader.stats()["openSegments"] == 2
+        assert len(reader.points("USD", "EUR", DAY, DAY + 86400)) == 1
+        reader.close()
+
+    def test_history_survives_reopening(self, tmp_path):
+        """Test: a reopened store reads earlier quotes and keeps provider ids and appending to the same day."""
+        directory = str(tmp_path / "history")
+        first = RateHistoryStore(directory, segment_capacity=4)
+        first.append("API1", "USD", "EUR", Decimal("0.85"), DAY)
+        first.append("API2", "USD", "EUR", Decimal("0.86"), DAY + 1)
+        first.close()
+
+        second = RateHistoryStore(directory, segment_capacity=4)
+        second.append("API2", "USD", "EUR", Decimal("0.87"), DAY + 2)
+        second.flush()
+
+        assert [point[1] for point in second.points("USD", "EUR", DAY, DAY + 10)] == ["API1", "API2", "API2"]
+        assert os.listdir(os.path.join(directory, "USDEUR")) == ["2026-10-16.bin"]
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_files_are_created_off_the_event_loop(self, store, monkeypatch):
+        """Test: segments and provider ids are set up on the writer thread and queued quotes land afterwards."""
+        threads = []
+        for name in ("_open_segment", "_register_provider"):
+            work = getattr(store, name)
+            monkeypatch.setattr(store, name, lambda *args, work=work: threads.append(threading.current_thread()) or work(*args))
+
+        store.append("API1", "USD", "EUR", Decimal("0.85"), DAY + 86400 - 1)
+        assert store.stats()["pending"] == 1
+
+        for _ in range(100):
+            if store.points("USD", "EUR", DAY, DAY + 2 * 86400):
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(store.points("USD", "EUR", DAY, DAY + 2 * 86400)) == 1
+        assert store.stats()["pending"] == 0
+
+        # The quote was a second before midnight, so the next day's segment is created ahead of time
+        await asyncio.to_thread(store._executor.submit(lambda: None).result)
+        assert len(threads) == 3 and threading.main_thread() not in threads
+        assert sorted(os.listdir(os.path.join(store.directory, "USDEUR"))) == ["2026-10-16.bin", "2026-10-17.bin"]
+
+    def test_second_store_on_the_same_directory_is_read_only(self, store):
+        """Test: only the process holding the directory lock writes; others can still read."""
+        store.append("API1", "USD", "EUR", Decimal("0.85"), DAY)
+        reader = RateHistoryStore(store.directory)
+
+        reader.append("API1", "USD", "EUR", Decimal("0.99"), DAY + 1)
+        store.append("API1", "USD", "EUR", Decimal("0.86"), DAY + 2)
+        store.flush()
+
+        assert not reader.writable
+        assert [point[2] for point in reader.points("USD", "EUR", DAY, DAY + 10)] == [
+            to_fixed_rate(Decimal("0.85")), to_fixed_rate(Decimal("0.86"))]
+        reader.close()
+
+
+class TestExchangeServiceHistory:
+
+    @pytest.mark.asyncio
+    async def test_fetched_quotes_are_recorded(self, tmp_path):
+        """Test: every quote fetched by the service is appended to the history."""
+        service = ExchangeService()
+        history = service.use_rate_history(str(tmp_path / "history"), 1024)
+        adapter = service.registry.get("API1")
+
+        rate = await service.fetch_provider_rate(adapter, "USD", "EUR", Decimal("100"))
+        history.flush()
+
+        points = history.points("USD", "EUR", 0, 2 ** 32)
+        assert [(name, fixed_rate) for _, name, fixed_rate in points] == [("API1", to_fixed_rate(rate))]
+        assert service.get_stats()["rateHistory"]["appended"] == 1
+        history.close()
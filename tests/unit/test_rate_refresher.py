@@ -0,0 +1,108 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from common.models.api_formats import API1Response
+from common.models.request import ExchangeRequest
+from common.providers.adapters import API1Adapter
+from common.providers.registry import ProviderRegistry
+from common.services.exchange_service import ExchangeService
+from common.services.rate_refresher import RateRefresher, parse_refresh_intervals
+
+
+class CountingProvider:
+    supported_pairs = {("USD", "EUR"), ("EUR", "USD")}
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def get_exchange_rate(self, request):
+        self.calls += 1
+        if self.fail:
+            raise Exception("API unavailable")
+        return API1Response(rate=Decimal("0.85"))
+
+
+def build_service(provider):
+    registry = ProviderRegistry()
+    registry.register(API1Adapter(provider))
+    return ExchangeService(registry)
+
+
+class TestRateRefresher:
+
+    def test_parse_refresh_intervals(self):
+        """Test: per-provider refresh intervals are parsed from NAME=seconds pairs."""
+        assert parse_refresh_intervals("api1=1.5, API2=4") == {"API1": 1.5, "API2": 4.0}
+        assert parse_refresh_intervals("") == {}
+
+    def test_backoff_and_jitter(self):
+        """Test: consecutive failures back off exponentially and every delay is jittered."""
+        refresher = RateRefresher(build_service(CountingProvider()), default_interval_seconds=1,
+                                  intervals={}, jitter_ratio=0.1, max_backoff_seconds=5)
+
+        assert 0.9 <= refresher.next_delay("API1") <= 1.1
+        refresher.failures["API1"] = 2
+        assert 3.6 <= refresher.next_delay("API1") <= 4.4
+        refresher.failures["API1"] = 10
+        assert refresher.next_delay("API1") <= 5.5
+
+    @pytest.mark.asyncio
+    async def test_compare_is_served_from_refreshed_table(self):
+        """Test: after a refresh round, compare requests are answered without calling the provider."""
+        provider = CountingProvider()
+        service = build_service(provider)
+
+        refreshed = await service.rate_refresher.refresh_provider(service.registry.get("API1"))
+        assert refreshed == 2
+        assert provider.calls == 2
+
+        result = await service.get_best_exchange_rate(
+            ExchangeRequest(source_currency="EUR", target_currency="USD", amount=Decimal("10.00")))
+
+        assert result.data.bestOffer.rate == Decimal("0.85")
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_background_loop_starts_and_stops(self):
+        """Test: the background refresher polls repeatedly and stops cleanly."""
+        provider = CountingProvider(fail=True)
+        service = build_service(provider)
+        service.rate_refresher = RateRefresher(service, default_interval_seconds=0.001, intervals={},
+                                               max_backoff_seconds=0.001)
+
+        service.start_background_refresh()
+        await asyncio.sleep(0.05)
+        await service.stop_background_refresh()
+
+        assert service.rate_refresher.running is False
+        assert service.rate_refresher.rounds["API1"] >= 2
+        assert service.rate_refresher.failures["API1"] >= 2
+
+    @pytest.mark.asyncio
+    async def test_shared_table_reader_follows_and_takes_over(self, tmp_path):
+        """Test: a reader worker feeds its graph from the shared table and refreshes once the writer exits."""
+        writer = build_service(CountingProvider())
+        writer.use_shared_rate_table(str(tmp_path / "rates"))
+        writer.rate_table.update("API1", "EUR", "USD", Decimal("1.17"))
+
+        provider = CountingProvider()
+        reader = build_service(provider)
+        reader.use_shared_rate_table(str(tmp_path / "rates"))
+        reader.rate_refresher = RateRefresher(reader, default_interval_seconds=0.001, intervals={})
+        assert not reader.rate_table.is_writer
+
+        reader.start_background_refresh(poll_seconds=0.001)
+        await asyncio.sleep(0.02)
+        assert reader.rate_graph.best_path("EUR", "USD", max_legs=1)[0][3] == Decimal("1.17")
+        assert provider.calls == 0
+
+        writer.rate_table.close()
+        await asyncio.sleep(0.05)
+        await reader.stop_background_refresh()
+        reader.rate_table.close()
+
+        assert reader.rate_table.is_writer
+        assert provider.calls > 0
@@ -0,0 +1,136 @@
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from common.models.request import ExchangeRequest
+from common.providers.adapters import API1Adapter
+from common.providers.http_providers import API1HttpProvider
+from common.providers.registry import ProviderRegistry
+from common.services.exchange_service import ExchangeService
+from common.services.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker
+
+
+class TestCircuitBreaker:
+
+    def test_opens_when_error_rate_exceeds_threshold(self):
+        """Test: the breaker opens once the failure rate crosses the threshold over enough calls."""
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=10, min_calls=4, open_seconds=60)
+
+        breaker.record_success(0.01)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+    def test_slow_calls_count_as_failures(self):
+        """Test: calls slower than the slow-call threshold trip the breaker like errors."""
+        breaker = CircuitBreaker(slow_call_seconds=0.1, window_size=4, min_calls=2)
+
+        breaker.record_success(0.5)
+        breaker.record_success(0.5)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test: after the open period a single probe is allowed and its outcome decides the state."""
+        breaker = CircuitBreaker(window_size=2, min_calls=1, open_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.allow_request() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is False
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.allow_request() is True
+        breaker.record_success(0.01)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestAdaptiveConcurrencyLimiter:
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test: the limit grows slowly on fast successes and halves on failure."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_target_seconds=1.0)
+
+        for _ in range(8):
+            assert limiter.try_acquire()
+            limiter.release(0.01, success=True)
+        assert limiter.limit > 5
+
+        assert limiter.try_acquire()
+        limiter.release(0.01, success=False)
+        assert 2.5 < limiter.limit < 3
+
+    def test_rejects_beyond_limit(self):
+        """Test: acquisitions beyond the current limit are rejected immediately."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert limiter.try_acquire() is False
+        assert limiter.rejected_calls == 1
+
+
+class TestServiceCircuitBreaking:
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_provider_calls(self):
+        """Test: once a provider's circuit is open, the service stops calling it."""
+        service = ExchangeService()
+        service.rate_cache.ttl_seconds = 0
+
+        class FailingProvider:
+            calls = 0
+
+            async def get_exchange_rate(self, request):
+                FailingProvider.calls += 1
+                raise Exception("API unavailable")
+
+        class FastProvider:
+            async def get_exchange_rate(self, request):
+                from common.models.api_formats import API2Response
+                return API2Response(Result=Decimal("0.86"))
+
+        service.api1_provider = FailingProvider()
+        service.api2_provider = FastProvider()
+        service.api3_provider = FailingProvider()
+        min_calls = service.circuit_breakers["API1"].min_calls
+        request = ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("10.00"))
+
+        for _ in range(min_calls + 5):
+            result = await service.get_best_exchange_rate(request, deadline_ms=0)
+            assert result.data.failedProviders >= 1
+
+        assert FailingProvider.calls == 2 * min_calls
+        assert service.get_stats()["providers"]["API1"]["circuitBreaker"]["state"] == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code, body, opens", [
+        (200, b"<html>502 Bad Gateway</html>", True),
+        (200, b'{"rate": "not a number"}', True),
+        (400, b'{"detail": "Currency conversion from USD to EUR is not supported"}', False),
+    ])
+    async def test_malformed_responses_trip_the_breaker(self, status_code, body, opens):
+        """Test: garbage or schema-violating bodies count as failures; rejected requests are ignored."""
+        def handler(request):
+            return httpx.Response(status_code, content=body)
+
+        client = httpx.AsyncClient(base_url="http://provider", transport=httpx.MockTransport(handler))
+        registry = ProviderRegistry()
+        registry.register(API1Adapter(API1HttpProvider(client=client, pairs="USD/EUR")))
+        service = ExchangeService(registry)
+        adapter = registry.get("API1")
+
+        for _ in range(service.circuit_breakers["API1"].min_calls):
+            with pytest.raises(ValueError):
+                await service.fetch_provider_rate(adapter, "USD", "EUR", Decimal("10"))
+
+        state = service.get_stats()["providers"]["API1"]["circuitBreaker"]["state"]
+        assert (state == CircuitBreaker.OPEN) is opens
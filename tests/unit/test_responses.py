@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from common.models.request import ExchangeRequest
+from common.models.response import BestExchangeResponse
+from common.services.exchange_service import ExchangeService, ProviderQuote
+from common.utils.responses import ModelJSONResponse
+
+
+class TestModelJSONResponse:
+
+    @pytest.mark.parametrize("amount", [Decimal("100.00"), Decimal("0.01"), Decimal("1E+3"), Decimal("999.5")])
+    def test_output_matches_response_model_serialization(self, amount):
+        """Test: the lean serializer writes the same bytes FastAPI produces through response_model."""
+        service = ExchangeService()
+        request = ExchangeRequest(source_currency="USD", target_currency="EUR", amount=amount)
+        quotes = [
+            ("API1", ProviderQuote("API1", Decimal("0.85"), 12)),
+            ("API2", None),
+            ("TRIANGULATED", ProviderQuote("TRIANGULATED", Decimal("0.8613"), 30,
+                                           path=[("USD", "GBP", "API1", Decimal("0.79")),
+                                                 ("GBP", "EUR", "API3", Decimal("1.0903"))])),
+        ]
+
+        response = service._build_best_response(request, quotes, ["API3"])
+
+        validated = BestExchangeResponse.model_validate(response.model_dump())
+        expected = JSONResponse(validated.model_dump(mode="json")).body
+
+        assert ModelJSONResponse(response).body == expected
+        assert ModelJSONResponse(response).headers["content-type"] == "application/json"
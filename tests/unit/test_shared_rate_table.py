@@ -0,0 +1,164 @@
+import multiprocessing
+import time
+from decimal import Decimal
+
+import pytest
+
+from common.services.shared_rate_table import SharedRateTable, _SEQUENCE
+
+PROVIDERS = ["API1", "API2"]
+CURRENCIES = ["USD", "EUR", "GBP"]
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    return str(tmp_path / "rates")
+
+
+def open_table(path, providers=PROVIDERS):
+    return SharedRateTable(path, providers, CURRENCIES)
+
+
+def write_rates(path, updates, ready, start):
+    writer = open_table(path)
+    ready.set()
+    start.wait(10)
+    for index in range(updates):
+        # Rate and wall timestamp always change together, so a torn read would show them mismatched
+        writer.update("API1", "USD", "EUR", Decimal(index), updated_at=float(index))
+    writer.close()
+
+
+class TestSharedRateTable:
+
+    def test_first_process_becomes_the_only_writer(self, table_path):
+        """Test: the first table to open the file is the writer and later ones are readers."""
+        writer = open_table(table_path)
+        reader = open_table(table_path)
+
+        assert writer.is_writer
+        assert not reader.is_writer
+        assert reader.stats(5)["shared"]["role"] == "reader"
+
+        writer.close()
+        reader.close()
+
+    def test_readers_see_published_rates(self, table_path):
+        """Test: rates written by the writer are read back exactly by a reader."""
+        writer = open_table(table_path)
+        reader = open_table(table_path)
+
+        writer.update("API2", "GBP", "USD", Decimal("1.3712345678901234567890"))
+
+        assert reader.get_fresh("API2", "GBP", "USD", 5) == Decimal("1.3712345678901234567890")
+        assert reader.get_fresh("API2", "GBP", "USD", -1) is None
+        assert reader.get("API1", "GBP", "USD") is None
+        assert list(reader.shared_entries()) == [("API2", "GBP", "USD")]
+
+        writer.close()
+        reader.close()
+
+    def test_reader_updates_stay_local(self, table_path):
+        """Test: a reader keeps its own fetches locally and prefers whichever entry is newer."""
+        writer = open_table(table_path)
+        reader = open_table(table_path)
+
+        reader.update("API1", "USD", "EUR", Decimal("0.85"), updated_at=time.monotonic())
+        assert writer.get("API1", "USD", "EUR") is None
+        assert reader.get_fresh("API1", "USD", "EUR", 5) == Decimal("0.85")
+
+        writer.update("API1", "USD", "EUR", Decimal("0.86"), updated_at=time.monotonic() + 1)
+        assert reader.get_fresh("API1", "USD", "EUR", 5) == Decimal("0.86")
+
+        writer.close()
+        reader.close()
+
+    def test_slot_being_written_is_not_returned(self, table_path):
+        """Test: a slot with an odd sequence number is treated as missing rather than read half written."""
+        writer = open_table(table_path)
+        reader = open_table(table_path)
+        writer.update("API1", "USD", "EUR", Decimal("0.85"))
+
+        offset = writer._slot_offset("API1", "USD", "EUR")
+        _SEQUENCE.pack_into(writer._mmap, offset, 3)
+
+        assert reader.get("API1", "USD", "EUR") is None
+        assert reader.torn_reads == 1
+
+        writer.close()
+        reader.close()
+
+    def test_layout_change_resets_the_file(self, table_path):
+        """Test: a file written for other providers is ignored by readers and cleared by the next writer."""
+        old_writer = open_table(table_path, providers=["API9"])
+        old_writer.update("API9", "USD", "EUR", Decimal("0.85"))
+        reader = open_table(table_path)
+        assert reader.get("API1", "USD", "EUR") is None
+        old_writer.close()
+        reader.close()
+
+        writer = open_table(table_path)
+        assert writer.is_writer
+        assert writer.shared_entries() == {}
+        writer.close()
+
+    def test_reader_takes_over_when_the_writer_exits(self, table_path):
+        """Test: a reader wins the lock once the writer closes and keeps serving what it had published."""
+        writer = open_table(table_path)
+        reader = open_table(table_path)
+        writer.update("API1", "USD", "EUR", Decimal("0.85"))
+
+        assert reader.try_become_writer() is False
+        writer.close()
+        assert reader.try_become_writer() is True
+
+        assert reader.is_writer
+        assert reader.get_fresh("API1", "USD", "EUR", 5) == Decimal("0.85")
+        reader.update("API1", "USD", "GBP", Decimal("0.74"))
+        follower = open_table(table_path)
+        assert follower.get_fresh("API1", "USD", "GBP", 5) == Decimal("0.74")
+
+        reader.close()
+        follower.close()
+
+    def test_poll_shared_feeds_published_rates_once(self, table_path):
+        """Test: shared listeners get each published rate once, and not when a newer local one exists."""
+        writer = open_table(table_path)
+        reader = open_table(table_path)
+        received = []
+        reader.subscribe_shared(lambda *update: received.append(update[:4]))
+
+        now = time.monotonic()
+        writer.update("API1", "USD", "EUR", Decimal("0.85"), updated_at=now)
+        writer.update("API2", "EUR", "GBP", Decimal("0.86"), updated_at=now)
+        reader.update("API2", "EUR", "GBP", Decimal("0.87"), updated_at=now + 1)
+
+        assert reader.poll_shared() == 1
+        assert reader.poll_shared() == 0
+        assert received == [("API1", "USD", "EUR", Decimal("0.85"))]
+
+        writer.close()
+        reader.close()
+
+    def test_concurrent_writer_never_produces_torn_reads(self, table_path):
+        """Test: a reader polling while another process writes only ever sees consistent slots."""
+        context = multiprocessing.get_context("fork")
+        ready, start = context.Event(), context.Event()
+        process = context.Process(target=write_rates, args=(table_path, 20000, ready, start))
+        process.start()
+        assert ready.wait(10)
+
+        reader = open_table(table_path)
+        assert not reader.is_writer
+        start.set()
+
+        seen = 0
+        while process.is_alive() or seen == 0:
+            entry = reader.get("API1", "USD", "EUR")
+            if entry is not None:
+                assert entry.rate == Decimal(int(entry.updated_at))
+                seen += 1
+        process.join()
+        reader.close()
+
+        assert seen > 0
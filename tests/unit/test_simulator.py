@@ -0,0 +1,154 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from common.models.api_formats import API2Request, API3Request, API3ExchangeData
+from common.models.money import from_fixed_rate, to_fixed_rate
+from common.models.request import VALID_CURRENCIES
+from common.providers.api2_provider import API2DirectProvider
+from common.providers.api3_provider import API3DirectProvider
+from common.providers.factory import create_direct_provider
+from common.providers.simulator import (
+    DATA_DIR, LatencyModel, ProviderSimulator, SimulatedProviderError, SimulatedTimeoutError,
+    create_simulator, load_base_rates
+)
+
+BASE_RATES = {"USD": 1.0, "EUR": 0.85, "JPY": 110.0}
+
+
+def make_simulator(**kwargs):
+    kwargs.setdefault("latency", LatencyModel("constant", ms=0))
+    return ProviderSimulator("SIM", BASE_RATES, **kwargs)
+
+
+async def collect(simulator, calls=20):
+    outcomes = []
+    for _ in range(calls):
+        try:
+            outcomes.append(await simulator.quote("USD", "EUR"))
+        except SimulatedProviderError:
+            outcomes.append("error")
+    return outcomes
+
+
+class TestProviderSimulator:
+
+    @pytest.mark.asyncio
+    async def test_same_seed_reproduces_the_same_sequence(self):
+        """Test: two simulators with the same seed return the same rates and failures in the same order."""
+        config = {"jitter": 0.02, "error_rate": 0.2, "volatility": 0.01, "mean_reversion": 0.1}
+
+        first = await collect(make_simulator(seed=7, **config))
+        second = await collect(make_simulator(seed=7, **config))
+        other = await collect(make_simulator(seed=8, **config))
+
+        assert first == second
+        assert first != other
+        assert "error" in first
+
+    @pytest.mark.asyncio
+    async def test_rates_follow_the_base_table(self):
+        """Test: cross rates come from the USD table, with spread and jitter applied."""
+        simulator = make_simulator(spread=0.01)
+
+        assert await simulator.quote("EUR", "JPY") == from_fixed_rate(to_fixed_rate(110.0 / 0.85 * 1.01))
+
+    @pytest.mark.asyncio
+    async def test_injected_failures_fail_the_next_calls(self):
+        """Test: injected failures fail exactly the requested number of calls."""
+        simulator = make_simulator()
+        simulator.inject_failures(2)
+
+        outcomes = await collect(simulator, calls=3)
+
+        assert outcomes[:2] == ["error", "error"]
+        assert isinstance(outcomes[2], Decimal)
+
+    @pytest.mark.asyncio
+    async def test_outage_and_timeouts(self):
+        """Test: an outage fails every call and a timeout rate of 1 always times out."""
+        simulator = make_simulator()
+        simulator.outage = True
+        assert await collect(simulator, calls=3) == ["error"] * 3
+
+        simulator = make_simulator(timeout_rate=1.0, timeout_ms=0)
+        with pytest.raises(SimulatedTimeoutError):
+            await simulator.quote("USD", "EUR")
+
+    @pytest.mark.asyncio
+    async def test_error_rate_is_respected(self):
+        """Test: the observed error ratio is close to the configured error rate."""
+        outcomes = await collect(make_simulator(error_rate=0.3), calls=1000)
+
+        assert 0.25 < outcomes.count("error") / len(outcomes) < 0.35
+
+    @pytest.mark.asyncio
+    async def test_unsupported_pair_raises_value_error(self):
+        """Test: pairs outside the configured list are rejected like the hand-written providers do."""
+        simulator = make_simulator(pairs=frozenset({("USD", "EUR")}))
+
+        with pytest.raises(ValueError, match="not supported by SIM"):
+            await simulator.quote("EUR", "USD")
+
+    def test_latency_distributions(self):
+        """Test: every latency distribution produces positive samples and unknown names are rejected."""
+        import random
+
+        rng = random.Random(1)
+        models = [
+            LatencyModel("constant", ms=5),
+            LatencyModel("uniform", min_ms=10, max_ms=20),
+            LatencyModel("lognormal", median_ms=40, sigma=0.5, tail_probability=0.5, tail_multiplier=10),
+            LatencyModel("pareto", scale_ms=25, alpha=2.5),
+        ]
+        for model in models:
+            assert all(model.sample_ms(rng) > 0 for _ in range(100))
+
+        with pytest.raises(ValueError, match="Unknown latency distribution"):
+            LatencyModel("gamma")
+
+    def test_bundled_rate_table_covers_valid_currencies(self):
+        """Test: the bundled rate table covers every pair of supported currencies."""
+        rates = load_base_rates()
+        simulator = ProviderSimulator("SIM", rates)
+
+        assert set(rates) == VALID_CURRENCIES
+        assert len(simulator.supported_pairs) == len(VALID_CURRENCIES) * (len(VALID_CURRENCIES) - 1)
+
+    def test_example_config_loads(self):
+        """Test: the example configuration file builds a simulator for every provider."""
+        with open(f"{DATA_DIR}/simulator.example.json") as file:
+            config = json.load(file)
+
+        api3 = create_simulator("API3", config)
+
+        assert create_simulator("API1", config).latency.distribution == "lognormal"
+        assert ("USD", "EUR") in api3.supported_pairs
+        assert ("USD", "GBP") not in api3.supported_pairs
+
+
+class TestSimulatedProviders:
+
+    @pytest.mark.asyncio
+    async def test_direct_providers_use_the_simulator(self):
+        """Test: direct providers quote through the simulator and keep their response formats."""
+        simulator = make_simulator()
+        api2 = API2DirectProvider(simulator=simulator)
+        api3 = API3DirectProvider(simulator=make_simulator())
+
+        api2_response = await api2.get_exchange_rate(API2Request(From="USD", To="JPY", Amount=Decimal("10")))
+        api3_response = await api3.get_exchange_rate(API3Request(
+            exchange=API3ExchangeData(sourceCurrency="USD", targetCurrency="EUR", quantity=Decimal("100"))))
+
+        assert api2_response.Result == Decimal("110.0")
+        assert api3_response.data.total == Decimal("85.000")
+        assert api2.supported_pairs is simulator.supported_pairs
+
+    def test_factory_attaches_simulator_when_enabled(self):
+        """Test: the factory only attaches a simulator in simulated mode."""
+        assert create_direct_provider("API1", simulated=False).simulator is None
+        assert create_direct_provider("API1", simulated=True).simulator is not None
+
+        with pytest.raises(ValueError, match="Unknown provider"):
+            create_direct_provider("API9")
@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+import pytest
+
+from common.models.request import ExchangeRequest
+from common.providers.adapters import API1Adapter
+from common.providers.registry import ProviderRegistry
+from common.services.exchange_service import ExchangeService
+from common.services.triangulation import RateGraph
+
+
+class TestRateGraph:
+
+    def test_best_path_maximises_product_of_rates(self):
+        """Test: the path with the highest combined rate wins, not the one with fewest legs."""
+        graph = RateGraph()
+        graph.update("API1", "EUR", "JPY", Decimal("120"))
+        graph.update("API1", "EUR", "USD", Decimal("1.2"))
+        graph.update("API2", "USD", "JPY", Decimal("110"))
+
+        path = graph.best_path("EUR", "JPY", max_legs=3)
+
+        assert [(leg[0], leg[1], leg[2]) for leg in path] == [("EUR", "USD", "API1"), ("USD", "JPY", "API2")]
+
+    def test_best_provider_is_chosen_per_leg(self):
+        """Test: each leg uses the provider with the best rate for that pair."""
+        graph = RateGraph()
+        graph.update("API1", "EUR", "USD", Decimal("1.18"))
+        graph.update("API3", "EUR", "USD", Decimal("1.19"))
+        graph.update("API2", "USD", "JPY", Decimal("111"))
+
+        path = graph.best_path("EUR", "JPY", max_legs=2)
+
+        assert [leg[2] for leg in path] == ["API3", "API2"]
+
+    def test_stale_rates_and_cycles_are_ignored(self):
+        """Test: expired edges are skipped and arbitrage cycles do not produce looping paths."""
+        graph = RateGraph(max_rate_age_seconds=10)
+        graph.update("API1", "EUR", "USD", Decimal("1.2"), updated_at=-100)
+        assert graph.best_path("EUR", "USD", max_legs=2) is None
+
+        graph.update("API1", "USD", "EUR", Decimal("2"))
+        graph.update("API1", "EUR", "USD", Decimal("2"))
+        graph.update("API1", "USD", "GBP", Decimal("0.7"))
+
+        path = graph.best_path("USD", "GBP", max_legs=3)
+        assert [(leg[0], leg[1]) for leg in path] == [("USD", "GBP")]
+
+    def test_unrelated_update_keeps_cached_path(self, monkeypatch):
+        """Test: re-pricing an edge away from a cached path keeps it; re-pricing one of its legs re-prices it."""
+        graph = RateGraph()
+        graph.update("API1", "EUR", "USD", Decimal("1.2"))
+        graph.update("API2", "USD", "JPY", Decimal("110"))
+        graph.update("API1", "GBP", "CHF", Decimal("1.1"))
+        path = graph.best_path("EUR", "JPY", max_legs=3)
+
+        searches = []
+        search = graph._search
+        monkeypatch.setattr(graph, "_search", lambda *args: searches.append(args) or search(*args))
+
+        graph.update("API1", "GBP", "CHF", Decimal("1.12"))
+        assert graph.best_path("EUR", "JPY", max_legs=3) is path
+        assert searches == []
+
+        graph.update("API2", "USD", "JPY", Decimal("112"))
+        assert graph.best_path("EUR", "JPY", max_legs=3)[1][3] == Decimal("112")
+        assert len(searches) == 1
+
+
+class LegProvider:
+    supported_pairs = {("EUR", "USD"), ("USD", "JPY")}
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_exchange_rate(self, request):
+        from common.models.api_formats import API1Response
+        self.calls += 1
+        return API1Response(rate=Decimal("1.2") if request.from_ == "EUR" else Decimal("110"))
+
+
+class TestServiceTriangulation:
+
+    @pytest.mark.asyncio
+    async def test_unsupported_pair_is_triangulated_with_leg_providers(self):
+        """Test: a pair with no direct provider is priced through an intermediate currency."""
+        registry = ProviderRegistry()
+        provider = LegProvider()
+        registry.register(API1Adapter(provider))
+        service = ExchangeService(registry)
+        request = ExchangeRequest(source_currency="EUR", target_currency="JPY", amount=Decimal("10.00"))
+
+        result = await service.get_best_exchange_rate(request)
+        offer = result.data.bestOffer
+
+        assert offer.provider == "TRIANGULATED"
+        assert offer.rate == Decimal("132.0")
+        assert offer.convertedAmount == Decimal("1320.000")
+        assert [(leg.sourceCurrency, leg.targetCurrency, leg.provider) for leg in offer.path] == [
+            ("EUR", "USD", "API1"), ("USD", "JPY", "API1")
+        ]
+        assert provider.calls == 2
+
+        await service.get_best_exchange_rate(request)
+        assert provider.calls == 2
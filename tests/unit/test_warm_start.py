@@ -0,0 +1,123 @@
+import asyncio
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from common.models.request import ExchangeRequest
+from common.services.exchange_service import ExchangeService
+from common.services.resilience import CircuitBreaker
+from common.services.warm_start import WarmStarter, WarmStartSnapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "warm-start.snapshot")
+
+
+def warm_service():
+    service = ExchangeService()
+    service.rate_table.update("API1", "USD", "EUR", Decimal("0.8512345"))
+    service.rate_table.update("API2", "USD", "EUR", Decimal("0.86"))
+    for _ in range(25):
+        service.latency_tracker.record("API1", 0.05)
+    for _ in range(10):
+        service.circuit_breakers["API3"].record_failure()
+    return service
+
+
+class TestWarmStartSnapshot:
+
+    def test_round_trip(self):
+        """Test: rates, latency samples and breaker states survive encoding and decoding."""
+        service = warm_service()
+
+        snapshot = WarmStartSnapshot.from_bytes(WarmStartSnapshot.capture(service, 300).to_bytes())
+
+        assert {(provider, rate) for provider, _, _, rate, _ in snapshot.rates} == {
+            ("API1", Decimal("0.8512345")), ("API2", Decimal("0.86"))}
+        assert snapshot.latency["API1"] == pytest.approx([0.05] * 25)
+        assert snapshot.breakers["API3"][0] == CircuitBreaker.OPEN
+        assert snapshot.breakers["API1"] == (CircuitBreaker.CLOSED, None, 0, [])
+
+    def test_corrupt_snapshot_is_rejected(self):
+        """Test: a truncated or altered snapshot raises ValueError instead of loading garbage."""
+        data = WarmStartSnapshot.capture(warm_service(), 300).to_bytes()
+
+        with pytest.raises(ValueError):
+            WarmStartSnapshot.from_bytes(data[:10])
+        with pytest.raises(ValueError, match="checksum"):
+            WarmStartSnapshot.from_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+
+    def test_old_rates_are_not_restored(self):
+        """Test: rates older than the maximum age are neither captured nor restored."""
+        old = time.time() - 600
+        snapshot = WarmStartSnapshot(time.time(), [("API1", "USD", "EUR", Decimal("0.85"), old)], {}, {})
+        service = ExchangeService()
+
+        assert snapshot.apply(service, 300) == 0
+        assert service.rate_table.get("API1", "USD", "EUR") is None
+
+
+class TestWarmStarter:
+
+    @pytest.mark.asyncio
+    async def test_restart_restores_state_as_stale(self, snapshot_path):
+        """Test: a new service loads the snapshot with rates marked stale and breakers and latency restored."""
+        writer = WarmStarter(warm_service(), snapshot_path, 30, 300)
+        await writer.save()
+
+        service = ExchangeService()
+        assert service.use_warm_start(snapshot_path, 30, 300).rates_restored == 2
+
+        assert service.rate_table.get_fresh("API1", "USD", "EUR", 5) is not None
+        assert service.rate_table.get("API1", "USD", "EUR").stale
+        assert service.rate_table.get_stale("API1", "USD", "EUR", 300) == Decimal("0.8512345")
+        assert service.latency_tracker.percentile("API1", 0.5) == pytest.approx(0.05)
+        assert service.circuit_breakers["API3"].state == CircuitBreaker.OPEN
+        assert not service.circuit_breakers["API3"].allow_request()
+
+    def test_missing_or_invalid_snapshot_starts_cold(self, snapshot_path):
+        """Test: a missing or unreadable snapshot is ignored."""
+        service = ExchangeService()
+        assert service.use_warm_start(snapshot_path, 30, 300).rates_restored == 0
+
+        with open(snapshot_path, "wb") as file:
+            file.write(b"not a snapshot")
+        assert WarmStarter(service, snapshot_path, 30, 300).restore() == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_a_final_snapshot(self, snapshot_path):
+        """Test: stopping the periodic writer saves one last snapshot."""
+        starter = WarmStarter(warm_service(), snapshot_path, 3600, 300)
+        starter.start()
+        await starter.stop()
+
+        assert starter.snapshots_written == 1
+        assert WarmStarter(ExchangeService(), snapshot_path, 30, 300).restore() == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_rate_answers_while_one_fetch_revalidates(self, snapshot_path):
+        """Test: restored rates answer compares at once and each key is refetched once in the background."""
+        old = time.time() - 60
+        snapshot = WarmStartSnapshot(time.time(), [
+            (name, "USD", "EUR", Decimal(rate), old) for name, rate in (("API1", "0.85"), ("API2", "0.86"),
+                                                                        ("API3", "0.84"))
+        ], {}, {})
+        with open(snapshot_path, "wb") as file:
+            file.write(snapshot.to_bytes())
+
+        service = ExchangeService()
+        service.use_warm_start(snapshot_path, 30, 300)
+        service.fetch_provider_rate = AsyncMock(return_value=Decimal("0.87"))
+        request = ExchangeRequest(source_currency="USD", target_currency="EUR", amount=Decimal("100"))
+
+        first = await service.get_best_exchange_rate(request)
+        second = await service.get_best_exchange_rate(request)
+        await asyncio.gather(*service._revalidations.values())
+
+        assert first.data.bestOffer.provider == "API2"
+        assert second.data.bestOffer.provider == "API2"
+        assert service.fetch_provider_rate.await_count == 3
+        assert service.get_stats()["warmStart"]["staleHits"] == 6
@@ -0,0 +1,78 @@
+import xml.etree.ElementTree as ET
+from decimal import Decimal
+
+import pytest
+
+from common.models import xml_codec
+from common.models.api_formats import API2Request, API2Response
+
+
+class TestXmlCodec:
+
+    def test_writes_same_documents_as_elementtree(self):
+        """Test: template encoding matches what ElementTree serialization produced."""
+        root = ET.Element("XML")
+        for tag, text in (("From", "USD"), ("To", "A&B"), ("Amount", "100.00")):
+            ET.SubElement(root, tag).text = text
+
+        assert xml_codec.encode_request("USD", "A&B", "100.00") == ET.tostring(root, encoding="unicode")
+        assert API2Response(Result=Decimal("85.00")).to_xml() == "<XML><Result>85.00</Result></XML>"
+
+    @pytest.mark.parametrize("document", [
+        "<XML><From>USD</From><To>EUR</To><Amount>100.00</Amount></XML>",
+        '<?xml version="1.0" encoding="UTF-8"?>\n<XML>\n  <From>USD</From>\n  <To>EUR</To>\n  <Amount>100.00</Amount>\n</XML>\n',
+        "<XML><To>EUR</To><From>USD</From><Amount>1E+2</Amount></XML>",
+        "<XML><From>USD</From><!-- note --><To>EUR</To><Amount>100.00</Amount></XML>",
+        "<XML><From>US&#68;</From><To>EUR</To><Amount>100.00</Amount></XML>",
+    ])
+    def test_decodes_like_elementtree(self, document):
+        """Test: the fast scanner and the ElementTree fallback agree on accepted documents."""
+        root = ET.fromstring(document)
+        expected = (root.find("From").text, root.find("To").text, root.find("Amount").text)
+
+        assert xml_codec.decode_request(document) == expected
+        assert API2Request.from_xml(document).Amount == Decimal(expected[2])
+
+    def test_rejects_entity_declarations(self):
+        """Test: documents declaring entities are refused before reaching the parser."""
+        document = ('<?xml version="1.0"?><!DOCTYPE XML [<!ENTITY a "aaaaaaaaaa"><!ENTITY b "&a;&a;&a;&a;">]>'
+                    "<XML><Result>&b;</Result></XML>")
+
+        with pytest.raises(ValueError):
+            API2Response.from_xml(document)
+
+    def test_malformed_documents_still_fail(self):
+        """Test: input neither path understands raises a parse error."""
+        with pytest.raises(ET.ParseError):
+            xml_codec.decode_response("<XML><Result>85.00</XML>")
+
+    def test_batch_reader_handles_arbitrary_chunking(self):
+        """Test: batched documents are read incrementally no matter where the chunks are split."""
+        document = xml_codec.encode_batch_request([("USD", "EUR", "100.00"), ("GBP", "JPY", "2")]).encode()
+
+        reader = xml_codec.BatchDocumentReader()
+        elements = []
+        for start in range(0, len(document), 3):
+            elements.extend(reader.feed(document[start:start + 3]))
+        elements.extend(reader.close())
+
+        assert [xml_codec.exchange_from_element(element) for element in elements] == [
+            ("USD", "EUR", "100.00"), ("GBP", "JPY", "2")
+        ]
+
+    def test_batch_reader_rejects_split_entity_declarations(self):
+        """Test: a DTD split across two chunks is still refused."""
+        reader = xml_codec.BatchDocumentReader()
+        reader.feed(b'<?xml version="1.0"?><!DOC')
+
+        with pytest.raises(ValueError):
+            reader.feed(b'TYPE XML [<!ENTITY a "a">]><XML></XML>')
+
+    def test_batch_response_round_trip(self):
+        """Test: results and per-item errors keep their positions."""
+        document = xml_codec.encode_batch_response(["0.85", ValueError("USD to <QAR> is not supported")])
+
+        results = xml_codec.decode_batch_response(document.encode())
+
+        assert results[0] == "0.85"
+        assert str(results[1]) == "USD to <QAR> is not supported"